@@ -1,8 +1,11 @@
+# Primo import: misura anche quelli che seguono (vedi --import-report)
+from modules.lazy_import import (
+    lazy, is_available, is_loaded, mark_imports_done, mark_startup_done, import_report, report_enabled
+)
 import sys
-import json
+import argparse
 import subprocess
 import os
-import winreg
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
@@ -16,11 +19,12 @@ from PyQt6.QtCore import (
     QThread, pyqtSignal
 )
 from PyQt6.QtGui import QPixmap, QFont, QKeyEvent, QPainter, QColor, QIcon
-import psutil
 from modules.app_reorder import integrate_reorder_mode
-from modules.search_widget import QuickSearchWidget
-from modules.joystick_notification import show_joystick_connected, show_joystick_disconnected
-from modules.program_scanner import ProgramScanner, ProgramScanDialog
+from modules.library_watcher import LibraryWatcher
+from modules.app_record import (
+    AppRecord, ConfigError, default_config, load_config_file, save_config_file
+)
+from modules.paths import get_paths, configure_paths, add_path_arguments, sanitize_filename, asset_folder
 
 
 # ===== CONFIGURAZIONE PERCORSI PORTABLE =====
@@ -32,31 +36,37 @@ else:
     # Se è uno script Python normale
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Definisci tutti i percorsi relativi alla BASE_DIR
-ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
+# Config, assets e cache sono risolti da modules.paths (portable / XDG / --data-dir)
 MODULES_DIR = os.path.join(BASE_DIR, 'modules')
-OLD_DIR = os.path.join(BASE_DIR, 'old')
-CONFIG_FILE = os.path.join(BASE_DIR, 'launcher_apps.json')
 
 # Aggiungi la directory modules al path per gli import
 sys.path.insert(0, MODULES_DIR)
 # ============================================
 
-# Try to import pygame for joystick support
-try:
-    import pygame
-    JOYSTICK_AVAILABLE = True
-except ImportError:
-    JOYSTICK_AVAILABLE = False
+# Moduli pesanti o usati di rado: importati al primo uso (vedi modules/lazy_import.py)
+program_scanner = lazy('modules.program_scanner')
+search_widget = lazy('modules.search_widget')
+joystick_notification = lazy('modules.joystick_notification')
+psutil = lazy('psutil')
+pygame = lazy('pygame')
+requests = lazy('requests')
+# Usati solo da comandi, download e banner (pe_cache porta con sé il pool di processi)
+library_bundle = lazy('modules.library_bundle')
+steam_library = lazy('modules.steam_library')
+dedupe = lazy('modules.dedupe')
+pe_cache = lazy('modules.pe_cache')
+icon_art = lazy('modules.icon_art')
+mark_imports_done()
+
+# pygame per il joystick: si controlla solo che sia installato, si carica dopo la prima finestra
+JOYSTICK_AVAILABLE = is_available('pygame')
+if not JOYSTICK_AVAILABLE:
     print("Warning: pygame not installed. Joystick support disabled.")
     print("Install with: pip install pygame")
 
-# Try to import requests for image downloading
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+# requests per scaricare le immagini
+REQUESTS_AVAILABLE = is_available('requests')
+if not REQUESTS_AVAILABLE:
     print("Warning: requests not installed. Online image search disabled.")
     print("Install with: pip install requests")
 
@@ -97,15 +107,40 @@ class ResponsiveScaling:
 class ImageManager:
     """Gestisce il download e la cache delle immagini per le app"""
     
-    def __init__(self, assets_dir="assets", api_key=None):
-        self.assets_dir = Path(assets_dir)
-        self.assets_dir.mkdir(exist_ok=True)
+    def __init__(self, assets_dir=None, api_key=None, metadata_cache=None):
+        self.assets_dir = Path(assets_dir) if assets_dir else get_paths().assets_dir
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
         self.api_key = api_key
-        
-    def get_app_image(self, app_name, app_path):
+        self._metadata_cache = metadata_cache
+
+    @property
+    def metadata_cache(self):
+        """PeMetadataCache condivisa con i banner, creata al primo uso (solo allora si importa pe_cache)"""
+        if self._metadata_cache is None:
+            paths_info = get_paths()
+            self._metadata_cache = pe_cache.PeMetadataCache(paths_info.pe_metadata_file, paths_info.pe_icon_dir)
+        return self._metadata_cache
+
+    def save_metadata(self):
+        """Salva i metadati PE letti finora (niente se la cache non è mai stata creata)"""
+        if self._metadata_cache is not None:
+            self._metadata_cache.save()
+
+    def exe_metadata(self, paths):
+        """Metadati PE (version-info, icona più grande) degli exe tra `paths`, letti tutti insieme
+        e salvati in cache: {percorso: metadati o None}"""
+        exes = [p for p in paths if p and p.lower().endswith('.exe')]
+        if not exes:
+            return {}
+        metadata = self.metadata_cache.metadata(exes)
+        self.metadata_cache.save()
+        return metadata
+        
+    def get_app_image(self, app_name, app_path, metadata=None):
         """
         Ottiene l'immagine per un'app.
         Cerca prima in locale, poi online se necessario.
+        `metadata` (da exe_metadata) fornisce nomi migliori per la ricerca online.
         """
         # 1. Cerca in locale
         local_image = self._find_local_image(app_name)
@@ -114,17 +149,23 @@ class ImageManager:
         
         # 2. Cerca online (se API key disponibile e requests installato)
         if self.api_key and REQUESTS_AVAILABLE:
-            online_image = self._download_from_steamgriddb(app_name)
+            online_image = self._download_from_steamgriddb(app_name, steam_library.steam_app_id(app_path),
+                                                           pe_cache.cover_search_names(app_name, metadata))
             if online_image:
                 return str(online_image)
         
         # 3. Fallback su icona exe
         return app_path if app_path and os.path.exists(app_path) else None
     
-    def _find_local_image(self, app_name):
-        """Cerca immagine nella cartella assets locale"""
+    def app_folder(self, app):
+        """Nome della cartella assets/<app> di un'app della libreria"""
+        return asset_folder(self.assets_dir, app.name, app.icon)
+    
+    def _find_local_image(self, app_name, folder=None):
+        """Cerca immagine nella cartella assets locale (`folder` se l'app ne ha una diversa
+        dal nome ripulito, vedi app_folder)"""
         safe_name = self._sanitize_filename(app_name)
-        app_folder = self.assets_dir / safe_name
+        app_folder = self.assets_dir / (folder or safe_name)
         
         if app_folder.exists():
             for ext in ['.png', '.jpg', '.jpeg', '.webp']:
@@ -138,8 +179,9 @@ class ImageManager:
         
         return None
     
-    def _download_from_steamgriddb(self, app_name):
-        """Scarica immagine da SteamGridDB"""
+    def _download_from_steamgriddb(self, app_name, steam_appid=None, search_names=None):
+        """Scarica immagine da SteamGridDB. `search_names` sono i nomi da cercare, in ordine
+        (es. il ProductName dell'exe prima del nome dell'app); l'immagine si salva sotto app_name"""
         if not self.api_key or not REQUESTS_AVAILABLE:
             return None
         
@@ -147,21 +189,29 @@ class ImageManager:
             from urllib.parse import quote
             headers = {"Authorization": f"Bearer {self.api_key}"}
             
-            # 1. Cerca il gioco
-            search_url = f"https://www.steamgriddb.com/api/v2/search/autocomplete/{quote(app_name)}"
-            response = requests.get(search_url, headers=headers, timeout=5)
-            
-            if response.status_code != 200:
-                return None
-            
-            results = response.json()
-            if not results.get('data'):
-                return None
-            
-            game_id = results['data'][0]['id']
+            if steam_appid:
+                # 1. Giochi Steam: l'app ID identifica il gioco, niente ricerca per nome
+                grids_url = f"https://www.steamgriddb.com/api/v2/grids/steam/{steam_appid}"
+            else:
+                # 1. Cerca il gioco (il primo nome che dà risultati)
+                game_id = None
+                for name in search_names or [app_name]:
+                    search_url = f"https://www.steamgriddb.com/api/v2/search/autocomplete/{quote(name)}"
+                    response = requests.get(search_url, headers=headers, timeout=5)
+                    
+                    if response.status_code != 200:
+                        return None
+                    
+                    results = response.json()
+                    if results.get('data'):
+                        game_id = results['data'][0]['id']
+                        break
+                
+                if game_id is None:
+                    return None
+                grids_url = f"https://www.steamgriddb.com/api/v2/grids/game/{game_id}"
             
             # 2. Ottieni immagini 16:9
-            grids_url = f"https://www.steamgriddb.com/api/v2/grids/game/{game_id}"
             params = {
                 "dimensions": ["460x215", "920x430"],
                 "types": ["static"]
@@ -199,8 +249,7 @@ class ImageManager:
     
     def _sanitize_filename(self, name):
         """Rimuove caratteri non validi per nomi file"""
-        safe = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_'))
-        return safe.strip().replace(' ', '_')
+        return sanitize_filename(name)
 
 
 # === API KEY DIALOG ===
@@ -372,22 +421,25 @@ def rounded_pixmap(original_path, width, height, radius):
 class DownloadWorker(QThread):
     """Worker thread per scaricare immagini in background"""
     progress_update = pyqtSignal(str, int) # Messaggio, percentuale
-    app_ready = pyqtSignal(dict) # Invia un'app completa
+    app_ready = pyqtSignal(object) # Invia un'app completa (AppRecord)
     finished = pyqtSignal()
 
-    def __init__(self, selected_programs, image_manager, existing_app_names):
+    def __init__(self, selected_programs, image_manager, existing_apps):
         super().__init__()
         self.selected = selected_programs
         self.image_manager = image_manager
-        self.existing = existing_app_names
+        self.existing = existing_apps  # dedupe.DuplicateIndex delle app già nel launcher
         self.is_running = True
 
     def run(self):
-        # Filtra solo i programmi non già esistenti
+        # Filtra i programmi già presenti, anche con nome quasi uguale o stesso comando,
+        # e i duplicati tra quelli selezionati
         to_download = []
         for prog in self.selected:
-            if prog['name'].lower() not in self.existing:
-                 to_download.append(prog)
+            if self.existing.find(prog) is None:
+                self.existing.add(prog)
+                # Il dict dello scanner diventa un AppRecord (i campi in più dello scanner restano fuori)
+                to_download.append(AppRecord.from_dict(prog))
         
         total = len(to_download)
         if total == 0:
@@ -395,18 +447,23 @@ class DownloadWorker(QThread):
             self.finished.emit()
             return
 
+        # Version-info degli exe letta una volta per tutti (in parallelo e dalla cache)
+        metadata = {}
+        if self.image_manager.api_key and REQUESTS_AVAILABLE:
+            metadata = self.image_manager.exe_metadata([prog.path for prog in to_download])
+
         for i, prog in enumerate(to_download):
             if not self.is_running:
                 break
             
             percent = int((i + 1) / total * 100)
-            self.progress_update.emit(f"Downloading: {prog['name']}...", percent)
+            self.progress_update.emit(f"Downloading: {prog.name}...", percent)
             
             # Scarica immagine 16:9 (se API key c'è)
             if self.image_manager.api_key and REQUESTS_AVAILABLE:
-                image_result = self.image_manager.get_app_image(prog['name'], prog['path'])
+                image_result = self.image_manager.get_app_image(prog.name, prog.path, metadata.get(prog.path))
                 if image_result:
-                    prog['icon'] = image_result
+                    prog.icon = image_result
             
             self.app_ready.emit(prog) # Invia l'app al thread principale
         
@@ -430,7 +487,7 @@ class CoverDownloadWorker(QThread):
 
     def __init__(self, apps_to_update, image_manager):
         super().__init__()
-        self.apps_to_update = apps_to_update  # Lista di tuple (index, app_data)
+        self.apps_to_update = apps_to_update  # Lista di tuple (index, AppRecord)
         self.image_manager = image_manager
         self.is_running = True
 
@@ -442,16 +499,19 @@ class CoverDownloadWorker(QThread):
             self.finished.emit(0)
             return
 
+        metadata = self.image_manager.exe_metadata([app_data.path for _, app_data in self.apps_to_update])
+
         for i, (app_index, app_data) in enumerate(self.apps_to_update):
             if not self.is_running:
                 break
             
             percent = int((i + 1) / total * 100)
-            self.progress_update.emit(f"Downloading: {app_data['name']}...", percent)
+            self.progress_update.emit(f"Downloading: {app_data.name}...", percent)
             
             # Scarica immagine 16:9
-            image_result = self.image_manager.get_app_image(app_data['name'], app_data['path'])
-            if image_result and image_result != app_data['path']:
+            image_result = self.image_manager.get_app_image(app_data.name, app_data.path,
+                                                            metadata.get(app_data.path))
+            if image_result and image_result != app_data.path:
                 # Emetti solo se abbiamo trovato una copertina diversa dall'exe
                 self.cover_downloaded.emit(app_index, image_result)
                 updated_count += 1
@@ -469,15 +529,17 @@ class CoverDownloadWorker(QThread):
         self.is_running = False
 
 class AppTile(QWidget):
-    def __init__(self, app_data, scaling, parent=None):
+    def __init__(self, app_data, scaling, parent=None, banners=None):
         super().__init__(parent)
         self.app_data = app_data
         self.scaling = scaling
         self.is_focused = False
+        self.banners = banners  # sorgente -> banner o None, riempito da icon_art.BannerService
        
         # === INIZIO OTTIMIZZAZIONE #1: CACHE PIXMAP ===
         self._normal_pixmap = None
         self._focused_pixmap = None
+        self._image_path = None
         # === FINE OTTIMIZZAZIONE #1 ===
        
         # Dimensioni scalate
@@ -524,7 +586,7 @@ class AppTile(QWidget):
         self.image_label.setGraphicsEffect(self.shadow)
         layout.addWidget(self.image_label)
         
-        self.name_label = QLabel(app_data['name'])
+        self.name_label = QLabel(app_data.name)
         self.name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.name_label.setMaximumWidth(self.normal_width)
         self.name_label.setStyleSheet(f"""
@@ -541,9 +603,33 @@ class AppTile(QWidget):
         # === OTTIMIZZAZIONE #1: Popola la cache iniziale ===
         self.set_focused(False)
 
+    def invalidate_pixmaps(self):
+        """Svuota la cache pixmap (nuova app o immagine cambiata su disco)"""
+        self._normal_pixmap = None
+        self._focused_pixmap = None
+        self._image_path = None
+
+    def banner_source(self):
+        return self.app_data.icon or self.app_data.path
+
+    def _plain_cover(self):
+        # Un exe o un collegamento non si apre come immagine: senza banner resta il nome
+        icon = self.app_data.icon
+        return '' if icon.lower().endswith(('.exe', '.lnk')) else icon
+
+    def image_path(self):
+        """Copertina dell'app; se non c'è (icona, exe) il banner generato dalla sua icona più grande.
+        Consulta solo i risultati di BannerService: qui non si legge nessun file"""
+        if self._image_path is None:
+            if self.banners is None or self.banner_source() not in self.banners:
+                # Banner non ancora pronto: le immagini si mostrano subito
+                return self._plain_cover()
+            self._image_path = self.banners[self.banner_source()] or self._plain_cover()
+        return self._image_path
+
     def set_focused(self, focused):
         self.is_focused = focused
-        icon_path = self.app_data.get('icon')
+        icon_path = self.image_path()
         
         if focused:
             self.setFixedSize(self.focused_width, self.focused_height)
@@ -559,7 +645,7 @@ class AppTile(QWidget):
             if self._focused_pixmap:
                 self.image_label.setPixmap(self._focused_pixmap)
             else:
-                self.image_label.setText(self.app_data['name']) # Fallback
+                self.image_label.setText(self.app_data.name) # Fallback
             # === FINE OTTIMIZZAZIONE #1 ===
             
             self.image_label.setStyleSheet(f"""
@@ -595,7 +681,7 @@ class AppTile(QWidget):
             if self._normal_pixmap:
                 self.image_label.setPixmap(self._normal_pixmap)
             else:
-                self.image_label.setText(self.app_data['name']) # Fallback
+                self.image_label.setText(self.app_data.name) # Fallback
             # === FINE OTTIMIZZAZIONE #1 ===
             
             self.image_label.setStyleSheet(f"""
@@ -752,7 +838,7 @@ class EditAppDialog(QDialog):
         name_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         layout.addWidget(name_label)
         self.name_input = QLineEdit()
-        self.name_input.setText(app_data.get('name', ''))
+        self.name_input.setText(app_data.name)
         layout.addWidget(self.name_input)
         exe_label = QLabel("Executable Path:")
         exe_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -760,7 +846,7 @@ class EditAppDialog(QDialog):
         exe_container = QHBoxLayout()
         exe_container.setSpacing(10)
         self.exe_input = QLineEdit()
-        self.exe_input.setText(app_data.get('path', ''))
+        self.exe_input.setText(app_data.path)
         exe_container.addWidget(self.exe_input, 3)
         self.exe_button = QPushButton("Browse")
         self.exe_button.clicked.connect(self.browse_exe)
@@ -772,7 +858,7 @@ class EditAppDialog(QDialog):
         icon_container = QHBoxLayout()
         icon_container.setSpacing(10)
         self.icon_input = QLineEdit()
-        self.icon_input.setText(app_data.get('icon', ''))
+        self.icon_input.setText(app_data.icon)
         icon_container.addWidget(self.icon_input, 3)
         self.icon_button = QPushButton("Browse")
         self.icon_button.clicked.connect(self.browse_icon)
@@ -857,11 +943,11 @@ class EditAppDialog(QDialog):
             self.icon_input.setText(file_path)
    
     def get_app_data(self):
-        return {
-            'name': self.name_input.text(),
-            'path': self.exe_input.text(),
-            'icon': self.icon_input.text()
-        }
+        return AppRecord(
+            self.name_input.text().strip(),
+            self.exe_input.text().strip(),
+            self.icon_input.text().strip()
+        )
 
 
 class AddAppDialog(QDialog):
@@ -987,11 +1073,11 @@ class AddAppDialog(QDialog):
             self.icon_input.setText(file_path)
    
     def get_app_data(self):
-        return {
-            'name': self.name_input.text(),
-            'path': self.exe_input.text(),
-            'icon': self.icon_input.text()
-        }
+        return AppRecord(
+            self.name_input.text().strip(),
+            self.exe_input.text().strip(),
+            self.icon_input.text().strip()
+        )
 
 
 class TVLauncher(QMainWindow):
@@ -1001,12 +1087,18 @@ class TVLauncher(QMainWindow):
         # Inizializza il sistema di scaling responsive
         self.scaling = ResponsiveScaling()
         
-        self.config_file = Path("launcher_apps.json")
+        self.paths = get_paths()
+        self.config_file = self.paths.config_file
         self.config_data = self.load_config()
         self.apps = self.config_data.get('apps', [])
         self.background_image = self.config_data.get('background', '')
         self.steamgriddb_api_key = self.config_data.get('steamgriddb_api_key', '')
+        self.invalid_apps = self.config_data.get('invalid_apps', [])  # voci non valide, riscritte invariate
+        # Version-info e icone degli exe: la cache (di image_manager) è condivisa con i banner delle tile
         self.image_manager = ImageManager(api_key=self.steamgriddb_api_key)
+        # Banner delle tile: risultati qui, worker creato dopo la prima finestra
+        self.banners = {}
+        self.banner_service = None
         self.current_index = 0
         self.tiles = []
         self.menu_button_index = 0
@@ -1024,10 +1116,8 @@ class TVLauncher(QMainWindow):
         self.launched_process = None
         self.process_check_timer = None
         self.inputs_enabled = True
-        # Quick Search Widget
-        self.quick_search = QuickSearchWidget(self.scaling, self)
-        self.quick_search.app_selected.connect(self.on_search_app_selected)
-        self.quick_search.search_closed.connect(self.on_search_closed)
+        # Quick Search Widget: creato alla prima ricerca
+        self.quick_search = None
         
         # === INIZIO OTTIMIZZAZIONE #2: INIT VAR WORKER ===
         self.download_worker = None
@@ -1037,8 +1127,8 @@ class TVLauncher(QMainWindow):
         # === FINE OTTIMIZZAZIONE #2 ===
         
         if JOYSTICK_AVAILABLE:
-            pygame.init()
-            self.init_joystick()
+            # pygame si importa e inizializza dopo che la finestra è comparsa
+            QTimer.singleShot(100, self.start_joystick)
         self.joystick_detection_timer = QTimer()
         self.joystick_detection_timer.timeout.connect(self.detect_joystick)
         self.joystick_detection_timer.start(5000)
@@ -1050,13 +1140,33 @@ class TVLauncher(QMainWindow):
         self.focused_height = self.scaling.scale(288)
         self.build_infinite_carousel()
         integrate_reorder_mode(self)
+
+        # Live reload: modifiche esterne a config e assets senza riavvio
+        self.library_watcher = LibraryWatcher(self.config_file, self.image_manager.assets_dir, self)
+        self.library_watcher.config_changed.connect(self.on_library_config_changed)
+        self.library_watcher.assets_changed.connect(self.on_library_assets_changed)
+
+    def start_joystick(self):
+        global JOYSTICK_AVAILABLE
+        try:
+            pygame.init()
+        except ImportError as e:
+            JOYSTICK_AVAILABLE = False
+            print(f"⚠️ Pygame could not be loaded - joystick support disabled: {e}")
+            return
+        self.init_joystick()
+        if self.joystick:
+            print(f"🎮 Joystick ready: {self.joystick.get_name()}")
+        else:
+            print("⚠️ No joystick detected - using keyboard only")
+
     def init_joystick(self):
         try:
             pygame.joystick.init()
             if pygame.joystick.get_count() > 0:
                 self.joystick = pygame.joystick.Joystick(0)
                 self.joystick.init()
-                self.joystick_notification = show_joystick_connected(
+                self.joystick_notification = joystick_notification.show_joystick_connected(
                     self, 
                     self.joystick.get_name(), 
                     self.scaling
@@ -1070,6 +1180,8 @@ class TVLauncher(QMainWindow):
             print(f"Error initializing joystick: {e}")
    
     def detect_joystick(self):
+        if not JOYSTICK_AVAILABLE:
+            return
         try:
             pygame.joystick.init()
             count = pygame.joystick.get_count()
@@ -1078,7 +1190,7 @@ class TVLauncher(QMainWindow):
                     self.joystick = pygame.joystick.Joystick(0)
                     self.joystick.init()
                     print(f"Joystick connected (late detection): {self.joystick.get_name()}")
-                    self.joystick_notification = show_joystick_connected(
+                    self.joystick_notification = joystick_notification.show_joystick_connected(
                         self, 
                         self.joystick.get_name(), 
                         self.scaling
@@ -1090,7 +1202,7 @@ class TVLauncher(QMainWindow):
             else:
                 if self.joystick is not None:
                     print("Joystick disconnected")
-                    self.joystick_notification = show_joystick_disconnected(
+                    self.joystick_notification = joystick_notification.show_joystick_disconnected(
                         self, 
                         self.scaling
                         )
@@ -1155,7 +1267,7 @@ class TVLauncher(QMainWindow):
    
     def handle_axis(self, x_axis, y_axis):
         # Se la ricerca è aperta, gestisci navigazione
-        if hasattr(self, 'quick_search') and self.quick_search.isVisible():
+        if self.quick_search is not None and self.quick_search.isVisible():
             if self.axis_cooldown > 0:
                 self.axis_cooldown -= 1
                 return
@@ -1197,7 +1309,7 @@ class TVLauncher(QMainWindow):
    
     def handle_button(self, button_index):
         # Se la ricerca è aperta, gestisci input specifici
-        if hasattr(self, 'quick_search') and self.quick_search.isVisible():
+        if self.quick_search is not None and self.quick_search.isVisible():
             current_time = pygame.time.get_ticks()
             if button_index in self.button_cooldown:
                 if current_time - self.button_cooldown[button_index] < 300:
@@ -1271,11 +1383,7 @@ class TVLauncher(QMainWindow):
     def init_ui(self):
         self.setWindowTitle("TV Launcher")
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
-        if JOYSTICK_AVAILABLE and self.joystick:
-            print(f"🎮 Joystick ready: {self.joystick.get_name()}")
-        elif JOYSTICK_AVAILABLE:
-            print("⚠️ No joystick detected - using keyboard only")
-        else:
+        if not JOYSTICK_AVAILABLE:
             print("⚠️ Pygame not installed - joystick support disabled")
         screen = QApplication.primaryScreen().geometry()
         self.setFixedSize(screen.width(), screen.height())
@@ -1373,7 +1481,7 @@ class TVLauncher(QMainWindow):
         
         # API KEY BUTTON
         api_btn = QPushButton()
-        api_btn.setIcon(QIcon("assets/icons/key.png"))
+        api_btn.setIcon(QIcon(get_paths().resource("assets", "icons", "key.png")))
         api_btn.setIconSize(QSize(self.scaling.scale(23), self.scaling.scale(23)))
 
         api_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
@@ -1385,7 +1493,7 @@ class TVLauncher(QMainWindow):
         header_layout.addWidget(api_btn)
 
         scan_btn = QPushButton()
-        scan_btn.setIcon(QIcon("assets/icons/search.png"))
+        scan_btn.setIcon(QIcon(get_paths().resource("assets", "icons", "search.png")))
         scan_btn.setIconSize(QSize(self.scaling.scale(23), self.scaling.scale(23)))
 
         scan_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
@@ -1397,7 +1505,7 @@ class TVLauncher(QMainWindow):
         header_layout.addWidget(scan_btn)
 
         add_btn = QPushButton()
-        add_btn.setIcon(QIcon("assets/icons/plus.png"))
+        add_btn.setIcon(QIcon(get_paths().resource("assets", "icons", "plus.png")))
         add_btn.setIconSize(QSize(self.scaling.scale(23), self.scaling.scale(23)))
 
         add_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
@@ -1410,7 +1518,7 @@ class TVLauncher(QMainWindow):
         
         
         bg_btn = QPushButton()
-        bg_btn.setIcon(QIcon("assets/icons/image.png"))
+        bg_btn.setIcon(QIcon(get_paths().resource("assets", "icons", "image.png")))
         bg_btn.setIconSize(QSize(self.scaling.scale(23), self.scaling.scale(23)))
 
         
@@ -1419,7 +1527,7 @@ class TVLauncher(QMainWindow):
 
         # DOWNLOAD COVERS BUTTON
         covers_btn = QPushButton()
-        covers_btn.setIcon(QIcon("assets/icons/download.png"))  # Crea un'icona download.png
+        covers_btn.setIcon(QIcon(get_paths().resource("assets", "icons", "download.png")))  # Crea un'icona download.png
         covers_btn.setIconSize(QSize(self.scaling.scale(23), self.scaling.scale(23)))
         covers_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         covers_btn.setFixedSize(self.scaling.scale(48), self.scaling.scale(48))
@@ -1552,29 +1660,22 @@ class TVLauncher(QMainWindow):
         self.showFullScreen()
    
     def load_config(self):
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        return {'apps': data, 'background': '', 'steamgriddb_api_key': ''}
-                    elif isinstance(data, dict):
-                        if 'steamgriddb_api_key' not in data:
-                            data['steamgriddb_api_key'] = ''
-                        return data
-                    else:
-                        return {'apps': [], 'background': '', 'steamgriddb_api_key': ''}
-            except:
-                return {'apps': [], 'background': '', 'steamgriddb_api_key': ''}
-        return {'apps': [], 'background': '', 'steamgriddb_api_key': ''}
+        """Carica launcher_apps.json migrandolo allo schema corrente (apps come AppRecord)"""
+        try:
+            return load_config_file(self.config_file, self.paths)
+        except ConfigError as e:
+            print(f"⚠️ Invalid config, starting empty: {e}")
+            return default_config()
    
     def save_config(self):
-        with open(self.config_file, 'w') as f:
-            json.dump({
-                'apps': self.apps,
-                'background': self.background_image,
-                'steamgriddb_api_key': self.steamgriddb_api_key
-            }, f, indent=2)
+        try:
+            save_config_file(self.config_file, self.apps, self.background_image, self.steamgriddb_api_key, self.paths,
+                             invalid_apps=self.invalid_apps)
+        except ConfigError as e:
+            print(f"⚠️ Config not saved: {e}")
+            return
+        if getattr(self, 'library_watcher', None):
+            self.library_watcher.note_own_write()
    
     def set_api_key(self):
         """Apre il dialog per impostare la API key"""
@@ -1584,7 +1685,8 @@ class TVLauncher(QMainWindow):
             if new_key != self.steamgriddb_api_key:
                 old_key = self.steamgriddb_api_key
                 self.steamgriddb_api_key = new_key
-                self.image_manager = ImageManager(api_key=self.steamgriddb_api_key)
+                self.image_manager = ImageManager(api_key=self.steamgriddb_api_key,
+                                                  metadata_cache=self.image_manager.metadata_cache)
                 self.save_config()
                 
                 if new_key:
@@ -1650,8 +1752,8 @@ class TVLauncher(QMainWindow):
         # Trova le app che necessitano di una copertina
         apps_to_update = []
         for i, app in enumerate(self.apps):
-            icon_path = app.get('icon', '')
-            app_path = app.get('path', '')
+            icon_path = app.icon
+            app_path = app.path
             
             # Casi in cui scaricare una nuova copertina:
             # 1. Icon è None o stringa vuota
@@ -1761,8 +1863,8 @@ class TVLauncher(QMainWindow):
     def _on_cover_downloaded(self, app_index, new_icon_path):
         """Aggiorna l'app con la nuova copertina scaricata"""
         if 0 <= app_index < len(self.apps):
-            self.apps[app_index]['icon'] = new_icon_path
-            print(f"✅ Cover updated for: {self.apps[app_index]['name']}")
+            self.apps[app_index].icon = new_icon_path
+            print(f"✅ Cover updated for: {self.apps[app_index].name}")
 
     def _on_cover_download_finished(self, updated_count):
         """Chiamato al termine del download di tutte le copertine"""
@@ -2006,10 +2108,15 @@ class TVLauncher(QMainWindow):
             self.current_index = 0
         num_apps = len(self.apps)
         
+        # Banner delle app senza copertina preparati nel worker, non dalle tile durante lo scorrimento.
+        # Dopo un giro dell'event loop: all'avvio icon_art e pe_cache si importano a finestra visibile
+        sources = [app.icon or app.path for app in self.apps]
+        QTimer.singleShot(100, lambda: self.request_banners(sources))
+        
         # Se ci sono 5 o meno app, mostra solo quelle senza ripetizioni
         if num_apps <= 5:
             for i in range(num_apps):
-                tile = AppTile(self.apps[i], self.scaling, self.carousel_container)
+                tile = AppTile(self.apps[i], self.scaling, self.carousel_container, self.banners)
                 tile.app_index = i
                 is_focused = (i == self.current_index)
                 tile.set_focused(is_focused)
@@ -2020,7 +2127,7 @@ class TVLauncher(QMainWindow):
             for i in range(self.max_visible_tiles):
                 app_offset = i - center_tile_index
                 app_idx = (self.current_index + app_offset) % num_apps
-                tile = AppTile(self.apps[app_idx], self.scaling, self.carousel_container)
+                tile = AppTile(self.apps[app_idx], self.scaling, self.carousel_container, self.banners)
                 tile.app_index = app_idx
                 is_focused = (i == center_tile_index)
                 tile.set_focused(is_focused)
@@ -2089,10 +2196,9 @@ class TVLauncher(QMainWindow):
             last_tile.app_index = new_app_idx
             
             # Invalida cache pixmap
-            last_tile._normal_pixmap = None
-            last_tile._focused_pixmap = None
+            last_tile.invalidate_pixmaps()
             
-            last_tile.name_label.setText(self.apps[new_app_idx]['name'])
+            last_tile.name_label.setText(self.apps[new_app_idx].name)
             last_tile.set_focused(False)
             
             # Position it OFF-SCREEN to the left BEFORE moving it
@@ -2133,10 +2239,9 @@ class TVLauncher(QMainWindow):
             first_tile.app_index = new_app_idx
             
             # Invalida cache pixmap
-            first_tile._normal_pixmap = None
-            first_tile._focused_pixmap = None
+            first_tile.invalidate_pixmaps()
             
-            first_tile.name_label.setText(self.apps[new_app_idx]['name'])
+            first_tile.name_label.setText(self.apps[new_app_idx].name)
             first_tile.set_focused(False)
             self.tiles.append(first_tile)
         else:
@@ -2148,10 +2253,9 @@ class TVLauncher(QMainWindow):
             last_tile.app_index = new_app_idx
             
             # Invalida cache pixmap
-            last_tile._normal_pixmap = None
-            last_tile._focused_pixmap = None
+            last_tile.invalidate_pixmaps()
             
-            last_tile.name_label.setText(self.apps[new_app_idx]['name'])
+            last_tile.name_label.setText(self.apps[new_app_idx].name)
             last_tile.set_focused(False)
             
         for i, tile in enumerate(self.tiles):
@@ -2160,10 +2264,126 @@ class TVLauncher(QMainWindow):
         self._position_all_tiles()
         self.is_animating = False
 
+    # === LIVE RELOAD ===
+    def _library_busy(self):
+        """True se un'animazione, il riordino o un worker stanno usando self.apps"""
+        reorder = getattr(self, 'reorder_mode', None)
+        return (
+            self.is_animating
+            or (reorder is not None and reorder.is_active)
+            or (self.download_worker is not None and self.download_worker.isRunning())
+            or (self.cover_download_worker is not None and self.cover_download_worker.isRunning())
+        )
+
+    def refresh_app_tiles(self, app_indices):
+        """Aggiorna solo le tile che mostrano le app indicate, senza ricostruire il carosello"""
+        # Il file dell'icona può essere cambiato: il banner si ricontrolla
+        self.request_banners([self.apps[i].icon or self.apps[i].path for i in app_indices], force=True)
+        for tile in self.tiles:
+            if tile.app_index in app_indices:
+                tile.app_data = self.apps[tile.app_index]
+                tile.name_label.setText(tile.app_data.name)
+                tile.invalidate_pixmaps()
+                tile.set_focused(tile.is_focused)
+
+    def request_banners(self, sources, force=False):
+        """Accoda i banner delle sorgenti indicate (solo quelle mai risolte, salvo `force`)"""
+        if self.banner_service is None:
+            cache = icon_art.BannerCache(self.paths.banner_cache_dir, self.image_manager.metadata_cache)
+            # Generati alla dimensione dell'immagine della tile con focus (AppTile): la tile normale lo riduce soltanto
+            self.banner_service = icon_art.BannerService(cache, self.scaling.scale(400), self.scaling.scale(225),
+                                                         results=self.banners)
+            self.banner_service.banners_ready.connect(self.on_banners_ready)
+        if force:
+            self.banner_service.request(sources)
+        else:
+            self.banner_service.request_missing(sources)
+
+    def on_banners_ready(self, results):
+        """Banner pronti nel worker: si ridisegnano solo le tile che li mostrano"""
+        # Un'immagine senza banner è già mostrata così com'è
+        sources = {source for source, banner in results if banner}
+        for tile in self.tiles:
+            if tile.banner_source() in sources:
+                tile.invalidate_pixmaps()
+                tile.set_focused(tile.is_focused)
+
+    def on_library_config_changed(self):
+        """launcher_apps.json modificato da un altro programma"""
+        if self._library_busy():
+            QTimer.singleShot(500, self.on_library_config_changed)
+            return
+
+        # Un file scritto a metà, non valido o rimosso non deve svuotare la libreria:
+        # si tiene quella attuale e si aspetta la prossima modifica
+        if not Path(self.config_file).exists():
+            print("⚠️ launcher_apps.json removed externally, keeping the current library")
+            return
+        try:
+            new_data = load_config_file(self.config_file, self.paths)
+        except ConfigError as e:
+            print(f"⚠️ Ignoring external config change, keeping the current library: {e}")
+            return
+        new_apps = new_data.get('apps', [])
+        self.invalid_apps = new_data.get('invalid_apps', [])
+
+        if new_data.get('background', '') != self.background_image:
+            self.background_image = new_data.get('background', '')
+            self.update_background()
+
+        new_key = new_data.get('steamgriddb_api_key', '')
+        if new_key != self.steamgriddb_api_key:
+            self.steamgriddb_api_key = new_key
+            self.image_manager.api_key = new_key
+
+        if len(new_apps) != len(self.apps):
+            # App aggiunte o rimosse: la disposizione delle tile cambia
+            self.apps = new_apps
+            if self.current_index >= len(self.apps):
+                self.current_index = max(len(self.apps) - 1, 0)
+            self.build_infinite_carousel()
+            print(f"🔄 Library reloaded: {len(self.apps)} apps")
+            return
+
+        changed = {i for i, (old, new) in enumerate(zip(self.apps, new_apps)) if old != new}
+        self.apps = new_apps
+        if changed:
+            self.refresh_app_tiles(changed)
+            print(f"🔄 Library reloaded: {len(changed)} app(s) changed")
+
+    def on_library_assets_changed(self, folders):
+        """Immagini aggiunte o sostituite in assets/<app>/"""
+        if self._library_busy():
+            QTimer.singleShot(500, lambda: self.on_library_assets_changed(folders))
+            return
+
+        folders = set(folders)
+        changed = set()
+        config_dirty = False
+        for i, app in enumerate(self.apps):
+            folder = self.image_manager.app_folder(app)
+            if folder not in folders:
+                continue
+            changed.add(i)
+
+            # Adotta la nuova copertina se l'app usa ancora l'exe o un file sparito
+            icon_path = app.icon
+            if not icon_path or icon_path == app.path or icon_path.lower().endswith('.exe') or not Path(icon_path).exists():
+                local_image = self.image_manager._find_local_image(app.name, folder)
+                if local_image and str(local_image) != icon_path:
+                    app.icon = str(local_image)
+                    config_dirty = True
+
+        if config_dirty:
+            self.save_config()
+        if changed:
+            self.refresh_app_tiles(changed)
+            print(f"🖼️ Assets reloaded for {len(changed)} app(s)")
+
     # === INIZIO OTTIMIZZAZIONE #2: METODI WORKER ===
     # ============================================
     def scan_programs(self):
-        dialog = ProgramScanDialog(self.image_manager, self)
+        dialog = program_scanner.ProgramScanDialog(self.image_manager, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             selected = dialog.get_selected()
             if not selected:
@@ -2211,9 +2431,11 @@ class TVLauncher(QMainWindow):
                 QPushButton:hover { background-color: #3a3a3a; }
             """)
 
-            existing_names = {app['name'].lower() for app in self.apps}
+            existing_apps = dedupe.DuplicateIndex()
+            for app in self.apps:
+                existing_apps.add({'key': app.key, 'name': app.name, 'path': app.path})
             
-            self.download_worker = DownloadWorker(selected, self.image_manager, existing_names)
+            self.download_worker = DownloadWorker(selected, self.image_manager, existing_apps)
             self.download_worker.app_ready.connect(self._on_app_ready_from_scan)
             self.download_worker.progress_update.connect(self._on_download_progress)
             self.download_worker.finished.connect(self._on_download_finished)
@@ -2270,17 +2492,18 @@ class TVLauncher(QMainWindow):
         dialog = AddAppDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             app_data = dialog.get_app_data()
-            if app_data['name'] and app_data['path']:
+            if app_data.name and app_data.path:
                 # NOTA: Questo download è ancora bloccante (come nell'originale)
                 # Per ottimizzare anche questo, servirebbe un worker separato
                 # per la singola app. Per ora rimane così.
-                if (not app_data['icon'] or app_data['icon'] == app_data['path']) and self.image_manager.api_key and REQUESTS_AVAILABLE:
-                    print(f"📥 Searching image for: {app_data['name']}")
+                if (not app_data.icon or app_data.icon == app_data.path) and self.image_manager.api_key and REQUESTS_AVAILABLE:
+                    print(f"📥 Searching image for: {app_data.name}")
                     
-                    image_result = self.image_manager.get_app_image(app_data['name'], app_data['path'])
+                    metadata = self.image_manager.exe_metadata([app_data.path]).get(app_data.path)
+                    image_result = self.image_manager.get_app_image(app_data.name, app_data.path, metadata)
                     if image_result:
-                        app_data['icon'] = image_result
-                        print(f"✅ Image found: {app_data['name']}")
+                        app_data.icon = image_result
+                        print(f"✅ Image found: {app_data.name}")
                     else:
                         print(f"⚠️ No image found, using exe icon")
                 
@@ -2298,7 +2521,7 @@ class TVLauncher(QMainWindow):
         dialog = EditAppDialog(self.apps[self.current_index], self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             app_data = dialog.get_app_data()
-            if app_data['name'] and app_data['path']:
+            if app_data.name and app_data.path:
                 self.apps[self.current_index] = app_data
                 self.save_config()
                 self.build_infinite_carousel() # Ricostruisce e rigenera le cache
@@ -2313,7 +2536,7 @@ class TVLauncher(QMainWindow):
 
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("Remove App")
-        msg_box.setText(f"<div style='margin-left:0px; margin-top:10px;'>Remove '<b>{self.apps[self.current_index]['name']}</b>'?</div>")
+        msg_box.setText(f"<div style='margin-left:0px; margin-top:10px;'>Remove '<b>{self.apps[self.current_index].name}</b>'?</div>")
         msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         msg_box.setIcon(QMessageBox.Icon.Question)
 
@@ -2356,20 +2579,20 @@ class TVLauncher(QMainWindow):
             return
         app = self.apps[self.current_index]
         try:
-            process = subprocess.Popen(app['path'], shell=True)
+            process = subprocess.Popen(app.path, shell=True)
             self.launched_process = process.pid
             self.disable_inputs()
             self.process_check_timer = QTimer()
             self.process_check_timer.timeout.connect(self.check_launched_process)
             self.process_check_timer.start(1000)
-            print(f"🚀 Launched: {app['name']} (PID: {process.pid})")
+            print(f"🚀 Launched: {app.name} (PID: {process.pid})")
         except Exception as e:
             QMessageBox.critical(self, "Launch Error", f"Could not launch app:\n{str(e)}")
             self.enable_inputs()
    
     def keyPressEvent(self, event: QKeyEvent):
         # Se la ricerca è aperta, inoltra input a lei
-        if hasattr(self, 'quick_search') and self.quick_search.isVisible():
+        if self.quick_search is not None and self.quick_search.isVisible():
             self.quick_search.keyPressEvent(event)
             return
         
@@ -2502,10 +2725,13 @@ class TVLauncher(QMainWindow):
 
     def open_quick_search(self):
         '''Apre il widget di ricerca rapida'''
-        if hasattr(self, 'quick_search'):
-            self.quick_search.set_apps(self.apps)
-            self.quick_search.show_search()
-            # NON disabilitare input - la ricerca gestisce tutto
+        if self.quick_search is None:
+            self.quick_search = search_widget.QuickSearchWidget(self.scaling, self)
+            self.quick_search.app_selected.connect(self.on_search_app_selected)
+            self.quick_search.search_closed.connect(self.on_search_closed)
+        self.quick_search.set_apps(self.apps)
+        self.quick_search.show_search()
+        # NON disabilitare input - la ricerca gestisce tutto
 
     def on_search_app_selected(self, app_index):
         """Gestisce la selezione di un'app dalla ricerca"""
@@ -2540,14 +2766,50 @@ class TVLauncher(QMainWindow):
             self.joystick_timer.stop()
         if self.joystick_detection_timer:
             self.joystick_detection_timer.stop()
-        if JOYSTICK_AVAILABLE:
+        # pygame.quit() sul segnaposto importerebbe pygame proprio alla chiusura
+        if JOYSTICK_AVAILABLE and is_loaded('pygame'):
             pygame.quit()
+        # Icone lette dal worker dei banner
+        if self.banner_service is not None:
+            self.banner_service.stop()
+        self.image_manager.save_metadata()
         event.accept()
 
+def parse_arguments(argv):
+    """Opzioni del launcher; gli argomenti sconosciuti restano a Qt"""
+    parser = argparse.ArgumentParser(description="TV Launcher")
+    add_path_arguments(parser)
+    parser.add_argument('--export-library', metavar='BUNDLE',
+                        help="Pack apps and their covers into BUNDLE and exit")
+    parser.add_argument('--import-library', metavar='BUNDLE',
+                        help="Add the apps and covers from BUNDLE to this library and exit")
+    parser.add_argument('--replace-library', action='store_true',
+                        help="With --import-library, replace the library instead of merging")
+    parser.add_argument('--import-report', action='store_true', default=report_enabled(),
+                        help="Print how long startup and each deferred import took")
+    return parser.parse_known_args(argv)
+
+
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_arguments(sys.argv[1:])
+    paths = configure_paths(args.data_dir, args.cache_dir, args.portable)
+    print(f"📁 Data: {paths.data_dir} | Cache: {paths.cache_dir} ({paths.mode})")
+
+    # Comandi senza interfaccia: export/import della libreria
+    if args.export_library or args.import_library:
+        try:
+            if args.export_library:
+                library_bundle.export_library(paths, args.export_library)
+            if args.import_library:
+                library_bundle.import_library(paths, args.import_library, replace=args.replace_library)
+        except (library_bundle.BundleError, OSError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     # Prova a impostare un'icona (assicurati che il percorso sia corretto)
-    icon_path = "assets/icons/logo48.png"
+    icon_path = paths.resource("assets", "icons", "logo48.png")
     if Path(icon_path).exists():
         app.setWindowIcon(QIcon(icon_path))
     else:
@@ -2557,7 +2819,14 @@ def main():
     launcher.show()
     launcher.setFocus()
     launcher.activateWindow()
+    # Dopo il primo giro dell'event loop la finestra è disegnata: fine dell'avvio
+    QTimer.singleShot(0, mark_startup_done)
+    if args.import_report:
+        QTimer.singleShot(0, lambda: print(import_report()))
     sys.exit(app.exec())
 
 if __name__ == '__main__':
+    # Necessario per il pool di processi dei metadati PE nelle build congelate
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
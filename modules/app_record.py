@@ -0,0 +1,208 @@
+"""
+App Record Module
+Typed app entries and the versioned launcher_apps.json schema (migrations + validation)
+"""
+
+import json
+import os
+import unicodedata
+
+# Versione corrente dello schema di launcher_apps.json
+#   0 = lista nuda di app (formato storico)
+#   1 = dizionario senza campo "version"
+#   2 = dizionario con "version", app validate
+CONFIG_VERSION = 2
+
+
+class ConfigError(ValueError):
+    """launcher_apps.json non è interpretabile"""
+
+
+def normalize_name(name):
+    """Chiave di confronto: senza accenti, casefold, spazi compattati ("Pokémon  X" -> "pokemon x")"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.casefold().split())
+
+
+class AppRecord:
+    """Un'app del launcher. __slots__ per tenere basso il costo per app.
+    `key` è il nome normalizzato, ricalcolato solo quando il nome cambia.
+    L'hash usa key e path: non rinominare né spostare un record mentre sta in un set o come chiave"""
+    __slots__ = ('_name', 'key', 'path', 'icon')
+
+    def __init__(self, name, path, icon=''):
+        self.name = name
+        self.path = path
+        self.icon = icon or ''
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+        self.key = normalize_name(value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crea un record da un dizionario (config, scanner o dialog), validando i campi"""
+        if not isinstance(data, dict):
+            raise ConfigError(f"app entry must be an object, got {type(data).__name__}")
+        name = data.get('name')
+        path = data.get('path')
+        icon = data.get('icon') or ''
+        if not isinstance(name, str) or not name.strip():
+            raise ConfigError("app entry has no name")
+        if not isinstance(path, str) or not path.strip():
+            raise ConfigError(f"app '{name}' has no path")
+        if not isinstance(icon, str):
+            raise ConfigError(f"app '{name}' has an invalid icon")
+        return cls(name.strip(), path.strip(), icon.strip())
+
+    def to_dict(self):
+        return {'name': self.name, 'path': self.path, 'icon': self.icon}
+
+    def copy(self):
+        return AppRecord(self.name, self.path, self.icon)
+
+    def __eq__(self, other):
+        if not isinstance(other, AppRecord):
+            return NotImplemented
+        return (self.name, self.path, self.icon) == (other.name, other.path, other.icon)
+
+    def __hash__(self):
+        # Record uguali hanno anche key e path uguali; l'icona resta fuori perché cambia spesso
+        return hash((self.key, self.path))
+
+    def __repr__(self):
+        return f"AppRecord(name={self.name!r}, path={self.path!r}, icon={self.icon!r})"
+
+
+def default_config():
+    return {'version': CONFIG_VERSION, 'apps': [], 'background': '', 'steamgriddb_api_key': '', 'invalid_apps': []}
+
+
+def _migrate_v0(data):
+    """Lista nuda -> dizionario"""
+    return {'apps': data, 'background': '', 'steamgriddb_api_key': ''}
+
+
+def _migrate_v1(data):
+    """Aggiunge i campi mancanti e il numero di versione"""
+    data.setdefault('apps', [])
+    data.setdefault('background', '')
+    data.setdefault('steamgriddb_api_key', '')
+    return data
+
+
+# versione di partenza -> funzione che porta alla versione successiva
+MIGRATIONS = {
+    0: _migrate_v0,
+    1: _migrate_v1,
+}
+
+
+def detect_version(data):
+    if isinstance(data, list):
+        return 0
+    if isinstance(data, dict):
+        version = data.get('version', 1)
+        if not isinstance(version, int) or version < 1:
+            raise ConfigError(f"invalid config version: {version!r}")
+        return version
+    raise ConfigError(f"config must be a list or an object, got {type(data).__name__}")
+
+
+def migrate_config(data):
+    """Porta un config di qualsiasi versione nota a CONFIG_VERSION"""
+    version = detect_version(data)
+    if version > CONFIG_VERSION:
+        print(f"⚠️ Config version {version} is newer than supported ({CONFIG_VERSION}), loading read-only")
+        return data
+    while version < CONFIG_VERSION:
+        data = MIGRATIONS[version](data)
+        version += 1
+        print(f"🔧 Config migrated to version {version}")
+    data['version'] = CONFIG_VERSION
+    return data
+
+
+def validate_config(data):
+    """Controlla i tipi e converte le app in AppRecord. Le app non valide restano così come sono
+    in data['invalid_apps']: save_config_file le riscrive, così non spariscono al primo salvataggio"""
+    if not isinstance(data.get('apps'), list):
+        raise ConfigError("'apps' must be a list")
+    for key in ('background', 'steamgriddb_api_key'):
+        if data.get(key) is None:
+            data[key] = ''
+        elif not isinstance(data[key], str):
+            raise ConfigError(f"'{key}' must be a string")
+
+    apps = []
+    invalid = []
+    for i, entry in enumerate(data['apps']):
+        try:
+            apps.append(AppRecord.from_dict(entry))
+        except ConfigError as e:
+            print(f"⚠️ Skipping app #{i} in config: {e}")
+            invalid.append(entry)
+    data['apps'] = apps
+    data['invalid_apps'] = invalid
+    return data
+
+
+def load_config_file(config_file, paths=None):
+    """Legge, migra e valida launcher_apps.json. Se manca restituisce il config di default.
+    Con `paths` (LauncherPaths) i percorsi relativi vengono risolti rispetto alla data dir"""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return default_config()
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"cannot read {config_file}: {e}") from e
+    data = validate_config(migrate_config(data))
+    if paths is not None:
+        for app in data['apps']:
+            app.icon = paths.from_stored(app.icon)
+        data['background'] = paths.from_stored(data['background'])
+    return data
+
+
+def stored_version(config_file):
+    """Versione dello schema del file su disco, None se manca o non è leggibile"""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return detect_version(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+def save_config_file(config_file, apps, background, steamgriddb_api_key, paths=None, invalid_apps=()):
+    """Salva il config. Con `paths` i file dentro la data dir vengono salvati come relativi.
+    `invalid_apps` (da load_config_file) vengono riscritte invariate dopo le app valide.
+    Un file scritto da un launcher più recente (versione > CONFIG_VERSION) non viene mai
+    sovrascritto: i campi che questa versione non conosce andrebbero persi (ConfigError)"""
+    version = stored_version(config_file)
+    if version is not None and version > CONFIG_VERSION:
+        raise ConfigError(f"{config_file} has config version {version}, newer than supported "
+                          f"({CONFIG_VERSION}): not overwriting it")
+    to_stored = paths.to_stored if paths is not None else (lambda p: p)
+    app_dicts = []
+    for app in apps:
+        entry = app.to_dict()
+        entry['icon'] = to_stored(entry['icon'])
+        app_dicts.append(entry)
+    app_dicts.extend(invalid_apps)
+    # Scrittura atomica: un crash a metà salvataggio lascia intatto il config precedente
+    tmp = os.fspath(config_file) + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': CONFIG_VERSION,
+            'apps': app_dicts,
+            'background': to_stored(background),
+            'steamgriddb_api_key': steamgriddb_api_key
+        }, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, config_file)
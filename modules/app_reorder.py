@@ -8,12 +8,10 @@ Save this file as 'app_reorder.py' in the same directory as tvlauncher.py
 from PyQt6.QtWidgets import QWidget, QLabel
 from PyQt6.QtCore import Qt, QTimer
 import time
+from modules.lazy_import import is_available
 
-try:
-    import pygame
-    PYGAME_AVAILABLE = True
-except ImportError:
-    PYGAME_AVAILABLE = False
+# Solo il controllo: pygame lo carica il launcher quando serve
+PYGAME_AVAILABLE = is_available('pygame')
 
 
 class ReorderMode:
@@ -96,7 +94,7 @@ class ReorderMode:
             self.target_index = self.launcher.current_index
             self._show_reorder_ui()
             self._update_tile_highlights()
-            print(f"🔄 Reorder mode activated - Selected: {self.launcher.apps[self.selected_index]['name']}")
+            print(f"🔄 Reorder mode activated - Selected: {self.launcher.apps[self.selected_index].name}")
     
     def _show_reorder_ui(self):
         """Shows visual feedback for reorder mode"""
@@ -314,7 +312,7 @@ class ReorderMode:
             # Save and rebuild
             self.launcher.save_config()
             
-            print(f"✅ Moved '{app_to_move['name']}' from position {self.selected_index} to {self.target_index}")
+            print(f"✅ Moved '{app_to_move.name}' from position {self.selected_index} to {self.target_index}")
         
         self._exit_reorder()
         # Rebuild AFTER exiting to avoid triggering reorder mode again
@@ -0,0 +1,147 @@
+"""
+Dedupe Module
+Groups programs that are the same app found by different sources
+("Visual Studio Code" / "visual-studio-code" / "Code" pointing to the same
+binary) and picks one canonical entry per group.
+
+Two entries are duplicates when they have the same normalised name, the same
+launch target, or token sets similar enough (Jaccard). Candidates for the
+similarity test come only from clusters sharing a token (blocking), so adding
+an entry costs about the same however large the library is.
+"""
+
+import re
+from modules.app_record import normalize_name
+
+SIMILARITY_THRESHOLD = 0.8
+
+# Token molto comuni ("microsoft", "game", ...) non vengono usati per trovare candidati
+MAX_BLOCK_SIZE = 64
+
+# Simboli e indicazioni di architettura che non distinguono due app
+_NOISE = re.compile(r'[™®©]|\b(?:x64|x86|amd64|win64|win32|64[- ]?bit|32[- ]?bit)\b', re.IGNORECASE)
+_TOKEN_SPLIT = re.compile(r'[^0-9a-z]+')
+_STOP_TOKENS = frozenset({'the', 'a', 'an', 'of', 'and'})
+# Numeri e numeri romani distinguono i seguiti ("Half-Life" / "Half-Life 2"): devono coincidere
+_NUMBER = re.compile(r'^(?:\d+|[ivx]+)$')
+
+
+def name_tokens(name):
+    """Token del nome senza punteggiatura, accenti e simboli: "Visual-Studio Code™" -> {visual, studio, code}"""
+    key = normalize_name(_NOISE.sub(' ', name))
+    return frozenset(t for t in _TOKEN_SPLIT.split(key) if t and t not in _STOP_TOKENS)
+
+
+def target_identity(path):
+    """Chiave di confronto del comando di avvio (virgolette, spazi e maiuscole dei percorsi Windows ignorati)"""
+    if not path:
+        return None
+    command = ' '.join(path.replace('"', ' ').replace("'", ' ').split())
+    if re.match(r'^[a-zA-Z]:\\', command) or command.startswith('\\\\'):
+        command = command.lower()
+    return command or None
+
+
+def number_tokens(tokens):
+    return frozenset(t for t in tokens if _NUMBER.match(t))
+
+
+def similarity(a, b):
+    """Indice di Jaccard tra due insiemi di token"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class Cluster:
+    """Gruppo di duplicati. `canonical` è il membro con il rank più basso (a parità, il primo);
+    `token_sets` sono i nomi (tokenizzati) di tutti i membri, per il confronto per somiglianza"""
+    __slots__ = ('members', 'canonical', 'best', 'token_sets')
+
+    def __init__(self, item, rank, seq):
+        self.members = [item]
+        self.canonical = item
+        self.best = (rank, seq)
+        self.token_sets = set()
+
+
+class DuplicateIndex:
+    """Indice incrementale dei duplicati. Gli elementi sono dict con 'name', 'path' e
+    (opzionale) 'key'; rank più basso = fonte preferita per l'elemento canonico"""
+
+    def __init__(self):
+        self._by_key = {}
+        self._by_target = {}
+        self._blocks = {}  # token -> [(token del nome, cluster)]
+        self._seq = 0
+        self.clusters = []
+
+    def _keys(self, item):
+        key = item.get('key') or normalize_name(item['name'])
+        return key, target_identity(item.get('path')), name_tokens(item['name'])
+
+    def find(self, item):
+        """Cluster di cui `item` sarebbe un duplicato, oppure None"""
+        key, target, tokens = self._keys(item)
+        return self._find(key, target, tokens)
+
+    def _find(self, key, target, tokens):
+        cluster = self._by_key.get(key)
+        if cluster is None and target is not None:
+            cluster = self._by_target.get(target)
+        if cluster is not None:
+            return cluster
+
+        best, best_score = None, SIMILARITY_THRESHOLD
+        numbers = number_tokens(tokens)
+        seen = set()
+        for token in tokens:
+            block = self._blocks.get(token, ())
+            if len(block) > MAX_BLOCK_SIZE:
+                continue
+            for candidate_tokens, candidate in block:
+                if candidate_tokens in seen:
+                    continue
+                seen.add(candidate_tokens)
+                if number_tokens(candidate_tokens) != numbers:
+                    continue
+                score = similarity(tokens, candidate_tokens)
+                if score >= best_score:
+                    best, best_score = candidate, score
+        return best
+
+    def add(self, item, rank=0):
+        """Aggiunge un elemento. Restituisce (cluster, creato, canonico_precedente):
+        canonico_precedente è l'elemento che `item` ha sostituito come canonico, se è successo"""
+        key, target, tokens = self._keys(item)
+        self._seq += 1
+        cluster = self._find(key, target, tokens)
+
+        if cluster is None:
+            cluster = Cluster(item, rank, self._seq)
+            self.clusters.append(cluster)
+            replaced, created = None, True
+        else:
+            cluster.members.append(item)
+            replaced, created = None, False
+            if (rank, self._seq) < cluster.best:
+                replaced = cluster.canonical
+                cluster.canonical = item
+                cluster.best = (rank, self._seq)
+
+        if tokens and tokens not in cluster.token_sets:
+            cluster.token_sets.add(tokens)
+            for token in tokens:
+                self._blocks.setdefault(token, []).append((tokens, cluster))
+        self._by_key.setdefault(key, cluster)
+        if target is not None:
+            self._by_target.setdefault(target, cluster)
+        return cluster, created, replaced
+
+
+def dedupe(items, rank=lambda item: 0):
+    """Elenco degli elementi canonici di `items` (uno per gruppo di duplicati), in ordine di arrivo"""
+    index = DuplicateIndex()
+    for item in items:
+        index.add(item, rank(item))
+    return [cluster.canonical for cluster in index.clusters]
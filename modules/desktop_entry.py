@@ -0,0 +1,255 @@
+"""
+Desktop Entry Module
+Parser for freedesktop .desktop files (Desktop Entry Specification 1.5):
+groups, localised keys, escapes, Exec quoting and field codes, TryExec,
+Hidden/NoDisplay, OnlyShowIn/NotShowIn and Type
+"""
+
+import os
+import shlex
+import threading
+
+MAIN_GROUP = 'Desktop Entry'
+
+_VALUE_ESCAPES = {'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', ';': ';'}
+
+# Field code senza argomenti da passare: file, URL, cartelle, deprecati
+_DROPPED_FIELD_CODES = frozenset('fFuUdDnNvm')
+
+# Marcatori che Flatpak aggiunge attorno a %u/%f (es. "@@u %U @@")
+_FLATPAK_MARKERS = frozenset({'@@', '@@u', '@@f'})
+
+
+class DesktopEntryError(ValueError):
+    """File .desktop non valido"""
+
+
+def _unescape(value):
+    if '\\' not in value:
+        return value
+    out = []
+    chars = iter(value)
+    for c in chars:
+        if c == '\\':
+            nxt = next(chars, '')
+            out.append(_VALUE_ESCAPES.get(nxt, '\\' + nxt))
+        else:
+            out.append(c)
+    return ''.join(out)
+
+
+def current_locales(environ=None):
+    """Varianti del locale dei messaggi, dalla più specifica: it_IT@euro -> it_IT@euro, it_IT, it@euro, it"""
+    environ = os.environ if environ is None else environ
+    value = environ.get('LC_ALL') or environ.get('LC_MESSAGES') or environ.get('LANG') or ''
+    # lang_COUNTRY.ENCODING@MODIFIER: la codifica non conta
+    value, _, modifier = value.partition('@')
+    value = value.split('.', 1)[0]
+    if not value or value in ('C', 'POSIX'):
+        return ()
+    lang, _, country = value.partition('_')
+    variants = []
+    if country and modifier:
+        variants.append(f"{lang}_{country}@{modifier}")
+    if country:
+        variants.append(f"{lang}_{country}")
+    if modifier:
+        variants.append(f"{lang}@{modifier}")
+    variants.append(lang)
+    return tuple(variants)
+
+
+def current_desktops(environ=None):
+    """Nomi del desktop corrente (XDG_CURRENT_DESKTOP, separati da ':')"""
+    environ = os.environ if environ is None else environ
+    return frozenset(d for d in environ.get('XDG_CURRENT_DESKTOP', '').split(':') if d)
+
+
+def parse_desktop_entry(path, locales=()):
+    """Legge solo il gruppo [Desktop Entry]. Restituisce chiave -> valore, con le chiavi
+    localizzate già risolte secondo `locales` (dalla più specifica)"""
+    values = {}
+    localized = {}  # chiave -> {locale: valore}
+    in_main = False
+    seen_main = False
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == '#':
+                continue
+            if line[0] == '[':
+                if seen_main:
+                    # Il gruppo principale è finito: gli altri (azioni ecc.) non servono
+                    break
+                in_main = line == f'[{MAIN_GROUP}]'
+                seen_main = in_main
+                continue
+            if not in_main:
+                continue
+            key, sep, value = line.partition('=')
+            if not sep:
+                continue
+            key = key.rstrip()
+            value = value.lstrip()
+            bracket = key.find('[')
+            if bracket != -1 and key.endswith(']'):
+                locale = key[bracket + 1:-1]
+                if locale in locales:
+                    localized.setdefault(key[:bracket], {})[locale] = value
+            else:
+                values.setdefault(key, value)
+    if not seen_main:
+        raise DesktopEntryError(f"no [{MAIN_GROUP}] group in {path}")
+    for key, by_locale in localized.items():
+        for locale in locales:
+            if locale in by_locale:
+                values[key] = by_locale[locale]
+                break
+    return {key: _unescape(value) for key, value in values.items()}
+
+
+def split_exec(exec_value):
+    """Divide la chiave Exec in argomenti secondo le regole di quoting della specifica"""
+    args = []
+    current = []
+    in_arg = False
+    quoted = False
+    chars = iter(exec_value)
+    for c in chars:
+        if quoted:
+            if c == '"':
+                quoted = False
+            elif c == '\\':
+                nxt = next(chars, '')
+                current.append(nxt if nxt in '"`$\\' else '\\' + nxt)
+            else:
+                current.append(c)
+        elif c == '"':
+            quoted = in_arg = True
+        elif c in ' \t':
+            if in_arg:
+                args.append(''.join(current))
+                current = []
+                in_arg = False
+        else:
+            current.append(c)
+            in_arg = True
+    if quoted:
+        raise DesktopEntryError(f"unterminated quote in Exec: {exec_value!r}")
+    if in_arg:
+        args.append(''.join(current))
+    return args
+
+
+def expand_field_codes(args, entry, path):
+    """Sostituisce i field code (%c, %k, %i, %%) e toglie quelli per file/URL"""
+    expanded = []
+    for arg in args:
+        if arg in _FLATPAK_MARKERS:
+            continue
+        if len(arg) == 2 and arg[0] == '%':
+            code = arg[1]
+            if code in _DROPPED_FIELD_CODES:
+                continue
+            if code == 'i':
+                if entry.get('Icon'):
+                    expanded += ['--icon', entry['Icon']]
+                continue
+        out = []
+        i = 0
+        while i < len(arg):
+            if arg[i] == '%' and i + 1 < len(arg):
+                code = arg[i + 1]
+                if code == '%':
+                    out.append('%')
+                elif code == 'c':
+                    out.append(entry.get('Name', ''))
+                elif code == 'k':
+                    out.append(path)
+                # Altri field code dentro un argomento vengono eliminati
+                i += 2
+            else:
+                out.append(arg[i])
+                i += 1
+        expanded.append(''.join(out))
+    return expanded
+
+
+def _is_true(value):
+    return value is not None and value.strip().lower() == 'true'
+
+
+def _list(value):
+    return [v for v in (value or '').split(';') if v]
+
+
+class ExecutableLookup:
+    """Tabella nome -> percorso degli eseguibili nel PATH, costruita una volta
+    (al primo uso) invece di chiamare shutil.which per ogni file .desktop"""
+
+    def __init__(self, path_env=None):
+        self.path_env = os.environ.get('PATH', '') if path_env is None else path_env
+        self._table = None
+        self._lock = threading.Lock()
+
+    def _build(self):
+        table = {}
+        for directory in self.path_env.split(os.pathsep):
+            if not directory:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        # Il primo della lista vince, come per la shell
+                        table.setdefault(entry.name, entry.path)
+            except OSError:
+                continue
+        return table
+
+    def which(self, command):
+        """Percorso completo di un comando (assoluto o nel PATH) se eseguibile, altrimenti None"""
+        if os.path.isabs(command):
+            return command if os.path.isfile(command) and os.access(command, os.X_OK) else None
+        if os.sep in command:
+            return None
+        with self._lock:
+            if self._table is None:
+                self._table = self._build()
+        path = self._table.get(command)
+        return path if path and os.access(path, os.X_OK) else None
+
+
+def read_application(path, lookup, locales=(), desktops=frozenset()):
+    """Legge un .desktop di tipo Application avviabile.
+    Restituisce {'name', 'command', 'executable', 'icon'} oppure None se la voce va nascosta"""
+    entry = parse_desktop_entry(path, locales)
+
+    if entry.get('Type') != 'Application':
+        return None
+    if _is_true(entry.get('Hidden')) or _is_true(entry.get('NoDisplay')) or _is_true(entry.get('Terminal')):
+        return None
+    only_show_in = _list(entry.get('OnlyShowIn'))
+    if only_show_in and not desktops.intersection(only_show_in):
+        return None
+    if desktops.intersection(_list(entry.get('NotShowIn'))):
+        return None
+    if entry.get('TryExec') and not lookup.which(entry['TryExec']):
+        return None
+
+    name = entry.get('Name', '').strip()
+    if not name or not entry.get('Exec'):
+        return None
+    args = expand_field_codes(split_exec(entry['Exec']), entry, path)
+    if not args:
+        return None
+    executable = lookup.which(args[0])
+    if not executable:
+        return None
+    args[0] = executable
+
+    return {
+        'name': name,
+        'command': ' '.join(shlex.quote(a) for a in args),
+        'executable': executable,
+        'icon': entry.get('Icon', '').strip(),
+    }
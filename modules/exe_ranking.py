@@ -0,0 +1,119 @@
+"""
+Exe Ranking Module
+Scores the executables of an install folder to find the one that starts the
+program: name similarity with the app (file name and version-info product
+name), GUI vs console subsystem, file size and known helper/installer stubs.
+A folder profile (size and PE info of each exe) does not depend on the app
+name, so it can be cached by folder mtime and reused by every scan.
+"""
+
+import os
+import re
+import math
+from modules.dedupe import name_tokens, similarity
+from modules.pe_metadata import PeError, read_pe_info
+
+# Sotto questo punteggio un exe non viene mai scelto (disinstallatori, runtime, crash handler)
+UNUSABLE_SCORE = -80
+# Exe proposti per un programma: il migliore più le alternative scelte dal dialog di scansione
+MAX_CANDIDATES = 5
+
+# Nomi (senza .exe) di eseguibili che non sono mai il programma
+KNOWN_STUBS = frozenset({
+    'unitycrashhandler32', 'unitycrashhandler64', 'crashpad_handler', 'crashreporter', 'crashsender1403',
+    'ue4prereqsetup_x64', 'ueprereqsetup_x64', 'easyanticheat', 'easyanticheat_setup', 'easyanticheat_eos_setup',
+    'beservice', 'beservice_x64', 'vc_redist.x64', 'vc_redist.x86', 'vcredist_x64', 'vcredist_x86',
+    'dxsetup', 'dxwebsetup', 'dotnetfx', 'oalinst', 'physx', 'python', 'pythonw', 'java', 'javaw',
+    'qtwebengineprocess', 'cefsharp.browsersubprocess', 'notification_helper', 'elevate', 'squirrel',
+})
+
+# Disinstallatori: esclusi qualunque sia il resto del punteggio
+_UNINSTALLER = re.compile(r'unins|uninst')
+# Parole nel nome file o nella descrizione: (regex, penalità)
+_PENALTIES = [
+    (re.compile(r'setup|install|redist|prereq|bootstrap'), -60),
+    (re.compile(r'update|crash|report|helper|service|background|agent|stub|diagnos|feedback'), -40),
+    (re.compile(r'launcher'), -15),
+]
+_COMPACT = re.compile(r'[^0-9a-z]+')
+
+
+def directory_profile(directory):
+    """{nome exe: [size, sottosistema, ProductName, FileDescription]} degli exe di una cartella.
+    Sottosistema None se l'exe non è un PE leggibile. OSError se la cartella non è leggibile"""
+    profile = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.lower().endswith('.exe'):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            try:
+                info = read_pe_info(entry.path)
+                version = info['version']
+                profile[entry.name] = [size, info['subsystem'],
+                                       version.get('ProductName', ''), version.get('FileDescription', '')]
+            except (OSError, PeError):
+                profile[entry.name] = [size, None, '', '']
+    return profile
+
+
+def _compact(text):
+    return _COMPACT.sub('', text.lower())
+
+
+def score_executable(exe_name, info, app_name, app_tokens=None):
+    """Punteggio di un exe per un'app (più alto = più probabile). info = voce di directory_profile"""
+    size, subsystem, product, description = info
+    stem = exe_name[:-4] if exe_name.lower().endswith('.exe') else exe_name
+    stem_lower = stem.lower()
+    checked = f"{stem_lower} {description.lower()}"
+    if stem_lower in KNOWN_STUBS or _UNINSTALLER.search(checked):
+        return -100
+    app_tokens = app_tokens if app_tokens is not None else name_tokens(app_name)
+
+    score = 0.0
+    # Nome del file: uguale o contenuto nel nome dell'app (e viceversa), poi token in comune
+    app_compact, exe_compact = _compact(app_name), _compact(stem)
+    if exe_compact and app_compact:
+        if exe_compact == app_compact:
+            score += 50
+        elif len(exe_compact) >= 3 and (exe_compact in app_compact or app_compact in exe_compact):
+            score += 35
+    score += 30 * similarity(app_tokens, name_tokens(stem))
+    # Version-info: il nome del prodotto è spesso più affidabile del nome file
+    if product:
+        score += 30 * similarity(app_tokens, name_tokens(product))
+
+    if subsystem == 'gui':
+        score += 15
+    elif subsystem == 'console':
+        score -= 15
+    elif subsystem is None:
+        score -= 30
+
+    if size:
+        # Il programma vero è quasi sempre più grande di helper e stub
+        score += max(-10.0, min(10.0, 2 * math.log2(size / (64 * 1024))))
+
+    penalty = min((value for pattern, value in _PENALTIES if pattern.search(checked)), default=0)
+    return score + penalty
+
+
+def rank_profile(directory, profile, app_name):
+    """[(punteggio, percorso)] degli exe di un profilo, dal migliore"""
+    app_tokens = name_tokens(app_name)
+    ranked = [(score_executable(name, info, app_name, app_tokens), os.path.join(directory, name))
+              for name, info in profile.items()]
+    # A parità di punteggio il nome più corto ("game.exe" prima di "game_dx11.exe")
+    ranked.sort(key=lambda item: (-item[0], len(item[1]), item[1]))
+    return ranked
+
+
+def usable_executables(ranked, limit=MAX_CANDIDATES):
+    """Percorsi degli exe utilizzabili di una classifica, dal migliore (al massimo `limit`)"""
+    return [path for score, path in ranked[:limit] if score > UNUSABLE_SCORE]
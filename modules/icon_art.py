@@ -0,0 +1,240 @@
+"""
+Icon Art Module
+Fallback art for tiles without a cover. The largest icon available for the app
+(the 256px PNG or biggest bitmap embedded in the exe, SVG theme icons rendered
+at full size, image files) is centred on a blurred and darkened copy of
+itself, rendered once at tile resolution and cached on disk as PNG, so the
+carousel only loads a ready-made banner. Everything that reads files (image
+headers, exe icons, banner rendering) runs in BannerService's worker thread.
+"""
+
+import os
+import hashlib
+from pathlib import Path
+from PyQt6.QtCore import Qt, QSize, QFileInfo, QRectF, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPainter, QColor, QBrush, QLinearGradient
+from PyQt6.QtWidgets import QFileIconProvider
+
+from modules.icon_service import QueueWorker
+
+# Cambia quando cambia il disegno dei banner (invalida quelli in cache)
+BANNER_VERSION = 1
+ICON_RENDER_SIZE = 256
+# Altezza dello sfondo prima di essere ingrandito: più piccola = più sfocato
+BLUR_SIZE = 6
+BACKGROUND = QColor("#1a1a1a")
+# Immagini fino a questa dimensione sono icone, non copertine
+ICON_MAX_SIZE = 256
+# Sorgenti risolte insieme: gli exe di un gruppo si leggono in un solo pool di processi
+BATCH_SIZE = 64
+
+ICON_EXTENSIONS = ('.ico', '.svg', '.svgz', '.xpm')
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+EXE_EXTENSIONS = ('.exe', '.lnk')
+
+
+def is_icon_source(path):
+    """True se `path` è un exe o un'icona: non si mostra mai così com'è (solo l'estensione, niente I/O)"""
+    return bool(path) and path.lower().endswith(EXE_EXTENSIONS + ICON_EXTENSIONS)
+
+
+def needs_banner(path):
+    """True se `path` non è una copertina da mostrare così com'è: exe, icone e immagini
+    quadrate o piccole come un'icona. Le copertine larghe non lo sono mai, a qualsiasi
+    scala dello schermo. Legge l'header delle immagini: solo nel worker"""
+    if not path:
+        return False
+    if is_icon_source(path):
+        return True
+    if path.lower().endswith(IMAGE_EXTENSIONS):
+        size = QImageReader(path).size()
+        if not size.isValid():
+            return False
+        return (size.width() < size.height() * 1.2
+                or max(size.width(), size.height()) <= ICON_MAX_SIZE)
+    return False
+
+
+def _read_image(path, size=ICON_RENDER_SIZE):
+    """Immagine più grande di un file (tutte le immagini di un .ico, SVG disegnati a `size`)"""
+    reader = QImageReader(path)
+    if path.lower().endswith(('.svg', '.svgz')):
+        native = reader.size()
+        if native.isValid() and not native.isEmpty():
+            reader.setScaledSize(native.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio))
+        else:
+            reader.setScaledSize(QSize(size, size))
+        image = reader.read()
+        return None if image.isNull() else image
+
+    best = None
+    for i in range(max(reader.imageCount(), 1)):
+        if i and not reader.jumpToImage(i):
+            break
+        image = reader.read()
+        if not image.isNull() and (best is None or image.width() * image.height() > best.width() * best.height()):
+            best = image
+    return best
+
+
+def load_icon_image(path, pe_cache=None, provider=None):
+    """Icona più grande disponibile per un file, come QImage. None se non c'è.
+    Per gli exe si usa l'icona estratta da PeMetadataCache, poi l'icona di sistema
+    (da `provider`, il QFileIconProvider del worker, se passato)"""
+    lower = path.lower()
+    if lower.endswith('.exe') and pe_cache is not None:
+        icon_file = pe_cache.icon_path(pe_cache.metadata([path]).get(path))
+        if icon_file:
+            image = _read_image(icon_file)
+            if image is not None:
+                return image
+    elif lower.endswith(ICON_EXTENSIONS + IMAGE_EXTENSIONS):
+        return _read_image(path)
+
+    if not lower.endswith(EXE_EXTENSIONS) or not os.path.exists(path):
+        return None
+    # Shortcut o exe senza icona leggibile: icona di sistema alla dimensione maggiore
+    icon = (provider or QFileIconProvider()).icon(QFileInfo(path))
+    sizes = icon.availableSizes()
+    if icon.isNull() or not sizes:
+        return None
+    largest = max(sizes, key=lambda s: s.width() * s.height())
+    image = icon.pixmap(largest).toImage()
+    return None if image.isNull() else image
+
+
+def compose_banner(icon, width, height):
+    """Banner width x height: icona al centro su una sua copia sfocata, scurita in basso"""
+    banner = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    banner.fill(BACKGROUND)
+
+    # Sfondo sfocato: l'icona ridotta a pochi pixel e ingrandita con filtro lineare
+    ratio = width / height
+    tiny = icon.scaled(max(1, int(BLUR_SIZE * ratio)), BLUR_SIZE,
+                       Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    backdrop = tiny.scaled(width, height,
+                           Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+    painter = QPainter(banner)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setOpacity(0.85)
+    painter.drawImage(0, 0, backdrop)
+    painter.setOpacity(1.0)
+
+    shade = QLinearGradient(0, 0, 0, height)
+    shade.setColorAt(0.0, QColor(0, 0, 0, 40))
+    shade.setColorAt(1.0, QColor(0, 0, 0, 170))
+    painter.fillRect(0, 0, width, height, QBrush(shade))
+
+    # Icona: al massimo 60% dell'altezza e mai oltre il doppio della sua dimensione
+    side = min(int(height * 0.6), max(icon.width(), icon.height()) * 2)
+    scaled = icon.scaled(side, side, Qt.AspectRatioMode.KeepAspectRatio,
+                         Qt.TransformationMode.SmoothTransformation)
+    x = (width - scaled.width()) / 2
+    y = (height - scaled.height()) / 2
+    # Ombra morbida sotto l'icona
+    glow = QColor(0, 0, 0, 90)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(glow)
+    painter.drawEllipse(QRectF(x + side * 0.1, y + scaled.height() * 0.92, side * 0.8, side * 0.12))
+    painter.drawImage(int(x), int(y), scaled)
+    painter.end()
+    return banner
+
+
+class BannerCache:
+    """Banner generati su disco, uno per (file sorgente, mtime, size, dimensione della tile).
+    Un file vuoto ricorda che per quella sorgente non c'è nessuna icona"""
+
+    def __init__(self, cache_dir, pe_cache=None):
+        self.cache_dir = Path(cache_dir)
+        self.pe_cache = pe_cache
+
+    def _cached_file(self, source, width, height):
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(source)}|{st.st_mtime_ns}|{st.st_size}|{width}x{height}|{BANNER_VERSION}"
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png"
+
+    def prepare(self, sources):
+        """Legge insieme (in un pool di processi) le icone degli exe non ancora in cache,
+        così i banner non leggono gli exe uno alla volta"""
+        if self.pe_cache is None:
+            return
+        exes = [source for source in sources if source and source.lower().endswith('.exe')]
+        if exes:
+            self.pe_cache.metadata(exes)
+            self.pe_cache.save()
+
+    def banner(self, source, width, height, provider=None):
+        """Percorso del banner per `source`, generato se manca. None se non c'è un'icona da usare"""
+        cached = self._cached_file(source, width, height)
+        if cached is None:
+            return None
+        try:
+            if cached.stat().st_size == 0:
+                return None
+            return str(cached)
+        except OSError:
+            pass
+
+        icon = load_icon_image(source, self.pe_cache, provider)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if icon is None:
+                cached.touch()
+                return None
+            if not compose_banner(icon, width, height).save(str(cached), "PNG"):
+                return None
+        except OSError as e:
+            print(f"⚠️ Error caching banner for {source}: {e}")
+            return None
+        return str(cached)
+
+
+class BannerService(QueueWorker):
+    """Coda di sorgenti (icon o path delle app) -> banners_ready([(sorgente, banner o None), ...]).
+    None vuol dire che la sorgente si mostra così com'è. I risultati restano in `results`,
+    aggiornato solo nel thread GUI: le tile lo consultano senza mai leggere file"""
+    banners_ready = pyqtSignal(list)
+    batch_size = BATCH_SIZE
+
+    def __init__(self, cache, width, height, results=None, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.width = width
+        self.height = height
+        self.results = results if results is not None else {}
+        self._pending = set()
+        # Collegato qui: lo slot gira nel thread GUI, prima di quelli di chi usa il servizio
+        self.banners_ready.connect(self._store)
+
+    def request(self, sources):
+        """Accoda le sorgenti (anche già risolte: il file può essere cambiato). Dal thread GUI"""
+        queued = []
+        for source in dict.fromkeys(sources):
+            if source and source not in self._pending:
+                self._pending.add(source)
+                queued.append(source)
+        super().request(queued)
+
+    def request_missing(self, sources):
+        """Accoda solo le sorgenti mai risolte"""
+        self.request([source for source in sources if source not in self.results])
+
+    def _store(self, results):
+        for source, banner in results:
+            self._pending.discard(source)
+            self.results[source] = banner
+
+    def process_batch(self, batch):
+        self.cache.prepare(batch)
+        self.banners_ready.emit([(source, self._resolve(source)) for source in batch])
+
+    def _resolve(self, source):
+        if not needs_banner(source):
+            return None
+        return self.cache.banner(source, self.width, self.height, self.icon_provider())
@@ -0,0 +1,153 @@
+"""
+Icon Service Module
+Extracts small list icons (exe icons or image files) in a worker thread, in
+batches, with one shared QFileIconProvider and a persistent on-disk cache.
+Results are QImage (safe outside the GUI thread); the GUI converts them.
+"""
+
+import os
+import queue
+import hashlib
+from pathlib import Path
+from PyQt6.QtCore import QThread, pyqtSignal, QFileInfo, Qt
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QFileIconProvider
+
+ICON_SIZE = 32
+BATCH_SIZE = 32
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.svg', '.xpm', '.ico')
+
+
+class QueueWorker(QThread):
+    """Worker con una coda di richieste, elaborate a gruppi di al massimo `batch_size`.
+    Le sottoclassi implementano process_batch; None in coda ferma il worker"""
+    batch_size = BATCH_SIZE
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.Queue()
+        self._provider = None
+
+    def request(self, items):
+        """Accoda le richieste e avvia il worker se serve. Chiamabile dal thread GUI"""
+        queued = False
+        for item in items:
+            self._queue.put(item)
+            queued = True
+        if queued and not self.isRunning():
+            self.start()
+
+    def icon_provider(self):
+        """Un solo QFileIconProvider per worker (crearne uno per file è costoso). Solo dal worker"""
+        if self._provider is None:
+            self._provider = QFileIconProvider()
+        return self._provider
+
+    def stop(self):
+        """Scarta le richieste in coda e ferma il worker"""
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        if self.isRunning():
+            self._queue.put(None)
+            self.wait()
+
+    def run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self.process_batch(batch)
+
+    def process_batch(self, batch):
+        raise NotImplementedError
+
+
+class IconService(QueueWorker):
+    """Coda di richieste (chiave, percorso) -> icons_ready([(chiave, QImage o None), ...]).
+    La cache su disco è indicizzata da (percorso, mtime, size): un file cambiato
+    produce una chiave nuova, senza bisogno di invalidare nulla"""
+    icons_ready = pyqtSignal(list)
+
+    def __init__(self, cache_dir, parent=None):
+        super().__init__(parent)
+        self.cache_dir = Path(cache_dir)
+        self._memory = {}  # nome in cache -> QImage, per i percorsi richiesti più volte
+
+    def run(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        super().run()
+
+    def process_batch(self, batch):
+        self.icons_ready.emit([(key, self.icon_image(path)) for key, path in batch])
+
+    def _cache_name(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        fingerprint = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+        return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+    def icon_image(self, path):
+        """QImage ICON_SIZExICON_SIZE per un file, dalla cache se possibile. None se non c'è icona"""
+        if not path:
+            return None
+        name = self._cache_name(path)
+        if name is None:
+            return None
+        if name in self._memory:
+            return self._memory[name]
+
+        cached = self.cache_dir / f"{name}.png"
+        image = None
+        try:
+            if cached.stat().st_size == 0:
+                # File vuoto: l'estrazione era già fallita, non riprovare
+                self._memory[name] = None
+                return None
+            image = QImage(str(cached))
+        except OSError:
+            pass
+
+        if image is None or image.isNull():
+            image = self._extract(path)
+            try:
+                if image is None:
+                    cached.touch()
+                else:
+                    image.save(str(cached), "PNG")
+            except OSError as e:
+                print(f"⚠️ Error caching icon for {path}: {e}")
+
+        self._memory[name] = image
+        return image
+
+    def _extract(self, path):
+        image = None
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            image = QImage(path)
+        if image is None or image.isNull():
+            icon = self.icon_provider().icon(QFileInfo(path))
+            if icon.isNull():
+                return None
+            image = icon.pixmap(ICON_SIZE, ICON_SIZE).toImage()
+        if image.isNull():
+            return None
+        if image.width() != ICON_SIZE or image.height() != ICON_SIZE:
+            image = image.scaled(ICON_SIZE, ICON_SIZE,
+                                 Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        return image
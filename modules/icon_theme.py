@@ -0,0 +1,221 @@
+"""
+Icon Theme Module
+Index of the freedesktop icon themes (icon name -> best image) used to resolve
+the Icon= key of .desktop files without probing the filesystem for every app.
+
+The index follows the theme inheritance chain from index.theme (user theme ->
+parents -> hicolor), then the remaining installed themes and /usr/share/pixmaps.
+It is saved in the cache dir together with the mtime of every directory and
+index.theme it was built from (and of the GTK/KDE settings that pick the user
+theme), and rebuilt only when one of them changes.
+"""
+
+import os
+import json
+import configparser
+
+INDEX_VERSION = 2
+ICON_EXTENSIONS = ('.png', '.svg', '.xpm')
+FALLBACK_THEME = 'hicolor'
+
+
+def icon_base_dirs(environ=None):
+    """Cartelle in cui cercare i temi, in ordine di precedenza (specifica XDG)"""
+    environ = os.environ if environ is None else environ
+    home = os.path.expanduser('~')
+    data_home = environ.get('XDG_DATA_HOME') or os.path.join(home, '.local', 'share')
+    data_dirs = (environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share').split(':')
+    dirs = [os.path.join(home, '.icons'), os.path.join(data_home, 'icons')]
+    dirs += [os.path.join(d, 'icons') for d in data_dirs if d]
+    # Icone delle app Flatpak
+    dirs += [os.path.join(data_home, 'flatpak', 'exports', 'share', 'icons'),
+             '/var/lib/flatpak/exports/share/icons']
+    return list(dict.fromkeys(dirs))
+
+
+# File che scelgono il tema dell'utente, in ordine di precedenza: (file, sezione, chiave)
+THEME_SETTINGS = (('gtk-3.0/settings.ini', 'Settings', 'gtk-icon-theme-name'),
+                  ('gtk-4.0/settings.ini', 'Settings', 'gtk-icon-theme-name'),
+                  ('kdeglobals', 'Icons', 'theme'))
+
+
+def theme_settings_files(environ=None):
+    """Percorsi dei file di THEME_SETTINGS (possono non esistere)"""
+    environ = os.environ if environ is None else environ
+    config_home = environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    return [os.path.join(config_home, file_name) for file_name, _, _ in THEME_SETTINGS]
+
+
+def user_icon_theme(environ=None):
+    """Tema di icone dell'utente: TVLAUNCHER_ICON_THEME, poi impostazioni GTK, poi KDE"""
+    environ = os.environ if environ is None else environ
+    if environ.get('TVLAUNCHER_ICON_THEME'):
+        return environ['TVLAUNCHER_ICON_THEME']
+    for path, (_, section, key) in zip(theme_settings_files(environ), THEME_SETTINGS):
+        parser = _read_ini(path)
+        if parser is not None and parser.has_option(section, key):
+            return parser.get(section, key).strip() or None
+    return None
+
+
+def _read_ini(path):
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            parser.read_file(f)
+    except (OSError, configparser.Error):
+        return None
+    return parser
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _icon_name(file_name):
+    base, ext = os.path.splitext(file_name)
+    return base if ext.lower() in ICON_EXTENSIONS else None
+
+
+class IconThemeIndex:
+    """Nome icona -> percorso dell'immagine migliore. Lookup in O(1)"""
+
+    def __init__(self, icons=None, stamps=None):
+        self.icons = icons if icons is not None else {}
+        self.stamps = stamps if stamps is not None else {}
+
+    def lookup(self, icon_name):
+        """Percorso per un nome di icona (accetta anche "nome.png"), None se non trovato"""
+        found = self.icons.get(icon_name)
+        if found is None:
+            base = _icon_name(icon_name)
+            if base:
+                found = self.icons.get(base)
+        return found
+
+    def is_current(self):
+        """True se nessuna cartella o index.theme usati per costruire l'indice è cambiato"""
+        return all(_mtime(path) == stamp for path, stamp in self.stamps.items())
+
+    @classmethod
+    def build(cls, base_dirs=None, theme=None):
+        base_dirs = icon_base_dirs() if base_dirs is None else base_dirs
+        index = cls()
+        for path in base_dirs:
+            index.stamps[path] = _mtime(path)
+        if theme is None:
+            # Cambiare tema nelle impostazioni di GTK/KDE cambia la catena: l'indice va rifatto
+            for path in theme_settings_files():
+                index.stamps[path] = _mtime(path)
+
+        installed = []
+        for base in base_dirs:
+            try:
+                with os.scandir(base) as entries:
+                    installed += [e.name for e in entries if e.is_dir()]
+            except OSError:
+                continue
+
+        # Catena del tema + tutti gli altri temi installati come ultima risorsa
+        order = index._theme_chain(base_dirs, theme or user_icon_theme())
+        order += sorted(t for t in dict.fromkeys(installed) if t not in order)
+        for theme_name in order:
+            # Un tema precedente nella catena vince sempre su quelli successivi
+            for name, (_, path) in index._index_theme(base_dirs, theme_name).items():
+                index.icons.setdefault(name, path)
+
+        for pixmaps in ('/usr/share/pixmaps', '/usr/local/share/pixmaps'):
+            index.stamps[pixmaps] = _mtime(pixmaps)
+            for name, path in index._list_icons(pixmaps).items():
+                index.icons.setdefault(name, path)
+        return index
+
+    def _theme_index(self, base_dirs, theme_name):
+        """index.theme del tema (il primo trovato nelle cartelle base)"""
+        for base in base_dirs:
+            path = os.path.join(base, theme_name, 'index.theme')
+            stamp = _mtime(path)
+            if stamp is not None:
+                self.stamps[path] = stamp
+                return _read_ini(path)
+        return None
+
+    def _theme_chain(self, base_dirs, theme):
+        """Tema utente seguito dai temi da cui eredita (Inherits=), hicolor per ultimo"""
+        chain = []
+        pending = [theme] if theme else []
+        while pending:
+            name = pending.pop(0)
+            if name in chain or name == FALLBACK_THEME:
+                continue
+            chain.append(name)
+            parser = self._theme_index(base_dirs, name)
+            if parser is not None and parser.has_option('Icon Theme', 'inherits'):
+                pending += [t.strip() for t in parser.get('Icon Theme', 'inherits').split(',') if t.strip()]
+        chain.append(FALLBACK_THEME)
+        return chain
+
+    def _list_icons(self, directory):
+        icons = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = _icon_name(entry.name)
+                    if name and name not in icons:
+                        icons[name] = entry.path
+        except OSError:
+            pass
+        return icons
+
+    def _index_theme(self, base_dirs, theme_name):
+        """nome -> (punteggio, percorso) per un tema. Scalable vince, poi la dimensione maggiore"""
+        parser = self._theme_index(base_dirs, theme_name)
+        if parser is None or not parser.has_section('Icon Theme'):
+            return {}
+        subdirs = parser.get('Icon Theme', 'directories', fallback='').split(',')
+        subdirs += parser.get('Icon Theme', 'scaleddirectories', fallback='').split(',')
+
+        best = {}
+        for subdir in dict.fromkeys(d.strip() for d in subdirs if d.strip()):
+            try:
+                size = int(parser.get(subdir, 'size', fallback='0'))
+                scale = int(parser.get(subdir, 'scale', fallback='1'))
+            except ValueError:
+                continue
+            scalable = parser.get(subdir, 'type', fallback='Threshold').strip().lower() == 'scalable'
+            score = (scalable, size * scale)
+            for base in base_dirs:
+                directory = os.path.join(base, theme_name, subdir)
+                stamp = _mtime(directory)
+                if stamp is None:
+                    continue
+                self.stamps[directory] = stamp
+                for name, path in self._list_icons(directory).items():
+                    if name not in best or score > best[name][0]:
+                        best[name] = (score, path)
+        return best
+
+    @classmethod
+    def load(cls, cache_file):
+        """Indice dalla cache se ancora valido, altrimenti ricostruito e salvato"""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                index = cls(data['icons'], data['stamps'])
+                if index.is_current():
+                    return index
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        index = cls.build()
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'icons': index.icons, 'stamps': index.stamps}, f)
+        except OSError as e:
+            print(f"⚠️ Error saving icon index: {e}")
+        print(f"🎨 Icon index rebuilt: {len(index.icons)} icons")
+        return index
@@ -3,6 +3,7 @@ from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QPoint
 from PyQt6.QtGui import QPixmap, QIcon, QScreen, QColor
 from PyQt6.QtWidgets import QApplication
 from pathlib import Path
+from modules.paths import get_paths
 
 
 class JoystickNotification(QWidget):
@@ -176,7 +177,7 @@ class JoystickNotification(QWidget):
         """Restituisce il percorso dell'icona appropriata"""
         # Cerca nelle icone di sistema o custom
         base_paths = [
-            "assets/icons/",
+            get_paths().resource("assets", "icons"),
             "/usr/share/icons/",
             ""
         ]
@@ -0,0 +1,145 @@
+"""
+Lazy Import Module
+Heavy or rarely used modules (program scanner and its dialog, quick search,
+requests, psutil, pygame) are imported on first use instead of at startup.
+Every import made through this module is timed, and the launcher's own
+module-level imports are measured as one block; with --import-report (or
+TVLAUNCHER_IMPORT_REPORT=1) the launcher prints what it loaded eagerly and
+through this module before the first window, what it loaded later and what
+it never needed.
+"""
+
+import os
+import sys
+import time
+import importlib
+import importlib.util
+
+_START = time.perf_counter()
+_BASELINE = frozenset(sys.modules)  # già caricati prima del launcher (interprete, site)
+_timings = []        # (modulo, secondi, caricato dopo l'avvio)
+_lazy_modules = []
+_startup_done = None  # secondi dall'avvio alla prima finestra
+_imports_done = None  # secondi spesi negli import a livello di modulo del launcher
+_eager_modules = ()   # moduli caricati prima della prima finestra senza passare da qui
+
+
+def report_enabled():
+    return os.environ.get('TVLAUNCHER_IMPORT_REPORT', '') not in ('', '0')
+
+
+def is_available(name):
+    """True se il modulo è installato, senza importarlo"""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_loaded(name):
+    """True se il modulo è già stato importato (da qui o altrove). Non lo importa mai:
+    per le chiusure (es. pygame.quit()) che non hanno senso se il modulo non è mai servito"""
+    return name in sys.modules
+
+
+def timed_import(name):
+    """Importa un modulo registrando quanto ci è voluto (solo la prima volta)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    deferred = _startup_done is not None
+    _timings.append((name, elapsed, deferred))
+    if deferred and report_enabled():
+        print(f"⏱️ Deferred import {name}: {elapsed * 1000:.0f} ms")
+    return module
+
+
+class LazyModule:
+    """Segnaposto di un modulo: lo importa al primo accesso a un suo attributo.
+    ImportError arriva a quel punto, quindi chi lo usa deve controllare is_available prima"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        _lazy_modules.append(self)
+
+    @property
+    def loaded(self):
+        return self._module is not None or self._name in sys.modules
+
+    def load(self):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        # Chiamato solo per gli attributi che il segnaposto non ha: quelli del modulo
+        if attr in ('_name', '_module'):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy(name):
+    return LazyModule(name)
+
+
+def mark_imports_done():
+    """Da chiamare dopo gli import a livello di modulo del launcher: misura il blocco"""
+    global _imports_done
+    if _imports_done is None:
+        _imports_done = time.perf_counter() - _START
+
+
+def mark_startup_done():
+    """Da chiamare quando la prima finestra è visibile: gli import successivi contano come differiti"""
+    global _startup_done, _eager_modules
+    if _startup_done is None:
+        _startup_done = time.perf_counter() - _START
+        timed = {name for name, _elapsed, _deferred in _timings}
+        _eager_modules = sorted(name for name in set(sys.modules) - _BASELINE
+                                if name not in timed and not name.startswith('_'))
+
+
+def _eager_summary():
+    """Moduli del progetto uno per uno, gli altri raggruppati per pacchetto"""
+    own = [name for name in _eager_modules if name.startswith('modules.')]
+    packages = {}
+    for name in _eager_modules:
+        if name != 'modules' and not name.startswith('modules.'):
+            top = name.split('.')[0]
+            packages[top] = packages.get(top, 0) + 1
+    lines = []
+    if own:
+        lines.append("  modules: " + ", ".join(name[len('modules.'):] for name in own))
+    if packages:
+        lines.append("  packages: " + ", ".join(
+            f"{top} ({count})" if count > 1 else top for top, count in sorted(packages.items())))
+    return lines
+
+
+def import_report():
+    """Testo del resoconto: import all'avvio, import differiti e moduli mai caricati"""
+    lines = []
+    if _startup_done is not None:
+        lines.append(f"⏱️ First window after {_startup_done * 1000:.0f} ms")
+    if _imports_done is not None:
+        lines.append(f"Eager imports: {_imports_done * 1000:.1f} ms at module level")
+        lines += _eager_summary()
+    for title, deferred in (("Startup imports", False), ("Deferred imports", True)):
+        timings = sorted((t for t in _timings if t[2] == deferred), key=lambda t: -t[1])
+        if timings:
+            lines.append(f"{title}:")
+            lines += [f"  {elapsed * 1000:7.1f} ms  {name}" for name, elapsed, _ in timings]
+    unused = [module._name for module in _lazy_modules if not module.loaded]
+    if unused:
+        lines.append("Not loaded: " + ", ".join(unused))
+    return "\n".join(lines)
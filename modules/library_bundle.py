@@ -0,0 +1,180 @@
+"""
+Library Bundle Module
+Exports the app library and the cover art it references into a single archive,
+and imports such an archive on another launcher box.
+
+Bundle layout (zip):
+    library.json              config with cover paths rewritten to blob names
+    blobs/<sha256><ext>       each referenced image stored once, by content hash
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import zipfile
+from pathlib import Path
+
+from modules.app_record import (
+    AppRecord, ConfigError, CONFIG_VERSION, load_config_file, save_config_file, validate_config, migrate_config
+)
+from modules.paths import asset_folder, sanitize_filename
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = "library.json"
+BLOB_DIR = "blobs"
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+
+_BLOB_NAME = re.compile(r'^blobs/[0-9a-f]{64}\.[a-z0-9]{1,5}$')
+_CHUNK_SIZE = 1024 * 1024
+
+
+class BundleError(Exception):
+    """Archivio non valido o non leggibile"""
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def export_library(paths, bundle_path):
+    """Scrive la libreria corrente (config + copertine usate) in bundle_path.
+    Restituisce (numero app, numero blob unici)"""
+    config = load_config_file(paths.config_file, paths)
+
+    blobs = {}          # percorso locale -> nome blob
+    written = set()     # nomi blob già nell'archivio
+    apps = []
+
+    def add_blob(zf, file_path):
+        if not file_path or not file_path.lower().endswith(IMAGE_EXTENSIONS):
+            return None
+        if not os.path.isfile(file_path):
+            return None
+        real = os.path.realpath(file_path)
+        if real not in blobs:
+            ext = Path(real).suffix.lower()
+            blobs[real] = f"{BLOB_DIR}/{_file_digest(real)}{ext}"
+        name = blobs[real]
+        if name not in written:
+            # Le immagini sono già compresse: ZIP_STORED evita lavoro inutile
+            zf.write(real, name, compress_type=zipfile.ZIP_STORED)
+            written.add(name)
+        return name
+
+    with zipfile.ZipFile(bundle_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for app in config['apps']:
+            entry = app.to_dict()
+            blob = add_blob(zf, app.icon)
+            if blob:
+                entry['icon'] = blob
+            apps.append(entry)
+
+        manifest = {
+            'format': BUNDLE_FORMAT,
+            'library': {
+                'version': config['version'],
+                'apps': apps,
+                'background': add_blob(zf, config['background']) or '',
+            }
+        }
+        zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False))
+
+    print(f"📦 Exported {len(apps)} apps with {len(written)} unique images to {bundle_path}")
+    return len(apps), len(written)
+
+
+def _read_manifest(zf):
+    try:
+        manifest = json.loads(zf.read(MANIFEST_NAME).decode('utf-8'))
+    except KeyError:
+        raise BundleError(f"{MANIFEST_NAME} missing from bundle")
+    except ValueError as e:
+        raise BundleError(f"invalid {MANIFEST_NAME}: {e}")
+    if not isinstance(manifest, dict) or manifest.get('format') != BUNDLE_FORMAT:
+        raise BundleError(f"unsupported bundle format: {manifest.get('format') if isinstance(manifest, dict) else manifest!r}")
+    try:
+        return validate_config(migrate_config(manifest['library']))
+    except (KeyError, ConfigError) as e:
+        raise BundleError(f"invalid library in bundle: {e}")
+
+
+def _extract_blob(zf, blob_name, target):
+    """Estrae un blob in streaming (senza caricarlo tutto in memoria)"""
+    if not _BLOB_NAME.match(blob_name):
+        raise BundleError(f"invalid blob name: {blob_name!r}")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + '.part')
+    with zf.open(blob_name) as src, open(tmp, 'wb') as dst:
+        shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+    os.replace(tmp, target)
+
+
+def _unique_folder(name, used, assets_dir):
+    """Cartella delle copertine per un'app: il nome ripulito, con " (2)", " (3)"... se un'altra
+    app ha già una cartella con lo stesso nome (il confronto ignora le maiuscole, come Windows)
+    o se la cartella esiste già su disco (es. rimasta da un'app rimossa: non va sovrascritta)"""
+    base = sanitize_filename(name)
+    folder, n = base, 1
+    while folder.casefold() in used or (assets_dir / folder).exists():
+        n += 1
+        folder = f"{base} ({n})"
+    used.add(folder.casefold())
+    return folder
+
+
+def import_library(paths, bundle_path, replace=False):
+    """Importa un bundle nella data dir. Di default unisce (le app con lo stesso nome
+    vengono saltate); con replace=True sostituisce l'intera libreria.
+    Restituisce il numero di app importate"""
+    try:
+        zf = zipfile.ZipFile(bundle_path)
+    except (OSError, zipfile.BadZipFile) as e:
+        raise BundleError(f"cannot open {bundle_path}: {e}")
+
+    with zf:
+        library = _read_manifest(zf)
+
+        current = load_config_file(paths.config_file, paths)
+        if current['version'] > CONFIG_VERSION:
+            raise BundleError(f"{paths.config_file} was written by a newer launcher, not importing into it")
+        apps = [] if replace else current['apps']
+        existing = {app.key for app in apps}
+        folders = {asset_folder(paths.assets_dir, app.name, app.icon).casefold() for app in apps}
+
+        extracted = {}  # blob -> primo file estratto (dal bundle si legge una volta sola)
+        imported = 0
+        for app in library['apps']:
+            if app.key in existing:
+                continue
+            existing.add(app.key)
+
+            if app.icon.startswith(BLOB_DIR + '/'):
+                # Ogni app ha la sua copia nella sua cartella: cambiare o cancellare la copertina
+                # di un'app non tocca le altre che nel bundle condividevano la stessa immagine
+                target = paths.assets_dir / _unique_folder(app.name, folders, paths.assets_dir) / f"banner{Path(app.icon).suffix}"
+                if app.icon in extracted:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(extracted[app.icon], target)
+                else:
+                    _extract_blob(zf, app.icon, target)
+                    extracted[app.icon] = target
+                app = AppRecord(app.name, app.path, str(target))
+            apps.append(app)
+            imported += 1
+
+        background = current['background']
+        if library['background'].startswith(BLOB_DIR + '/') and (replace or not background):
+            target = paths.assets_dir / f"background{Path(library['background']).suffix}"
+            _extract_blob(zf, library['background'], target)
+            background = str(target)
+
+    save_config_file(paths.config_file, apps, background, current['steamgriddb_api_key'], paths,
+                     invalid_apps=[] if replace else current['invalid_apps'])
+    print(f"📦 Imported {imported} apps ({len(extracted)} images) from {bundle_path}")
+    return imported
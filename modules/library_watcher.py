@@ -0,0 +1,115 @@
+"""
+Library Watcher Module
+Watches launcher_apps.json and the assets folder so that edits made by other
+tools are applied live, without restarting the launcher
+"""
+
+import os
+from pathlib import Path
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+class LibraryWatcher(QObject):
+    """Osserva config e assets, raggruppa gli eventi ed emette solo cosa è cambiato"""
+    config_changed = pyqtSignal()
+    assets_changed = pyqtSignal(list)  # Nomi delle cartelle assets/<app> modificate
+
+    def __init__(self, config_file, assets_dir, parent=None, debounce_ms=300):
+        super().__init__(parent)
+        self.config_file = Path(config_file).absolute()
+        self.assets_dir = Path(assets_dir).absolute()
+
+        self._last_config_stat = self._stat(self.config_file)
+        self._pending_config = False
+        self._pending_folders = set()
+        self._known_folders = self._list_folders()
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_path_changed)
+        self.watcher.directoryChanged.connect(self._on_path_changed)
+
+        # Gli editor salvano spesso con più scritture: raggruppa gli eventi
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self._flush)
+
+        self._rewatch()
+
+    def note_own_write(self):
+        """Da chiamare dopo save_config: la prossima notifica per questa scrittura viene ignorata"""
+        self._last_config_stat = self._stat(self.config_file)
+        self._rewatch()
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _list_folders(self):
+        if not self.assets_dir.is_dir():
+            return set()
+        return {f.name for f in self.assets_dir.iterdir() if f.is_dir() and f.name != 'icons'}
+
+    def _wanted_paths(self):
+        """Config, la sua cartella, assets/, ogni assets/<app>/ e ogni immagine al loro interno"""
+        wanted = [str(self.config_file.parent)]
+        if self.config_file.exists():
+            wanted.append(str(self.config_file))
+        if self.assets_dir.is_dir():
+            wanted.append(str(self.assets_dir))
+            try:
+                with os.scandir(self.assets_dir) as folders:
+                    for folder in folders:
+                        if not folder.is_dir() or folder.name == 'icons':
+                            continue
+                        wanted.append(folder.path)
+                        with os.scandir(folder.path) as files:
+                            for f in files:
+                                if f.name.lower().endswith(IMAGE_EXTENSIONS):
+                                    wanted.append(f.path)
+            except OSError as e:
+                print(f"⚠️ Error listing assets for watcher: {e}")
+        return wanted
+
+    def _rewatch(self):
+        """Ri-aggiunge i percorsi persi (i salvataggi atomici sostituiscono il file)"""
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        missing = [p for p in self._wanted_paths() if p not in watched]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def _on_path_changed(self, path):
+        path = Path(path)
+        if path == self.config_file or path == self.config_file.parent:
+            # La cartella cambia anche per altri file: conta solo se il config è diverso
+            if self._stat(self.config_file) != self._last_config_stat:
+                self._pending_config = True
+        elif path == self.assets_dir:
+            # Cartelle aggiunte o rimosse rispetto all'ultimo controllo
+            folders = self._list_folders()
+            self._pending_folders |= folders ^ self._known_folders
+            self._known_folders = folders
+        else:
+            try:
+                relative = path.relative_to(self.assets_dir)
+            except ValueError:
+                return
+            if relative.parts and relative.parts[0] != 'icons':
+                self._pending_folders.add(relative.parts[0])
+        self.debounce_timer.start()
+
+    def _flush(self):
+        self._rewatch()
+        if self._pending_config:
+            self._pending_config = False
+            self._last_config_stat = self._stat(self.config_file)
+            self.config_changed.emit()
+        if self._pending_folders:
+            folders = sorted(self._pending_folders)
+            self._pending_folders.clear()
+            self.assets_changed.emit(folders)
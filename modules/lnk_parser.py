@@ -0,0 +1,233 @@
+"""
+LNK Parser Module
+Reads Windows shortcut (.lnk) files directly (MS-SHLLINK binary format) so
+shortcut scanning does not need a COM call per file. ShortcutResolver falls
+back to WScript.Shell only for shortcuts the parser cannot resolve
+(e.g. MSI "advertised" shortcuts).
+"""
+
+import os
+import struct
+import threading
+
+LNK_HEADER_SIZE = 0x4C
+LNK_CLSID = bytes.fromhex('0114020000000000c000000000000046')
+
+# LinkFlags
+HAS_TARGET_ID_LIST = 0x0001
+HAS_LINK_INFO = 0x0002
+HAS_NAME = 0x0004
+HAS_RELATIVE_PATH = 0x0008
+HAS_WORKING_DIR = 0x0010
+HAS_ARGUMENTS = 0x0020
+HAS_ICON_LOCATION = 0x0040
+IS_UNICODE = 0x0080
+HAS_DARWIN_ID = 0x1000
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+COMMON_NETWORK_RELATIVE_LINK = 0x2
+
+# Firme dei blocchi ExtraData
+ENVIRONMENT_BLOCK = 0xA0000001
+ICON_ENVIRONMENT_BLOCK = 0xA0000007
+
+_HEADER = struct.Struct('<I16sII8s8s8sIiIHHII')
+_MAX_LNK_SIZE = 1024 * 1024
+_ANSI = 'mbcs' if os.name == 'nt' else 'cp1252'
+
+
+class LnkError(ValueError):
+    """File .lnk non valido o troncato"""
+
+
+def _ansi_z(data, offset):
+    end = data.find(b'\0', offset)
+    if end == -1:
+        raise LnkError("unterminated string")
+    return data[offset:end].decode(_ANSI, errors='replace')
+
+
+def _unicode_z(data, offset):
+    end = offset
+    while end + 1 < len(data) and data[end:end + 2] != b'\0\0':
+        end += 2
+    return data[offset:end].decode('utf-16-le', errors='replace')
+
+
+def _block_string(data, offset):
+    """Stringa di un blocco ambiente: 260 byte ANSI + 520 byte Unicode (preferita)"""
+    ansi = data[offset:offset + 260].split(b'\0', 1)[0].decode(_ANSI, errors='replace')
+    unicode = _unicode_z(data[offset + 260:offset + 780], 0)
+    return unicode or ansi
+
+
+def _parse_link_info(data, start):
+    """Percorso di destinazione dalla struttura LinkInfo. Restituisce (percorso, fine struttura)"""
+    try:
+        size, header_size, flags, _, base_off, net_off, suffix_off = struct.unpack_from('<7I', data, start)
+        base_u_off = suffix_u_off = 0
+        if header_size >= 0x24:
+            base_u_off, suffix_u_off = struct.unpack_from('<2I', data, start + 28)
+    except struct.error:
+        raise LnkError("truncated LinkInfo")
+
+    suffix = ''
+    if suffix_u_off:
+        suffix = _unicode_z(data, start + suffix_u_off)
+    elif suffix_off:
+        suffix = _ansi_z(data, start + suffix_off)
+
+    path = None
+    if flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        base = _unicode_z(data, start + base_u_off) if base_u_off else _ansi_z(data, start + base_off)
+        path = base + suffix
+    elif flags & COMMON_NETWORK_RELATIVE_LINK:
+        try:
+            net_name_off = struct.unpack_from('<I', data, start + net_off + 8)[0]
+        except struct.error:
+            raise LnkError("truncated network link")
+        share = _ansi_z(data, start + net_off + net_name_off)
+        path = share + ('\\' + suffix if suffix else '')
+    return path or None, start + size
+
+
+def parse_lnk(data):
+    """Interpreta il contenuto di un .lnk.
+    Restituisce {'target', 'arguments', 'working_dir', 'relative_path', 'icon', 'icon_index', 'advertised'}
+    (target None se il file non contiene un percorso leggibile)"""
+    if len(data) < LNK_HEADER_SIZE:
+        raise LnkError("file too short")
+    header = _HEADER.unpack_from(data, 0)
+    if header[0] != LNK_HEADER_SIZE or header[1] != LNK_CLSID:
+        raise LnkError("not a shell link")
+    flags, icon_index = header[2], header[8]
+    offset = LNK_HEADER_SIZE
+
+    if flags & HAS_TARGET_ID_LIST:
+        # L'ID list (percorso come shell item) non serve se c'è LinkInfo: si salta
+        try:
+            offset += 2 + struct.unpack_from('<H', data, offset)[0]
+        except struct.error:
+            raise LnkError("truncated IDList")
+
+    target = None
+    if flags & HAS_LINK_INFO:
+        target, offset = _parse_link_info(data, offset)
+
+    strings = {}
+    for flag, name in ((HAS_NAME, 'name'), (HAS_RELATIVE_PATH, 'relative_path'),
+                       (HAS_WORKING_DIR, 'working_dir'), (HAS_ARGUMENTS, 'arguments'),
+                       (HAS_ICON_LOCATION, 'icon')):
+        if not flags & flag:
+            continue
+        try:
+            count = struct.unpack_from('<H', data, offset)[0]
+        except struct.error:
+            raise LnkError("truncated StringData")
+        offset += 2
+        if flags & IS_UNICODE:
+            strings[name] = data[offset:offset + count * 2].decode('utf-16-le', errors='replace')
+            offset += count * 2
+        else:
+            strings[name] = data[offset:offset + count].decode(_ANSI, errors='replace')
+            offset += count
+
+    env_target = env_icon = None
+    while offset + 8 <= len(data):
+        block_size, signature = struct.unpack_from('<II', data, offset)
+        if block_size < 8:
+            break
+        if signature == ENVIRONMENT_BLOCK and block_size >= 0x314:
+            env_target = _block_string(data, offset + 8)
+        elif signature == ICON_ENVIRONMENT_BLOCK and block_size >= 0x314:
+            env_icon = _block_string(data, offset + 8)
+        offset += block_size
+
+    return {
+        # Percorso con variabili d'ambiente (es. %ProgramFiles%) prima di quello assoluto salvato
+        'target': os.path.expandvars(env_target) if env_target else target,
+        'arguments': strings.get('arguments', ''),
+        'working_dir': strings.get('working_dir', ''),
+        'relative_path': strings.get('relative_path', ''),
+        'icon': os.path.expandvars(env_icon or strings.get('icon', '')),
+        'icon_index': icon_index,
+        'advertised': bool(flags & HAS_DARWIN_ID),
+    }
+
+
+def read_lnk(path):
+    """parse_lnk su un file. Il percorso relativo viene risolto rispetto alla cartella del .lnk"""
+    with open(path, 'rb') as f:
+        data = f.read(_MAX_LNK_SIZE)
+    info = parse_lnk(data)
+    if not info['target'] and info['relative_path']:
+        info['target'] = os.path.normpath(os.path.join(os.path.dirname(path), info['relative_path']))
+    return info
+
+
+class ShortcutResolver:
+    """Risolve i .lnk col parser; usa COM (WScript.Shell, uno per thread) solo quando serve.
+    Thread-safe: pensato per i thread del pool di scansione. Il riuso tra una scansione
+    e l'altra (per mtime/size del file) lo fanno le impronte del walker"""
+
+    def __init__(self, use_com=True):
+        self.use_com = use_com
+        self._com = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {'parsed': 0, 'com': 0, 'failed': 0}
+
+    def _count(self, what):
+        with self._lock:
+            self.stats[what] += 1
+
+    def _get_shell(self):
+        """WScript.Shell per il thread corrente (COM va inizializzato in ogni thread)"""
+        shell = getattr(self._com, 'shell', None)
+        if shell is None:
+            import pythoncom
+            import win32com.client
+            pythoncom.CoInitialize()
+            shell = win32com.client.Dispatch("WScript.Shell")
+            self._com.shell = shell
+        return shell
+
+    def _resolve_com(self, path):
+        shortcut = self._get_shell().CreateShortCut(path)
+        icon, _, index = (shortcut.IconLocation or '').rpartition(',')
+        return {
+            'target': shortcut.Targetpath or None,
+            'arguments': shortcut.Arguments or '',
+            'working_dir': shortcut.WorkingDirectory or '',
+            'relative_path': '',
+            'icon': icon,
+            'icon_index': int(index) if index.strip().lstrip('-').isdigit() else 0,
+            'advertised': False,
+        }
+
+    def resolve(self, path):
+        """Informazioni del collegamento o None se non risolvibile (l'errore viene stampato)"""
+        error = None
+        try:
+            info = read_lnk(path)
+            if info['target'] and not info['advertised']:
+                self._count('parsed')
+                return info
+        except (OSError, LnkError) as e:
+            error = e
+
+        if self.use_com and os.name == 'nt':
+            try:
+                info = self._resolve_com(path)
+                if info['target']:
+                    self._count('com')
+                    return info
+            except ImportError:
+                self.use_com = False
+            except Exception as e:
+                error = e
+
+        self._count('failed')
+        if error is not None:
+            print(f"⚠️ Cannot resolve shortcut {path}: {error}")
+        return None
@@ -0,0 +1,191 @@
+"""
+Paths Module
+Resolves where the launcher keeps its config, cover art and caches.
+
+Priority (first match wins):
+  1. --data-dir / --cache-dir on the command line
+  2. TVLAUNCHER_DATA_DIR / TVLAUNCHER_CACHE_DIR environment variables
+  3. Portable mode (--portable, a 'portable.txt' next to the launcher,
+     a frozen build, or an existing launcher_apps.json next to the launcher)
+  4. Per-user directories (XDG on Linux, %APPDATA% / %LOCALAPPDATA% on Windows)
+"""
+
+import os
+import sys
+import platform
+from pathlib import Path
+
+APP_DIR_NAME = "TVLauncher"
+CONFIG_FILENAME = "launcher_apps.json"
+PORTABLE_MARKER = "portable.txt"
+
+IS_WINDOWS = platform.system() == "Windows"
+
+
+def launcher_base_dir():
+    """Cartella del launcher (risorse incluse come assets/icons)"""
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).resolve().parent
+    return Path(__file__).resolve().parent.parent
+
+
+class LauncherPaths:
+    """Percorsi risolti del launcher. Config e assets in data_dir, cache separata in cache_dir"""
+
+    def __init__(self, base_dir, data_dir, cache_dir, mode):
+        self.base_dir = Path(base_dir)
+        self.data_dir = Path(data_dir)
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode  # "custom", "portable" o "user"
+
+    @property
+    def config_file(self):
+        return self.data_dir / CONFIG_FILENAME
+
+    @property
+    def assets_dir(self):
+        return self.data_dir / "assets"
+
+    @property
+    def rom_folders_file(self):
+        return self.data_dir / "rom_folders.json"
+
+    def scanner_cache(self, suffix):
+        return self.cache_dir / f"scanner_cache_{suffix}.json"
+
+    def scanner_state(self, suffix):
+        """Impronte di cartelle/registro dell'ultima scansione (rescan incrementale)"""
+        return self.cache_dir / f"scanner_state_{suffix}.json"
+
+    @property
+    def icon_cache_dir(self):
+        return self.cache_dir / "icons"
+
+    @property
+    def icon_index_file(self):
+        return self.cache_dir / "icon_index.json"
+
+    @property
+    def pe_metadata_file(self):
+        """Version-info e icona degli exe (indice per percorso + mtime)"""
+        return self.cache_dir / "pe_metadata.json"
+
+    @property
+    def pe_icon_dir(self):
+        return self.cache_dir / "pe_icons"
+
+    @property
+    def banner_cache_dir(self):
+        """Banner generati dalle icone per le app senza copertina"""
+        return self.cache_dir / "banners"
+
+    def resource(self, *parts):
+        """Risorsa inclusa nel launcher (es. resource('assets', 'icons', 'key.png')) come stringa"""
+        return str(self.base_dir.joinpath(*parts))
+
+    def ensure_dirs(self):
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def to_stored(self, path):
+        """Percorso da salvare nel config: relativo a data_dir se ci sta dentro (libreria spostabile)"""
+        if not path:
+            return path
+        try:
+            return Path(path).resolve().relative_to(self.data_dir.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def from_stored(self, path):
+        """Inverso di to_stored: i percorsi relativi sono relativi a data_dir"""
+        if not path or os.path.isabs(path):
+            return path
+        return str(self.data_dir / path)
+
+    def __repr__(self):
+        return f"LauncherPaths(mode={self.mode!r}, data_dir='{self.data_dir}', cache_dir='{self.cache_dir}')"
+
+
+def _user_dirs(environ):
+    if IS_WINDOWS:
+        home = Path.home()
+        data = Path(environ.get('APPDATA') or home / 'AppData' / 'Roaming') / APP_DIR_NAME
+        cache = Path(environ.get('LOCALAPPDATA') or home / 'AppData' / 'Local') / APP_DIR_NAME / 'Cache'
+    else:
+        home = Path.home()
+        data = Path(environ.get('XDG_DATA_HOME') or home / '.local' / 'share') / APP_DIR_NAME.lower()
+        cache = Path(environ.get('XDG_CACHE_HOME') or home / '.cache') / APP_DIR_NAME.lower()
+    return data, cache
+
+
+def is_portable_install(base_dir):
+    return (
+        getattr(sys, 'frozen', False)
+        or (base_dir / PORTABLE_MARKER).exists()
+        or (base_dir / CONFIG_FILENAME).exists()
+    )
+
+
+def resolve_paths(data_dir=None, cache_dir=None, portable=False, environ=None, base_dir=None):
+    """Risolve i percorsi secondo le priorità descritte in testa al modulo"""
+    environ = os.environ if environ is None else environ
+    base_dir = Path(base_dir) if base_dir else launcher_base_dir()
+
+    data_dir = data_dir or environ.get('TVLAUNCHER_DATA_DIR')
+    cache_dir = cache_dir or environ.get('TVLAUNCHER_CACHE_DIR')
+
+    if data_dir:
+        mode = "custom"
+        data_dir = Path(data_dir).expanduser().resolve()
+        cache_dir = Path(cache_dir).expanduser().resolve() if cache_dir else data_dir / 'cache'
+    elif portable or is_portable_install(base_dir):
+        mode = "portable"
+        data_dir = base_dir
+        cache_dir = Path(cache_dir).expanduser().resolve() if cache_dir else base_dir / 'cache'
+    else:
+        mode = "user"
+        data_dir, default_cache = _user_dirs(environ)
+        cache_dir = Path(cache_dir).expanduser().resolve() if cache_dir else default_cache
+
+    return LauncherPaths(base_dir, data_dir, cache_dir, mode)
+
+
+def sanitize_filename(name):
+    """Nome cartella in assets/ per un'app (rimuove caratteri non validi per nomi file)"""
+    safe = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_'))
+    return safe.strip().replace(' ', '_')
+
+
+def asset_folder(assets_dir, name, icon=''):
+    """Cartella in assets/ di un'app: quella della sua copertina se sta in assets/<cartella>/
+    (l'import di un bundle può aver scelto "Foo (2)"), altrimenti il nome ripulito"""
+    if icon:
+        parent = os.path.dirname(os.path.abspath(icon))
+        if os.path.normcase(os.path.dirname(parent)) == os.path.normcase(os.path.abspath(assets_dir)):
+            return os.path.basename(parent)
+    return sanitize_filename(name)
+
+
+_current = None
+
+
+def configure_paths(data_dir=None, cache_dir=None, portable=False):
+    """Da chiamare una volta all'avvio (main) con le opzioni della riga di comando"""
+    global _current
+    _current = resolve_paths(data_dir, cache_dir, portable)
+    _current.ensure_dirs()
+    return _current
+
+
+def get_paths():
+    """Percorsi correnti; se configure_paths non è stato chiamato usa i default"""
+    if _current is None:
+        configure_paths()
+    return _current
+
+
+def add_path_arguments(parser):
+    """Aggiunge --data-dir, --cache-dir e --portable a un ArgumentParser"""
+    parser.add_argument('--data-dir', help="Folder for launcher_apps.json and assets/")
+    parser.add_argument('--cache-dir', help="Folder for scanner caches (can be on fast or temporary storage)")
+    parser.add_argument('--portable', action='store_true', help="Keep everything next to the launcher")
@@ -0,0 +1,189 @@
+"""
+PE Cache Module
+Version-info and largest icon of the scanned executables, read once in a
+process pool and cached by path + mtime/size. The icon is saved next to the
+index (PNG or single-image ICO), so tiles and cover lookups reuse it instead
+of opening the exe again.
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from itertools import repeat
+from pathlib import Path
+from modules.dedupe import name_tokens
+from modules.app_record import normalize_name
+from modules.pe_metadata import PeError, read_pe_info
+
+# Formato dell'indice: {"version", "entries": {percorso: [mtime_ns, size, metadati o null]}}
+INDEX_VERSION = 1
+
+# Sotto questo numero di exe da leggere si resta nel processo corrente (avviare il pool costa di più)
+POOL_THRESHOLD = 8
+MAX_WORKERS = 4
+
+# Prodotti di runtime e motori: il nome non dice niente sul programma
+_GENERIC_PRODUCTS = frozenset(name_tokens(name) for name in (
+    'Unity', 'Electron', 'NW.js', 'Node.js', 'Java Platform SE', 'Python', 'Godot Engine',
+    'Unreal Engine', 'Microsoft Windows Operating System', 'Bootstrapper', 'Installer',
+))
+_SYMBOLS = re.compile(r'[™®©]')
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def extract_metadata(path, icon_dir):
+    """Legge un exe e salva la sua icona più grande in `icon_dir`. Eseguita nei processi del pool.
+    Restituisce (percorso assoluto, [mtime_ns, size] o None se il file manca, metadati o None se non è un PE)"""
+    path = os.path.abspath(path)
+    try:
+        stamp = _stamp(path)
+    except OSError:
+        return path, None, None
+    try:
+        info = read_pe_info(path, icon=True)
+    except (OSError, PeError):
+        # Si ricorda comunque, per non rileggerlo finché il file non cambia
+        return path, stamp, None
+
+    icon = info.pop('icon')
+    info['icon'] = ''
+    if icon:
+        data, ext = icon
+        name = hashlib.sha1(f"{path}|{stamp[0]}|{stamp[1]}".encode('utf-8')).hexdigest() + ext
+        try:
+            os.makedirs(icon_dir, exist_ok=True)
+            with open(os.path.join(icon_dir, name), 'wb') as f:
+                f.write(data)
+            info['icon'] = name
+        except OSError as e:
+            print(f"⚠️ Error saving icon of {path}: {e}")
+    return path, stamp, info
+
+
+def cover_search_names(app_name, metadata):
+    """Nomi da provare nella ricerca delle copertine, dal migliore: ProductName e FileDescription
+    dell'exe se hanno almeno una parola in comune con il nome dell'app, poi il nome dell'app"""
+    names = []
+    app_tokens = name_tokens(app_name)
+    version = metadata.get('version', {}) if metadata else {}
+    for field in ('ProductName', 'FileDescription'):
+        candidate = ' '.join(_SYMBOLS.sub(' ', version.get(field, '')).split())
+        tokens = name_tokens(candidate)
+        if tokens and tokens not in _GENERIC_PRODUCTS and tokens & app_tokens:
+            names.append(candidate)
+    names.append(app_name)
+
+    seen, unique = set(), []
+    for name in names:
+        key = normalize_name(name)
+        if key not in seen:
+            seen.add(key)
+            unique.append(name)
+    return unique
+
+
+class PeMetadataCache:
+    """Indice persistente dei metadati PE per percorso. I metadati sono
+    {'subsystem', 'machine', 'version': {...}, 'icon': nome del file in icon_dir o ''}.
+    Condivisibile tra il thread GUI (tile) e i worker di download"""
+
+    def __init__(self, index_file, icon_dir):
+        self.index_file = Path(index_file)
+        self.icon_dir = Path(icon_dir)
+        self._entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Error loading PE metadata cache: {e}")
+            return
+        if isinstance(data, dict) and data.get('version') == INDEX_VERSION:
+            self._entries = data.get('entries', {})
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.index_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.index_file.with_suffix('.tmp')
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump({'version': INDEX_VERSION, 'entries': self._entries}, f,
+                              ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp, self.index_file)
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠️ Error saving PE metadata cache: {e}")
+
+    def icon_path(self, metadata):
+        """Percorso dell'icona estratta, None se l'exe non ne ha"""
+        if metadata and metadata.get('icon'):
+            return str(self.icon_dir / metadata['icon'])
+        return None
+
+    def _store(self, key, stamp, metadata):
+        old = self._entries.get(key)
+        old_icon = old[2].get('icon') if old and old[2] else ''
+        if old_icon and old_icon != (metadata or {}).get('icon'):
+            # L'exe è cambiato: la vecchia icona non serve più
+            try:
+                os.remove(self.icon_dir / old_icon)
+            except OSError:
+                pass
+        self._entries[key] = [stamp[0], stamp[1], metadata]
+        self._dirty = True
+
+    def metadata(self, paths):
+        """{percorso: metadati o None} per gli exe indicati. Quelli nuovi o cambiati si leggono
+        tutti insieme, in parallelo in un pool di processi se sono tanti"""
+        result, missing = {}, []
+        for path in dict.fromkeys(paths):
+            try:
+                stamp = _stamp(path)
+            except OSError:
+                result[path] = None
+                continue
+            with self._lock:
+                entry = self._entries.get(os.path.abspath(path))
+            if entry and entry[:2] == stamp:
+                result[path] = entry[2]
+            else:
+                missing.append(path)
+        if not missing:
+            return result
+
+        icon_dir = str(self.icon_dir)
+        extracted = None
+        if len(missing) >= POOL_THRESHOLD:
+            # Il pool (concurrent.futures, multiprocessing) si importa solo quando serve
+            from concurrent.futures import ProcessPoolExecutor
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                workers = min(MAX_WORKERS, os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    extracted = list(pool.map(extract_metadata, missing, repeat(icon_dir), chunksize=4))
+            except (OSError, BrokenProcessPool) as e:
+                print(f"⚠️ PE metadata pool unavailable, reading in process: {e}")
+        if extracted is None:
+            extracted = [extract_metadata(path, icon_dir) for path in missing]
+
+        with self._lock:
+            for path, (key, stamp, metadata) in zip(missing, extracted):
+                if stamp is not None:
+                    self._store(key, stamp, metadata)
+                result[path] = metadata
+        print(f"🔎 PE metadata: {len(missing)} read, {len(result) - len(missing)} cached")
+        return result
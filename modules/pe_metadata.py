@@ -0,0 +1,232 @@
+"""
+PE Metadata Module
+Pure-Python reader for Windows executables (PE/COFF): subsystem, machine,
+the version-info strings (ProductName, CompanyName, FileDescription, ...) and
+the largest embedded icon. Only the headers and the resource entries actually
+needed are read, so it is cheap even for large game executables, and it works
+on any platform.
+"""
+
+import struct
+
+# Sottosistemi (campo Subsystem dell'optional header)
+SUBSYSTEMS = {2: 'gui', 3: 'console', 9: 'wince', 10: 'efi', 14: 'xbox'}
+
+RT_ICON = 3
+RT_GROUP_ICON = 14
+RT_VERSION = 16
+
+_MAX_RESOURCE_SIZE = 16 * 1024 * 1024
+_MAX_RESOURCE_ENTRIES = 4096
+VERSION_KEYS = ('ProductName', 'CompanyName', 'FileDescription', 'ProductVersion', 'FileVersion', 'OriginalFilename')
+
+
+class PeError(ValueError):
+    """File non PE, troncato o con strutture non valide"""
+
+
+def _unpack(fmt, data, offset=0):
+    try:
+        return struct.unpack_from(fmt, data, offset)
+    except struct.error:
+        raise PeError("truncated structure")
+
+
+class PeFile:
+    """Lettore di un file PE aperto in binario. Legge gli header all'apertura;
+    le risorse si leggono su richiesta con resource_entries/read_rva"""
+
+    def __init__(self, f):
+        self.f = f
+        dos = self._read(0, 64)
+        if len(dos) < 64 or dos[:2] != b'MZ':
+            raise PeError("not an executable (missing MZ header)")
+        pe_offset = _unpack('<I', dos, 0x3C)[0]
+
+        header = self._read(pe_offset, 24)
+        if header[:4] != b'PE\0\0':
+            raise PeError("missing PE signature")
+        self.machine, sections, _, _, _, optional_size, self.characteristics = _unpack('<HHIIIHH', header, 4)
+
+        optional = self._read(pe_offset + 24, optional_size)
+        magic = _unpack('<H', optional)[0]
+        if magic == 0x10B:        # PE32
+            subsystem_at, directories_at = 68, 96
+        elif magic == 0x20B:      # PE32+
+            subsystem_at, directories_at = 68, 112
+        else:
+            raise PeError(f"unknown optional header magic {magic:#x}")
+        self.subsystem = SUBSYSTEMS.get(_unpack('<H', optional, subsystem_at)[0], 'other')
+        directory_count = _unpack('<I', optional, directories_at - 4)[0]
+        # Data directory 2 = risorse
+        self.resource_rva = self.resource_size = 0
+        if directory_count > 2:
+            self.resource_rva, self.resource_size = _unpack('<II', optional, directories_at + 16)
+
+        table = self._read(pe_offset + 24 + optional_size, sections * 40)
+        self.sections = []
+        for i in range(sections):
+            virtual_size, virtual_address, raw_size, raw_pointer = _unpack('<IIII', table, i * 40 + 8)
+            self.sections.append((virtual_address, max(virtual_size, raw_size), raw_pointer, raw_size))
+
+    def _read(self, offset, size):
+        self.f.seek(offset)
+        return self.f.read(size)
+
+    def rva_to_offset(self, rva):
+        for virtual_address, size, raw_pointer, raw_size in self.sections:
+            if virtual_address <= rva < virtual_address + size:
+                delta = rva - virtual_address
+                if delta >= raw_size:
+                    break
+                return raw_pointer + delta
+        raise PeError(f"RVA {rva:#x} outside of sections")
+
+    def read_rva(self, rva, size):
+        if size > _MAX_RESOURCE_SIZE:
+            raise PeError("resource too large")
+        return self._read(self.rva_to_offset(rva), size)
+
+    def resource_entries(self, type_id):
+        """Risorse di un tipo (RT_*): [(id o nome, lingua, rva, size)]"""
+        if not self.resource_rva:
+            return []
+        base = self.rva_to_offset(self.resource_rva)
+        found = []
+
+        def directory(offset):
+            header = self._read(base + offset, 16)
+            named, ids = _unpack('<HH', header, 12)
+            count = min(named + ids, _MAX_RESOURCE_ENTRIES)
+            raw = self._read(base + offset + 16, count * 8)
+            entries = []
+            for i in range(count):
+                name, target = _unpack('<II', raw, i * 8)
+                entries.append((name if not name & 0x80000000 else f"#{name & 0x7FFFFFFF}", target))
+            return entries
+
+        for type_name, type_target in directory(0):
+            if type_name != type_id or not type_target & 0x80000000:
+                continue
+            for res_name, name_target in directory(type_target & 0x7FFFFFFF):
+                if not name_target & 0x80000000:
+                    continue
+                for lang, data_target in directory(name_target & 0x7FFFFFFF):
+                    if data_target & 0x80000000:
+                        continue
+                    rva, size = _unpack('<II', self._read(base + data_target, 8))
+                    found.append((res_name, lang, rva, size))
+        return found
+
+    def version_info(self):
+        """Stringhe di versione ({'ProductName': ..., ...}), {} se il file non ne ha"""
+        entries = self.resource_entries(RT_VERSION)
+        if not entries:
+            return {}
+        _, _, rva, size = entries[0]
+        return parse_version_info(self.read_rva(rva, size))
+
+    def largest_icon(self):
+        """Immagine più grande dell'icona principale (il primo RT_GROUP_ICON) come
+        (dati, estensione): le icone PNG (256px) restano PNG, le bitmap diventano un .ico
+        con una sola immagine. None se l'exe non ha icone"""
+        groups = self.resource_entries(RT_GROUP_ICON)
+        if not groups:
+            return None
+        _, _, rva, size = groups[0]
+        group = self.read_rva(rva, size)
+        count = _unpack('<HHH', group)[2]
+        best = None
+        for i in range(min(count, _MAX_RESOURCE_ENTRIES)):
+            # GRPICONDIRENTRY: come ICONDIRENTRY, ma con l'id della risorsa RT_ICON al posto dell'offset
+            width, height, colors, _, planes, bits, _, icon_id = _unpack('<BBBBHHIH', group, 6 + i * 14)
+            rank = ((width or 256) * (height or 256), bits)
+            if best is None or rank > best[0]:
+                best = (rank, icon_id, (width, height, colors, planes, bits))
+        if best is None:
+            return None
+        _, icon_id, entry = best
+        for name, _, icon_rva, icon_size in self.resource_entries(RT_ICON):
+            if name == icon_id:
+                data = self.read_rva(icon_rva, icon_size)
+                if data[:8] == b'\x89PNG\r\n\x1a\n':
+                    return data, '.png'
+                return _single_icon_file(data, *entry), '.ico'
+        return None
+
+
+def _single_icon_file(dib, width, height, colors, planes, bits):
+    """File .ico con una sola immagine (header ICONDIR + ICONDIRENTRY + bitmap)"""
+    header = struct.pack('<HHH', 0, 1, 1)
+    entry = struct.pack('<BBBBHHII', width, height, colors, 0, planes, bits, len(dib), 6 + 16)
+    return header + entry + dib
+
+
+def _align4(offset):
+    return (offset + 3) & ~3
+
+
+def _vs_node(data, offset):
+    """Nodo di VS_VERSIONINFO: (chiave, valore grezzo, tipo, inizio figli, fine)"""
+    length, value_length, value_type = _unpack('<HHH', data, offset)
+    if length < 6:
+        raise PeError("invalid version node")
+    key_start = key_end = offset + 6
+    while key_end + 1 < len(data) and data[key_end:key_end + 2] != b'\0\0':
+        key_end += 2
+    key = data[key_start:key_end].decode('utf-16-le', errors='replace')
+    value_start = _align4(key_end + 2)
+    value_bytes = value_length * 2 if value_type == 1 else value_length
+    value = data[value_start:value_start + value_bytes]
+    end = min(offset + length, len(data))
+    return key, value, value_type, _align4(value_start + value_bytes), end
+
+
+def _vs_children(data, start, end):
+    offset = start
+    while offset + 6 <= end:
+        node = _vs_node(data, offset)
+        yield node
+        if node[4] <= offset:
+            break
+        offset = _align4(node[4])
+
+
+def parse_version_info(data):
+    """Stringhe di una risorsa RT_VERSION. Se ci sono più lingue si preferisce l'inglese"""
+    key, _, _, children, end = _vs_node(data, 0)
+    if key != 'VS_VERSION_INFO':
+        raise PeError("not a version resource")
+    tables = {}
+    for child_key, _, _, child_children, child_end in _vs_children(data, children, end):
+        if child_key != 'StringFileInfo':
+            continue
+        for table_key, _, _, table_children, table_end in _vs_children(data, child_children, child_end):
+            strings = {}
+            for name, value, _, _, _ in _vs_children(data, table_children, table_end):
+                text = value.decode('utf-16-le', errors='replace').split('\0', 1)[0].strip()
+                if text:
+                    strings[name] = text
+            tables[table_key.lower()] = strings
+    if not tables:
+        return {}
+    english = [k for k in tables if k.startswith('0409')]
+    return tables[english[0] if english else next(iter(tables))]
+
+
+def read_pe_info(path, icon=False):
+    """{'subsystem', 'machine', 'version': {...}} di un eseguibile, più 'icon' ((dati, estensione)
+    o None) se richiesta, con una sola apertura del file. PeError/OSError se non leggibile"""
+    with open(path, 'rb') as f:
+        pe = PeFile(f)
+        try:
+            version = pe.version_info()
+        except PeError:
+            version = {}
+        info = {'subsystem': pe.subsystem, 'machine': pe.machine, 'version': version}
+        if icon:
+            try:
+                info['icon'] = pe.largest_icon()
+            except PeError:
+                info['icon'] = None
+        return info
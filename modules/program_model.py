@@ -0,0 +1,297 @@
+"""
+Program Model Module
+List model behind the scan dialog: one array of program dicts (no widget item
+per program), icons loaded on demand when a row is first painted, and a proxy
+that sorts by normalised name and filters by the search text through a
+trigram index, narrowing from the previous result while the query grows.
+"""
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QTimer
+from PyQt6.QtGui import QIcon, QPixmap
+from modules.app_record import normalize_name
+
+KEY_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameFilterIndex:
+    """Indice dei trigrammi delle chiavi normalizzate: una ricerca per sottostringa
+    controlla solo le chiavi che contengono tutti i trigrammi della query.
+    `generation` cresce a ogni chiave aggiunta, per sapere quali sono arrivate dopo una ricerca"""
+
+    def __init__(self):
+        self._trigrams = {}   # trigramma -> {chiave}
+        self._serials = {}    # chiave -> generazione in cui è stata aggiunta
+        self.generation = 0
+
+    def add(self, key):
+        if key in self._serials:
+            return
+        self.generation += 1
+        self._serials[key] = self.generation
+        for gram in _trigrams(key):
+            self._trigrams.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        if self._serials.pop(key, None) is None:
+            return
+        for gram in _trigrams(key):
+            keys = self._trigrams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._trigrams[gram]
+
+    def clear(self):
+        self._trigrams.clear()
+        self._serials.clear()
+
+    def added_after(self, key, generation):
+        return self._serials.get(key, 0) > generation
+
+    def search(self, query, within=None):
+        """Chiavi che contengono `query`, cercate solo tra `within` se indicato.
+        Si verifica la sottostringa solo sull'insieme di candidati più piccolo"""
+        candidates = [self._serials] if within is None else [within]
+        grams = _trigrams(query)
+        if grams:
+            candidates.append(min((self._trigrams.get(gram, ()) for gram in grams), key=len))
+        candidates.sort(key=len)
+        first, rest = candidates[0], candidates[1:]
+        return {key for key in first if query in key and all(key in other for other in rest)}
+
+
+class ProgramListModel(QAbstractListModel):
+    """Programmi trovati dallo scanner, indicizzati per chiave normalizzata.
+    Le icone si chiedono a `icon_service` solo per le righe che la vista disegna"""
+
+    def __init__(self, icon_service, parent=None):
+        super().__init__(parent)
+        self.icon_service = icon_service
+        self._programs = []
+        self._rows = {}       # chiave -> riga
+        self.name_index = NameFilterIndex()
+        self._icons = {}      # chiave -> QIcon (None se il file non ha icona)
+        self._requested = set()
+        self._pending = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._programs)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        program = self._programs[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return program['name']
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon(program)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            alternates = program.get('alternates')
+            if not alternates:
+                return program['path']
+            return "\n".join([program['path'], "Other executables (right click to use):"] + alternates)
+        if role == KEY_ROLE:
+            return program['key']
+        if role == Qt.ItemDataRole.UserRole:
+            return program
+        return None
+
+    def _icon(self, program):
+        key = program['key']
+        if key in self._icons:
+            return self._icons[key]
+        if key not in self._requested:
+            self._requested.add(key)
+            self._pending.append((key, program.get('icon')))
+            if len(self._pending) == 1:
+                # Le righe visibili chiedono l'icona una alla volta: si inviano tutte insieme
+                QTimer.singleShot(0, self._flush_requests)
+        return None
+
+    def _flush_requests(self):
+        pending, self._pending = self._pending, []
+        if pending:
+            self.icon_service.request(pending)
+
+    def set_icons(self, results):
+        """Applica un batch [(chiave, QImage o None)] di IconService. Solo nel thread GUI"""
+        for key, image in results:
+            row = self._rows.get(key)
+            if row is None:
+                continue
+            self._icons[key] = None if image is None else QIcon(QPixmap.fromImage(image))
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def _forget_icon(self, key):
+        self._icons.pop(key, None)
+        self._requested.discard(key)
+
+    def reset(self, programs):
+        """Sostituisce tutto il contenuto con un solo reset del modello (una riga per chiave: vale la prima)"""
+        unique = {}
+        for program in programs:
+            unique.setdefault(program['key'], program)
+        self.beginResetModel()
+        self._programs = list(unique.values())
+        self._rows = {program['key']: row for row, program in enumerate(self._programs)}
+        self.name_index.clear()
+        for key in self._rows:
+            self.name_index.add(key)
+        self._icons.clear()
+        self._requested.clear()
+        self._pending = []
+        self.endResetModel()
+
+    def add(self, program):
+        """Aggiunge un programma; se la chiave c'è già lo aggiorna. Restituisce True se è stato aggiunto"""
+        if program['key'] in self._rows:
+            self.update(program)
+            return False
+        self.add_many([program])
+        return True
+
+    def add_many(self, programs):
+        """Aggiunge in fondo programmi con chiavi nuove, con un solo inserimento (l'ordine lo dà il proxy).
+        Le chiavi già presenti (o ripetute in `programs`) vengono saltate: ogni chiave ha una riga sola"""
+        unique = {}
+        for program in programs:
+            if program['key'] not in self._rows:
+                unique.setdefault(program['key'], program)
+        programs = list(unique.values())
+        if not programs:
+            return
+        first = len(self._programs)
+        self.beginInsertRows(QModelIndex(), first, first + len(programs) - 1)
+        for row, program in enumerate(programs, first):
+            self._programs.append(program)
+            self._rows[program['key']] = row
+            self.name_index.add(program['key'])
+        self.endInsertRows()
+
+    def update(self, program):
+        row = self._rows.get(program['key'])
+        if row is None:
+            return self.add(program)
+        old = self._programs[row]
+        if old.get('icon') != program.get('icon') or old.get('fingerprint') != program.get('fingerprint'):
+            # Icona diversa o file cambiato (es. exe aggiornato): va estratta di nuovo
+            self._forget_icon(program['key'])
+        self._programs[row] = program
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return False
+
+    def remove(self, key):
+        """Toglie un programma. Restituisce True se c'era"""
+        row = self._rows.get(key)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._programs[row]
+        del self._rows[key]
+        self.name_index.remove(key)
+        for later in self._programs[row:]:
+            self._rows[later['key']] -= 1
+        self._forget_icon(key)
+        self.endRemoveRows()
+        return True
+
+    def touch(self, keys):
+        """Notifica le righe di `keys` (a blocchi di righe contigue) senza cambiarle:
+        il proxy ricontrolla il filtro solo su quelle"""
+        rows = sorted(self._rows[key] for key in keys if key in self._rows)
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i == len(rows) or rows[i] != rows[i - 1] + 1:
+                self.dataChanged.emit(self.index(rows[start]), self.index(rows[i - 1]), [KEY_ROLE])
+                start = i
+
+    def program(self, key):
+        row = self._rows.get(key)
+        return None if row is None else self._programs[row]
+
+    def key_at(self, row):
+        """Chiave del programma alla riga `row` (come data() con KEY_ROLE, senza QModelIndex)"""
+        return self._programs[row]['key']
+
+    def keys(self):
+        return self._rows.keys()
+
+    def programs(self):
+        return list(self._programs)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def __len__(self):
+        return len(self._programs)
+
+
+class ProgramFilterProxy(QSortFilterProxyModel):
+    """Ordina per nome normalizzato e mostra solo i programmi il cui nome contiene il testo cercato.
+    L'insieme dei risultati si calcola una volta per tasto con l'indice del modello; se la query
+    si allunga si restringe il risultato precedente. Il proxy poi aggiorna nella vista solo
+    le righe che hanno cambiato visibilità"""
+
+    # Oltre questa frazione di righe da aggiornare conviene rifiltrare tutto
+    FULL_INVALIDATE_RATIO = 0.25
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._query = ''
+        self._matches = None      # None = nessun filtro
+        self._generation = 0
+        self.setSortRole(KEY_ROLE)
+        # dataChanged del modello su KEY_ROLE fa ricontrollare il filtro delle sole righe notificate
+        self.setFilterRole(KEY_ROLE)
+        self.setDynamicSortFilter(True)
+        self.sort(0)
+
+    def set_query(self, text):
+        query = normalize_name(text)
+        if query == self._query:
+            return
+        model = self.sourceModel()
+        index = model.name_index
+        old = self._matches
+        if not query:
+            matches = None
+        else:
+            narrowing = old is not None and self._query in query
+            matches = index.search(query, old if narrowing else None)
+        self._query = query
+        self._matches = matches
+        self._generation = index.generation
+
+        # Righe che cambiano visibilità: le altre non vanno ricontrollate
+        if old is None and matches is None:
+            return
+        if old is None or matches is None:
+            shown = old if matches is None else matches
+            changed = len(model) - len(shown)
+        else:
+            shown = None
+            changed = len(old ^ matches)
+        if changed > len(model) * self.FULL_INVALIDATE_RATIO:
+            self.invalidateFilter()
+        elif shown is None:
+            model.touch(old ^ matches)
+        else:
+            model.touch(key for key in model.keys() if key not in shown)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._matches is None:
+            return True
+        key = self.sourceModel().key_at(source_row)
+        if key in self._matches:
+            return True
+        # Programma arrivato dallo scanner dopo l'ultima ricerca
+        if self.sourceModel().name_index.added_after(key, self._generation) and self._query in key:
+            self._matches.add(key)
+            return True
+        return False
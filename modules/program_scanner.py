@@ -1,394 +1,230 @@
 """
 Program Scanner Module
-Handles scanning installed programs and displaying them in a dialog
+Handles scanning installed programs and displaying them in a dialog.
+Also runs without a GUI (scheduled scans, cache prewarm at boot):
+    python -m modules.program_scanner --json --sources steam,desktop
+    python -m modules.program_scanner --prewarm
 """
 
 import os
+import sys
 import json
+import time
+import queue
+import signal
+import argparse
 import platform
+import threading
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-    QLineEdit, QPushButton, QListWidget, QListWidgetItem
+    QLineEdit, QPushButton, QListView, QAbstractItemView, QMenu
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QFileInfo
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize
 from PyQt6.QtGui import QIcon
-from PyQt6.QtWidgets import QFileIconProvider
+from modules.dedupe import DuplicateIndex
+from modules.paths import get_paths, configure_paths, add_path_arguments
+from modules.icon_service import IconService
+from modules.program_model import ProgramListModel, ProgramFilterProxy
+from modules.scanner_cache import CacheValidator, fingerprint, load_cache, save_cache
+from modules.scan_sources import (
+    MAX_SCAN_WORKERS, SOURCES, DesktopReader, ScanCancelled, ScanFingerprints, SourceContext,
+    get_sources, refresh_program
+)
 
 # Detect OS
 IS_WINDOWS = platform.system() == "Windows"
 
-if IS_WINDOWS:
-    import winreg
-
+# I risultati arrivano al thread GUI a gruppi: al massimo ogni 50 ms o 100 programmi
+BATCH_INTERVAL = 0.05
+BATCH_SIZE = 100
 
 class ProgramScanner(QThread):
-    """Background thread per scansionare i programmi installati CON icone"""
-    program_found = pyqtSignal(dict)
+    """Background thread per scansionare i programmi installati CON icone.
+    Tutte le sorgenti (vedi scan_sources) girano insieme e i risultati vengono uniti qui:
+    a parità di nome vince la sorgente con priorità più alta.
+    Con `state_file` la scansione è incrementale: cartelle, file e chiavi di registro
+    non cambiati dall'ultima volta non vengono riletti. Con `previous` (chiave -> programma
+    già mostrato) vengono emesse solo le differenze: nuovi, modificati e rimossi, raccolti
+    in programs_changed(programmi nuovi o cambiati, chiavi tolte) a gruppi"""
+    programs_changed = pyqtSignal(list, list)
+    source_finished = pyqtSignal(str, int, float)  # nome sorgente, programmi, secondi
     scan_complete = pyqtSignal()
     progress_update = pyqtSignal(str)
 
-    def __init__(self):
+    def __init__(self, state_file=None, previous=None, sources=None):
         super().__init__()
+        # Tabella del PATH, locale, desktop e temi di icone letti una volta per scansione
+        self.desktop_reader = DesktopReader()
+        self.state_file = state_file
+        self.previous = previous or {}
+        self.sources = get_sources(sources)
+        # Con solo alcune sorgenti non si può dire cosa è stato disinstallato
+        self.all_sources = sources is None
+        self.old = ScanFingerprints.load(state_file) if state_file else ScanFingerprints()
+        self.new = ScanFingerprints()
+        self.duplicates = DuplicateIndex()
+        self.published = {}     # chiave -> programma canonico mostrato
+        self.removed = set()    # chiavi già tolte durante la scansione
+        self.source_stats = {}  # nome sorgente -> (programmi, secondi, {fase: secondi}, esito)
+        self._cancel = threading.Event()
+        self._batch = {}        # chiave -> programma da mostrare o None (tolto), fino al prossimo invio
+        self._batch_sent = 0.0
     
-    def _extract_icon_from_exe(self, exe_path):
-        """Estrae l'icona da un file exe usando QFileIconProvider (con trasparenza)"""
-        try:
-            provider = QFileIconProvider()
-            file_info = QFileInfo(exe_path)
-            icon = provider.icon(file_info)
-            
-            if not icon.isNull():
-                pixmap = icon.pixmap(32, 32)
-                return pixmap
-        except Exception as e:
-            print(f"Error extracting icon from {exe_path}: {e}")
-        
-        return None
-    
-    def _find_best_exe(self, directory, app_name):
-        """Trova l'exe migliore in una directory usando euristiche intelligenti"""
-        if not os.path.isdir(directory):
-            return None
-        
+    def _publish(self, program, priority):
+        """Unisce un risultato: i duplicati (stesso nome normalizzato, stesso comando o nome
+        quasi uguale) finiscono nello stesso gruppo e si mostra solo il canonico, cioè quello
+        della sorgente con priorità migliore. Emette solo se cambia quanto mostrato.
+        Gira solo nel thread dello scanner, quindi non servono lock"""
+        _cluster, created, replaced = self.duplicates.add(program, priority)
+        if not created and replaced is None:
+            return
+        key = program['key']
+        before = self.previous.get(key)
+        if replaced is not None:
+            del self.published[replaced['key']]
+            if replaced['key'] == key:
+                before = replaced
+            else:
+                # Il nuovo canonico ha un'altra chiave: la voce mostrata finora sparisce
+                self.removed.add(replaced['key'])
+                self._batch[replaced['key']] = None
+        if key in self.removed:
+            # Era stata tolta come duplicato e torna canonica: per il dialog è nuova
+            self.removed.discard(key)
+            before = None
+        self.published[key] = program
+        if before is not None and all(before.get(f) == program[f] for f in ('name', 'path', 'icon')):
+            return
+        # Le icone le estrae il dialog con IconService, non lo scanner
+        shown = dict(program)
+        shown['fingerprint'] = fingerprint(program)
+        self._batch[key] = shown
+
+    def _flush(self, force=False):
+        """Invia i cambiamenti raccolti se sono abbastanza o se è passato BATCH_INTERVAL"""
+        if not self._batch:
+            return
+        now = time.monotonic()
+        if not force and len(self._batch) < BATCH_SIZE and now - self._batch_sent < BATCH_INTERVAL:
+            return
+        changed = [program for program in self._batch.values() if program is not None]
+        removed = [key for key, program in self._batch.items() if program is None]
+        self._batch = {}
+        self._batch_sent = now
+        if changed:
+            self.progress_update.emit(f"Found: {changed[-1]['name']}")
+        self.programs_changed.emit(changed, removed)
+
+    def stop(self):
+        """Annulla la scansione e attende il thread. L'annullamento è cooperativo: ogni
+        sorgente si ferma al prossimo controllo (tra una cartella, un file o una chiave e l'altra)"""
+        self._cancel.set()
+        self.requestInterruption()
+        if self.isRunning():
+            self.wait()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def _run_source(self, source, pool, results):
+        """Esegue una sorgente nel suo thread e passa i risultati allo scanner man mano.
+        Esito: 'done', 'cancelled', 'timeout' (oltre source.timeout secondi) o 'failed'"""
+        ctx = SourceContext(self, pool, self.old, self._cancel, source.timeout)
+        start = time.perf_counter()
+        found = 0
+        status = 'done'
         try:
-            exe_files = []
-            for f in os.listdir(directory):
-                if f.lower().endswith('.exe'):
-                    exe_files.append(f)
-            
-            if not exe_files:
-                return None
-            
-            bad_keywords = [
-                'unins', 'uninst', 'uninstall', 'setup', 'install', 'update', 
-                'updater', 'launcher', 'crash', 'report', 'helper', 'service',
-                'background', 'agent', 'stub', 'bootstrap', 'redist'
-            ]
-            
-            good_exes = []
-            for exe in exe_files:
-                exe_lower = exe.lower()
-                if not any(bad in exe_lower for bad in bad_keywords):
-                    good_exes.append(exe)
-            
-            if not good_exes:
-                for exe in exe_files:
-                    if 'unins' not in exe.lower():
-                        return os.path.join(directory, exe)
-                return None
-            
-            app_name_clean = app_name.lower().replace(' ', '').replace('-', '').replace('_', '')
-            
-            for exe in good_exes:
-                exe_clean = exe.lower().replace('.exe', '').replace(' ', '').replace('-', '').replace('_', '')
-                if exe_clean == app_name_clean or app_name_clean in exe_clean:
-                    return os.path.join(directory, exe)
-            
-            app_words = app_name.lower().split()
-            for exe in good_exes:
-                exe_lower = exe.lower()
-                if any(word in exe_lower and len(word) > 3 for word in app_words):
-                    return os.path.join(directory, exe)
-            
-            good_exes.sort(key=len)
-            return os.path.join(directory, good_exes[0])
-            
+            for program in source.scan(ctx):
+                found += 1
+                # Per rileggerlo dal cache con la stessa sorgente (scan_sources.refresh_program)
+                program['source'] = source.name
+                results.put((source, program))
+                ctx.check()
+        except ScanCancelled:
+            status = 'timeout' if ctx.timed_out else 'cancelled'
         except Exception as e:
-            print(f"Error finding best exe in {directory}: {e}")
-            return None
+            status = 'failed'
+            print(f"⚠️ Scan source '{source.name}' failed: {e}")
+        finally:
+            results.put((source, (ctx, found, time.perf_counter() - start, status)))
 
     def run(self):
-        if IS_WINDOWS:
-            self._scan_windows()
-        else:
-            self._scan_linux()
-        
-        self.scan_complete.emit()
-    
-    def _scan_windows(self):
-        """Scansiona programmi Windows dal registro"""
-        seen_names = set()
-
-        registry_paths = [
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-            (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-        ]
-
-        for hkey, path in registry_paths:
-            try:
-                key = winreg.OpenKey(hkey, path)
-                for i in range(winreg.QueryInfoKey(key)[0]):
-                    try:
-                        subkey_name = winreg.EnumKey(key, i)
-                        subkey = winreg.OpenKey(key, subkey_name)
-                        try:
-                            name = winreg.QueryValueEx(subkey, "DisplayName")[0].strip()
-                        except:
-                            winreg.CloseKey(subkey)
-                            continue
-
-                        exe_path = None
-                        icon_path = None
-
-                        try:
-                            val = winreg.QueryValueEx(subkey, "DisplayIcon")[0]
-                            icon_path = val.strip('"').split(',')[0]
-                        except:
-                            pass
-
-                        try:
-                            val = winreg.QueryValueEx(subkey, "InstallLocation")[0].strip()
-                            if val:
-                                exe_path = self._find_best_exe(val, name)
-                        except:
-                            pass
-
-                        if not exe_path:
-                            try:
-                                val = winreg.QueryValueEx(subkey, "UninstallString")[0]
-                                if "unins" in val.lower():
-                                    parts = val.split('"')
-                                    for p in parts:
-                                        if p.lower().endswith('.exe'):
-                                            dir_path = os.path.dirname(p)
-                                            exe_path = self._find_best_exe(dir_path, name)
-                                            if exe_path:
-                                                break
-                            except:
-                                pass
-
-                        if name and exe_path and os.path.exists(exe_path):
-                            if name.lower() not in seen_names:
-                                seen_names.add(name.lower())
-                                
-                                self.progress_update.emit(f"Found: {name}")
-                                final_icon = icon_path if icon_path and os.path.exists(icon_path) else exe_path
-                                
-                                icon_pixmap = None
-                                if final_icon and os.path.exists(final_icon):
-                                    if final_icon.lower().endswith('.exe'):
-                                        icon_pixmap = self._extract_icon_from_exe(final_icon)
-                                    else:
-                                        from PyQt6.QtGui import QPixmap
-                                        icon_pixmap = QPixmap(final_icon)
-                                        if icon_pixmap.isNull():
-                                            icon_pixmap = None
-                                
-                                program_data = {
-                                    'name': name,
-                                    'path': exe_path,
-                                    'icon': final_icon,
-                                    'icon_pixmap': icon_pixmap
-                                }
-                                self.program_found.emit(program_data)
-
-                        winreg.CloseKey(subkey)
-                    except:
-                        continue
-                winreg.CloseKey(key)
-            except:
-                continue
-
-        # Start Menu shortcuts
-        start_menu_paths = [
-            os.path.join(os.environ.get('PROGRAMDATA', ''), 'Microsoft', 'Windows', 'Start Menu', 'Programs'),
-            os.path.join(os.environ.get('APPDATA', ''), 'Microsoft', 'Windows', 'Start Menu', 'Programs'),
-            os.path.join(os.environ.get("USERPROFILE", ""), "Desktop"),
-            os.path.join(os.environ.get("PUBLIC", "C:\\Users\\Public"), "Desktop"),
-            os.environ.get("ProgramFiles"),
-            os.environ.get("ProgramFiles(x86)")
-        ]
-        for start_path in start_menu_paths:
-            if os.path.exists(start_path):
-                self.scan_shortcuts(start_path, seen_names)
-    
-    def _scan_linux(self):
-        """Scansiona programmi Linux dai file .desktop"""
-        seen_names = set()
-        
-        desktop_dirs = [
-            "/usr/share/applications",
-            "/usr/local/share/applications",
-            os.path.expanduser("~/.local/share/applications"),
-            "/var/lib/snapd/desktop/applications",
-            "/var/lib/flatpak/exports/share/applications",
-            os.path.expanduser("~/.local/share/flatpak/exports/share/applications")
-        ]
-        
-        for desktop_dir in desktop_dirs:
-            if not os.path.exists(desktop_dir):
-                continue
-                
-            try:
-                for filename in os.listdir(desktop_dir):
-                    if not filename.endswith('.desktop'):
-                        continue
-                    
-                    desktop_file = os.path.join(desktop_dir, filename)
-                    
-                    try:
-                        app_data = self._parse_desktop_file(desktop_file)
-                        if app_data and app_data['name'].lower() not in seen_names:
-                            seen_names.add(app_data['name'].lower())
-                            self.progress_update.emit(f"Found: {app_data['name']}")
-                            self.program_found.emit(app_data)
-                    except Exception as e:
-                        print(f"Error parsing {desktop_file}: {e}")
-                        continue
-            except Exception as e:
-                print(f"Error scanning {desktop_dir}: {e}")
-                continue
-    
-    def _parse_desktop_file(self, filepath):
-        """Parse Linux .desktop file"""
-        name = None
-        exec_path = None
-        icon = None
-        no_display = False
-        
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    
-                    if line.startswith('Name=') and not name:
-                        name = line.split('=', 1)[1]
-                    elif line.startswith('Exec='):
-                        exec_cmd = line.split('=', 1)[1]
-                        exec_cmd = exec_cmd.replace('%U', '').replace('%F', '').replace('%u', '').replace('%f', '')
-                        exec_path = exec_cmd.strip()
-                    elif line.startswith('Icon='):
-                        icon = line.split('=', 1)[1]
-                    elif line.startswith('NoDisplay=true'):
-                        no_display = True
-                    elif line.startswith('Terminal=true'):
-                        no_display = True
-            
-            if no_display or not name or not exec_path:
-                return None
-            
-            if ' ' in exec_path:
-                exec_path_cmd = exec_path.split(' ')[0]
+        results = queue.Queue()
+        with ThreadPoolExecutor(max_workers=MAX_SCAN_WORKERS, thread_name_prefix="scan") as pool, \
+                ThreadPoolExecutor(max_workers=max(1, len(self.sources)), thread_name_prefix="source") as runners:
+            for source in self.sources:
+                runners.submit(self._run_source, source, pool, results)
+
+            running = len(self.sources)
+            while running:
+                try:
+                    source, item = results.get(timeout=BATCH_INTERVAL)
+                except queue.Empty:
+                    self._flush()
+                    continue
+                if isinstance(item, dict):
+                    if not self.cancelled:
+                        self._publish(item, source.priority)
+                        self._flush()
+                    continue
+                ctx, found, elapsed, status = item
+                self.new.merge(ctx.new)
+                self.source_stats[source.name] = (found, elapsed, dict(ctx.timings), status)
+                self.source_finished.emit(source.name, found, elapsed)
+                running -= 1
+
+        for name, (found, elapsed, phases, status) in self.source_stats.items():
+            detail = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in phases.items())
+            note = "" if status == 'done' else f" [{status}]"
+            print(f"⏱️ {name}: {found} programs in {elapsed:.2f}s" + (f" ({detail})" if detail else "") + note)
+
+        merged = len(self.duplicates.clusters)
+        total = sum(len(cluster.members) for cluster in self.duplicates.clusters)
+        if total > merged:
+            print(f"🔗 Duplicates: {total} entries merged into {merged} programs")
+
+        complete = self.all_sources and all(stats[3] == 'done' for stats in self.source_stats.values())
+        if complete:
+            for key in self.previous:
+                if key not in self.published and key not in self.removed:
+                    self._batch[key] = None
+        self._flush(force=True)
+
+        if self.state_file:
+            if complete:
+                self.new.save(self.state_file)
             else:
-                exec_path_cmd = exec_path
-            
-            if not os.path.isabs(exec_path_cmd):
-                import shutil
-                full_path = shutil.which(exec_path_cmd)
-                if full_path:
-                    exec_path = exec_path.replace(exec_path_cmd, full_path, 1)
-                else:
-                    return None
-            
-            if ' ' not in exec_path and not os.path.exists(exec_path):
-                return None
-
-            icon_path = self._find_icon(icon) if icon else None
-            
-            return {
-                'name': name,
-                'path': exec_path,
-                'icon': icon_path or exec_path_cmd
-            }
-        
-        except Exception as e:
-            print(f"Error reading {filepath}: {e}")
-            return None
+                # Punto di ripresa: le impronte di quanto è stato letto si aggiungono a quelle
+                # precedenti, così la prossima scansione riparte senza rileggere il lavoro fatto.
+                # Senza una scansione completa non si può dire cosa è stato disinstallato:
+                # nessun programma viene tolto
+                checkpoint = self.old.copy()
+                checkpoint.merge(self.new)
+                checkpoint.save(self.state_file)
+                if self.all_sources:
+                    print("⏹️ Scan stopped before the end: progress saved, removals skipped")
+        self.scan_complete.emit()
     
-    def _find_icon(self, icon_name):
-        """Find Linux icon in standard paths"""
-        if not icon_name:
-            return None
-        
-        if os.path.isabs(icon_name) and os.path.exists(icon_name):
-            return icon_name
-        
-        if os.path.isabs(icon_name) and not os.path.exists(icon_name):
-            for ext in ['.png', '.svg', '.xpm']:
-                if os.path.exists(f"{icon_name}{ext}"):
-                    return f"{icon_name}{ext}"
-
-        icon_dirs = [
-            "/usr/share/icons/hicolor/scalable/apps",
-            "/usr/share/icons/hicolor/512x512/apps",
-            "/usr/share/icons/hicolor/256x256/apps",
-            "/usr/share/icons/hicolor/128x128/apps",
-            "/usr/share/pixmaps",
-            os.path.expanduser("~/.local/share/icons/hicolor/scalable/apps"),
-            os.path.expanduser("~/.local/share/icons/hicolor/512x512/apps"),
-            os.path.expanduser("~/.local/share/icons/hicolor/256x256/apps"),
-            os.path.expanduser("~/.local/share/icons/hicolor/128x128/apps"),
-            "/usr/share/icons",
-            os.path.expanduser("~/.local/share/icons")
-        ]
-        
-        extensions = ['.png', '.svg', '.xpm', '']
-        
-        for icon_dir in icon_dirs:
-            if not os.path.exists(icon_dir):
-                continue
-            
-            for ext in extensions:
-                icon_file = f"{icon_name}{ext}"
-                full_path = os.path.join(icon_dir, icon_file)
-                if os.path.exists(full_path):
-                    return full_path
-
-        for icon_dir in [d for d in icon_dirs if 'hicolor' not in d and 'pixmaps' not in d]:
-            if not os.path.exists(icon_dir):
-                continue
-            for root, dirs, files in os.walk(icon_dir):
-                for ext in extensions:
-                    icon_file = f"{icon_name}{ext}"
-                    if icon_file in files:
-                        full_path = os.path.join(root, icon_file)
-                        if any(size in full_path for size in ['256', '512', 'scalable']):
-                            return full_path
-        
-        return None
-
-    def scan_shortcuts(self, directory, seen_names):
-        """Scan Windows shortcuts"""
-        try:
-            import win32com.client
-            shell = win32com.client.Dispatch("WScript.Shell")
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    if file.lower().endswith('.lnk'):
-                        try:
-                            shortcut_path = os.path.join(root, file)
-                            shortcut = shell.CreateShortCut(shortcut_path)
-                            target = shortcut.Targetpath
-                            if target and target.lower().endswith('.exe') and os.path.exists(target):
-                                name = Path(file).stem
-                                if name.lower() not in seen_names:
-                                    seen_names.add(name.lower())
-                                    
-                                    self.progress_update.emit(f"Found: {name}")
-                                    
-                                    icon_pixmap = self._extract_icon_from_exe(target)
-                                    
-                                    program_data = {
-                                        'name': name,
-                                        'path': target,
-                                        'icon': target,
-                                        'icon_pixmap': icon_pixmap
-                                    }
-                                    self.program_found.emit(program_data)
-                        except:
-                            continue
-        except ImportError:
-            pass
-
 
 class ProgramScanDialog(QDialog):
     def __init__(self, image_manager=None, parent=None):
         super().__init__(parent)
         self.image_manager = image_manager
         cache_suffix = "windows" if IS_WINDOWS else "linux"
-        self.cache_file = Path(f"scanner_cache_{cache_suffix}.json")
+        self.cache_file = get_paths().scanner_cache(cache_suffix)
+        self.state_file = get_paths().scanner_state(cache_suffix)
+        self.scan_stats = None
+        self.icon_service = IconService(get_paths().icon_cache_dir, self)
+        self.model = ProgramListModel(self.icon_service, self)
+        self.proxy = ProgramFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.icon_service.icons_ready.connect(self.model.set_icons)
+        self.validator = None
+        self.finished.connect(self._stop_workers)
         self.setWindowTitle("Scan Installed Programs")
         self.setModal(True)
         self.setFixedSize(700, 650)
@@ -396,7 +232,7 @@ class ProgramScanDialog(QDialog):
             QDialog { background-color: #1a1a1a; }
             QLabel { color: white; font-size: 16px; }
             QLineEdit { background-color: #2a2a2a; color: white; border: 2px solid #444; padding: 8px; border-radius: 8px; font-size: 14px; }
-            QListWidget { 
+            QListView { 
                 background-color: #2a2a2a; 
                 color: white; 
                 border: 2px solid #444; 
@@ -404,15 +240,15 @@ class ProgramScanDialog(QDialog):
                 font-size: 14px; 
                 padding: 5px; 
             }
-            QListWidget::item { 
+            QListView::item { 
                 padding: 8px; 
                 border-radius: 4px;
                 background-color: transparent;
             }
-            QListWidget::item:selected { 
+            QListView::item:selected { 
                 background-color: #3a3a3a; 
             }
-            QListWidget::item:hover { 
+            QListView::item:hover { 
                 background-color: rgba(51, 51, 51, 0.5);
             }
             QPushButton { background-color: #2a2a2a; color: white; border: 2px solid #444; padding: 12px 30px; border-radius: 8px; font-size: 14px; font-weight: bold; }
@@ -431,7 +267,7 @@ class ProgramScanDialog(QDialog):
         header_layout.addStretch()
         
         self.refresh_btn = QPushButton()
-        refresh_icon_path = Path("assets/icons/refresh.png")
+        refresh_icon_path = Path(get_paths().resource("assets", "icons", "refresh.png"))
         if refresh_icon_path.exists():
             self.refresh_btn.setIcon(QIcon(str(refresh_icon_path)))
             self.refresh_btn.setIconSize(QSize(20, 20))
@@ -466,10 +302,16 @@ class ProgramScanDialog(QDialog):
         search_box.addWidget(self.search_input)
         layout.addLayout(search_box)
 
-        self.list_widget = QListWidget()
-        self.list_widget.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
-        self.list_widget.setIconSize(QSize(32, 32))
-        layout.addWidget(self.list_widget)
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+        self.list_view.setIconSize(QSize(32, 32))
+        # Tutte le righe hanno la stessa altezza: la vista non misura ogni riga
+        self.list_view.setUniformItemSizes(True)
+        # Menu contestuale: scelta di un altro exe tra quelli classificati dallo scanner
+        self.list_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.list_view.customContextMenuRequested.connect(self.show_executable_menu)
+        layout.addWidget(self.list_view)
 
         self.info_label = QLabel("Select which programs to add (Ctrl/Shift for multiple)")
         self.info_label.setStyleSheet("color: #aaa; font-size: 13px;")
@@ -488,186 +330,246 @@ class ProgramScanDialog(QDialog):
 
         self.setLayout(layout)
 
-        self.list_widget.itemSelectionChanged.connect(self.update_add_button)
+        self.list_view.selectionModel().selectionChanged.connect(self.update_add_button)
 
         self.scanner = None
         self.cache_loader = None
         if self.load_from_cache_fast():
-            self.title_label.setText(f"Loaded {self.list_widget.count()} programs from cache")
+            self.title_label.setText(f"Loaded {len(self.model)} programs from cache")
             self.progress_label.setText("✅ Cache loaded (press ↻ to update)")
             self.refresh_btn.setEnabled(True)
         else:
             self.start_scan()
 
     def load_from_cache_fast(self):
-        """Carica rapidamente dal cache"""
-        if not self.cache_file.exists():
+        """Mostra subito i programmi del cache con un solo reset del modello, poi li
+        controlla in background. Le icone si chiedono quando le righe diventano visibili"""
+        cached_programs = load_cache(self.cache_file)
+        if not cached_programs:
             return False
-        
-        try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                cached_programs = json.load(f)
-            
-            if not cached_programs:
-                return False
-            
-            # Ordina i programmi per nome PRIMA di caricare
-            cached_programs.sort(key=lambda x: x['name'].lower())
-            
-            # FASE 1: Carica i primi 10 immediatamente (con icone)
-            for idx, data in enumerate(cached_programs[:10]):
-                item = QListWidgetItem(f"{data['name']}")
-                
-                # Carica l'icona subito per i primi 10
-                if data.get('icon'):
-                    provider = QFileIconProvider()
-                    file_info = QFileInfo(data['icon'])
-                    icon = provider.icon(file_info)
-                    
-                    if not icon.isNull():
-                        pixmap = icon.pixmap(32, 32)
-                        item.setIcon(QIcon(pixmap))
-                
-                item.setData(Qt.ItemDataRole.UserRole, data)
-                self.list_widget.addItem(item)
-            
-            # Già ordinati, non serve ri-ordinare!
-            
-            # FASE 2: Carica il resto in background se ci sono più di 10
-            if len(cached_programs) > 10:
-                self.title_label.setText(f"Loaded 10/{len(cached_programs)} programs")
-                from PyQt6.QtCore import QTimer
-                QTimer.singleShot(50, lambda: self.load_remaining_icons(cached_programs[10:]))
-            else:
-                self.title_label.setText(f"Loaded {len(cached_programs)} programs from cache")
-                self.progress_label.setText("✅ Cache loaded (press ↻ to update)")
-                self.refresh_btn.setEnabled(True)
+        self.model.reset(cached_programs)
+        self.validator = CacheValidator(cached_programs, refresh_program, self)
+        self.validator.validated.connect(self.apply_validation)
+        self.validator.start()
+        return True
+
+    def apply_validation(self, removed, changed):
+        """Toglie i programmi il cui file non esiste più e aggiorna quelli cambiati"""
+        if self.validator is None:
+            # Arrivato dopo l'avvio di una scansione completa: vale quella
+            return
+        for key in removed:
+            self.model.remove(key)
+        for program in changed:
+            self.model.update(program)
+        if removed or changed:
+            self.save_to_cache(self.model.programs())
+            self.title_label.setText(f"Loaded {len(self.model)} programs from cache")
+
+    def _stop_workers(self, _result=None):
+        """Alla chiusura del dialog: niente thread che continuano a leggere il disco"""
+        if self.validator is not None:
+            self.validator.stop()
+        if self.scanner is not None:
+            self.scanner.stop()
+        self.icon_service.stop()
 
-            
-            return True
-            
-        except Exception as e:
-            print(f"⚠️ Error loading cache: {e}")
-            return False
-    
-    def load_remaining_icons(self, remaining_programs):
-        """Carica i programmi rimanenti progressivamente"""
-        from PyQt6.QtCore import QTimer, QCoreApplication
-        
-        self.remaining_queue = remaining_programs
-        self.remaining_index = 0
-        self.total_programs = self.list_widget.count() + len(remaining_programs)
-        
-        # Timer per caricare a batch
-        self.remaining_timer = QTimer()
-        self.remaining_timer.timeout.connect(self.load_remaining_batch)
-        self.remaining_timer.start(10)  # Ogni 10ms
-    
-    def load_remaining_batch(self):
-        """Carica un batch di programmi rimanenti"""
-        batch_size = 15  # Carica 15 alla volta
-        
-        for _ in range(batch_size):
-            if self.remaining_index >= len(self.remaining_queue):
-                # Finito!
-                self.remaining_timer.stop()
-                # NON serve più ordinare, sono già in ordine!
-                self.title_label.setText(f"Loaded {self.total_programs} programs from cache")
-                self.progress_label.setText("✅ Cache loaded (press ↻ to update)")
-                self.refresh_btn.setEnabled(True)
-                return
-            
-            data = self.remaining_queue[self.remaining_index]
-            
-            item = QListWidgetItem(f"{data['name']}")
-            
-            # Carica l'icona
-            if data.get('icon'):
-                provider = QFileIconProvider()
-                file_info = QFileInfo(data['icon'])
-                icon = provider.icon(file_info)
-                
-                if not icon.isNull():
-                    pixmap = icon.pixmap(32, 32)
-                    item.setIcon(QIcon(pixmap))
-            
-            item.setData(Qt.ItemDataRole.UserRole, data)
-            self.list_widget.addItem(item)
-            
-            self.remaining_index += 1
-        
-        # Aggiorna il conteggio
-        current_count = self.list_widget.count()
-        self.title_label.setText(f"Loading... {current_count}/{self.total_programs}")
-    
     def save_to_cache(self, programs):
-        try:
-            programs_to_save = []
-            for prog in programs:
-                prog_copy = prog.copy()
-                prog_copy.pop('icon_pixmap', None)
-                programs_to_save.append(prog_copy)
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(programs_to_save, f, indent=2, ensure_ascii=False)
-            print(f"💾 Cache saved with {len(programs_to_save)} programs")
-        except Exception as e:
-            print(f"⚠️ Error saving cache: {e}")
+        if save_cache(self.cache_file, programs):
+            print(f"💾 Cache saved with {len(programs)} programs")
     
     def force_rescan(self):
-        self.list_widget.clear()
+        # La lista resta: lo scanner invia solo le differenze rispetto a quanto mostrato
         self.refresh_btn.setEnabled(False)
         self.title_label.setText("Scanning Installed Programs in Progress...")
         self.progress_label.setText("")
         self.start_scan()
     
     def start_scan(self):
-        self.scanner = ProgramScanner()
-        self.scanner.program_found.connect(self.add_item)
+        if self.validator is not None:
+            # La scansione completa rende inutile il controllo del cache
+            self.validator.stop()
+            self.validator = None
+        previous = {program['key']: program for program in self.model.programs()}
+        self.scan_stats = {'added': 0, 'updated': 0, 'removed': 0}
+        self.scanner = ProgramScanner(self.state_file, previous)
+        self.scanner.programs_changed.connect(self.apply_changes)
         self.scanner.scan_complete.connect(self.scan_done)
         self.scanner.progress_update.connect(self.update_progress)
         self.scanner.start()
 
-    def add_item(self, data):
-        item = QListWidgetItem(f"{data['name']}")
-        
-        if data.get('icon_pixmap') and not data['icon_pixmap'].isNull():
-            scaled_icon = data['icon_pixmap'].scaled(
-                32, 32,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            item.setIcon(QIcon(scaled_icon))
-        
-        item.setData(Qt.ItemDataRole.UserRole, data)
-        self.list_widget.addItem(item)
-        self.title_label.setText(f"Found {self.list_widget.count()} programs")
+    def apply_changes(self, changed, removed):
+        """Un gruppo di risultati dello scanner: i programmi nuovi entrano con un solo inserimento"""
+        for key in removed:
+            if self.model.remove(key):
+                self.scan_stats['removed'] += 1
+        new = []
+        for program in changed:
+            if program['key'] in self.model:
+                self.model.update(program)
+                self.scan_stats['updated'] += 1
+            else:
+                new.append(program)
+        if new:
+            self.model.add_many(new)
+            self.scan_stats['added'] += len(new)
+            self.title_label.setText(f"Found {len(self.model)} programs")
 
     def scan_done(self):
-        programs = []
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            programs.append(item.data(Qt.ItemDataRole.UserRole))
-
-        self.list_widget.sortItems(Qt.SortOrder.AscendingOrder)
-        self.save_to_cache(programs)
+        self.save_to_cache(self.model.programs())
         
-        self.title_label.setText(f"Scan completed – Found {self.list_widget.count()} programs")
-        self.progress_label.setText("💾 Cache saved")
+        stats = self.scan_stats
+        self.title_label.setText(f"Scan completed – Found {len(self.model)} programs")
+        self.progress_label.setText(
+            f"💾 Cache saved (+{stats['added']} new, ~{stats['updated']} changed, -{stats['removed']} removed)"
+        )
         self.refresh_btn.setEnabled(True)
     
     def update_progress(self, message):
         self.progress_label.setText(message)
 
     def filter_list(self, text):
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            item.setHidden(text.lower() not in item.text().lower())
+        self.proxy.set_query(text)
+
+    def show_executable_menu(self, pos):
+        index = self.list_view.indexAt(pos)
+        if not index.isValid():
+            return
+        program = index.data(Qt.ItemDataRole.UserRole)
+        alternates = [path for path in program.get('alternates', []) if os.path.exists(path)]
+        if not alternates:
+            return
+        menu = QMenu(self)
+        for path in alternates:
+            action = menu.addAction(f"Use {os.path.basename(path)}")
+            action.setToolTip(path)
+            action.triggered.connect(lambda _checked=False, path=path: self.use_executable(program['key'], path))
+        menu.exec(self.list_view.viewport().mapToGlobal(pos))
+
+    def use_executable(self, key, path):
+        """Sostituisce l'exe di un programma con una delle alternative; il vecchio diventa un'alternativa"""
+        program = self.model.program(key)
+        if program is None or path == program['path']:
+            return
+        updated = dict(program)
+        updated['alternates'] = [program['path']] + [alt for alt in program.get('alternates', []) if alt != path]
+        updated['path'] = path
+        if program.get('icon') == program['path']:
+            # Icona presa dall'exe: segue l'exe scelto
+            updated['icon'] = path
+        if 'fingerprint' in program:
+            updated['fingerprint'] = fingerprint(updated)
+        self.model.update(updated)
+        self.save_to_cache(self.model.programs())
+        print(f"🔁 {program['name']}: using {path}")
+
+    def _selected_rows(self):
+        return self.list_view.selectionModel().selectedRows()
 
     def update_add_button(self):
-        selected = len(self.list_widget.selectedItems())
+        selected = len(self._selected_rows())
         self.add_btn.setEnabled(selected > 0)
         self.info_label.setText(f"{selected} selected" if selected > 0 else "Select the programs to add")
 
     def get_selected(self):
-        return [item.data(Qt.ItemDataRole.UserRole) for item in self.list_widget.selectedItems()]
\ No newline at end of file
+        return [index.data(Qt.ItemDataRole.UserRole) for index in self._selected_rows()]
+
+
+def _cache_suffix():
+    return "windows" if IS_WINDOWS else "linux"
+
+
+def run_headless(sources=None, prewarm=False, full=False, as_json=False, out=None):
+    """Esegue lo scanner nel thread corrente, senza QApplication.
+    Con as_json scrive su `out` una riga JSON per evento (NDJSON):
+      {"type": "program", ...}, {"type": "removed", "key"}, {"type": "source", ...}, {"type": "summary", ...}
+    altrimenti "nome<TAB>comando" per programma. I messaggi dello scanner vanno su stderr.
+    Con prewarm salva cache e impronte come il dialog: all'apertura la lista è già pronta.
+    Senza prewarm la scansione è completa e non tocca né la cache né le impronte del dialog.
+    Restituisce il codice di uscita (0, 1 se una sorgente è fallita, 130 se interrotto)"""
+    out = out or sys.stdout
+    paths = get_paths()
+    cache_file = paths.scanner_cache(_cache_suffix())
+    # Impronte solo insieme alla cache: salvate da sole farebbero saltare al dialog
+    # cartelle i cui programmi non sono mai finiti nella cache
+    state_file = paths.scanner_state(_cache_suffix()) if prewarm else None
+    if full and state_file and state_file.exists():
+        state_file.unlink()
+
+    shown = {program['key']: program for program in load_cache(cache_file)} if prewarm else {}
+    scanner = ProgramScanner(state_file, dict(shown), sources)
+
+    def write(event):
+        if as_json:
+            out.write(json.dumps(event, ensure_ascii=False) + "\n")
+        elif event['type'] == 'program':
+            out.write(f"{event['name']}\t{event['path']}\n")
+        out.flush()
+
+    def on_changed(changed, removed):
+        for key in removed:
+            shown.pop(key, None)
+            write({'type': 'removed', 'key': key})
+        for program in changed:
+            shown[program['key']] = program
+            event = {'type': 'program'}
+            event.update((k, v) for k, v in program.items() if k != 'key')
+            write(event)
+
+    # Segnali nello stesso thread: connessioni dirette, non serve un event loop
+    scanner.programs_changed.connect(on_changed)
+    previous_handler = signal.signal(signal.SIGINT, lambda *_: scanner.stop())
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(sys.stderr):
+            scanner.run()
+            if prewarm and not scanner.cancelled:
+                save_cache(cache_file, list(shown.values()))
+                print(f"💾 Cache prewarmed with {len(shown)} programs")
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+    for name, (found, elapsed, phases, status) in scanner.source_stats.items():
+        if as_json:
+            write({'type': 'source', 'name': name, 'programs': found, 'seconds': round(elapsed, 3),
+                   'phases': {phase: round(seconds, 3) for phase, seconds in phases.items()},
+                   'status': status})
+    if as_json:
+        write({'type': 'summary', 'programs': len(scanner.published),
+               'seconds': round(time.perf_counter() - start, 3), 'cancelled': scanner.cancelled})
+
+    if scanner.cancelled:
+        return 130
+    return 1 if any(stats[3] == 'failed' for stats in scanner.source_stats.values()) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m modules.program_scanner",
+                                     description="Scan installed programs without the GUI")
+    add_path_arguments(parser)
+    parser.add_argument('--json', action='store_true', help="Write one JSON object per line (NDJSON)")
+    parser.add_argument('--sources', help="Comma-separated sources to run (default: all available)")
+    parser.add_argument('--list-sources', action='store_true', help="List the sources and exit")
+    parser.add_argument('--prewarm', action='store_true',
+                        help="Update the scanner cache used by the scan dialog")
+    parser.add_argument('--full', action='store_true', help="With --prewarm, ignore the saved fingerprints and read everything")
+    args = parser.parse_args(argv)
+
+    if args.list_sources:
+        for source in sorted(SOURCES.values(), key=lambda s: (s.priority, s.name)):
+            print(f"{source.name}\tpriority {source.priority}\t"
+                  f"{'available' if source.available() else 'not available on this system'}")
+        return 0
+
+    names = [n.strip() for n in args.sources.split(',') if n.strip()] if args.sources else None
+    if names is not None:
+        unknown = [n for n in names if n not in SOURCES]
+        if unknown:
+            parser.error(f"unknown source(s): {', '.join(unknown)} (see --list-sources)")
+
+    configure_paths(args.data_dir, args.cache_dir, args.portable)
+    return run_headless(names, prewarm=args.prewarm, full=args.full, as_json=args.json)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,794 @@
+"""
+Scan Sources Module
+Sources of installed programs for the program scanner (Steam, registry, shortcuts,
+desktop entries, Flatpak, Snap, Lutris, Heroic, ROM folders) plus the shared
+incremental directory walker.
+
+Each source yields program dicts {'name', 'key', 'path', 'icon'} (+ 'target'); ProgramScanner
+runs all available sources at the same time, tags every result with the
+'source' that found it and merges them. refresh_program() re-reads a cached
+program through that source when its file changes.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import platform
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from concurrent.futures import wait, FIRST_COMPLETED
+from modules.app_record import normalize_name
+from modules.paths import get_paths
+from modules.icon_theme import IconThemeIndex
+from modules.desktop_entry import (
+    DesktopEntryError, ExecutableLookup, current_desktops, current_locales, read_application
+)
+from modules import steam_library
+from modules import win_registry
+from modules import exe_ranking
+from modules.lnk_parser import ShortcutResolver
+
+IS_WINDOWS = platform.system() == "Windows"
+
+# Thread usati per percorrere le cartelle in parallelo
+MAX_SCAN_WORKERS = min(8, (os.cpu_count() or 4) * 2)
+
+# Tempo massimo per sorgente (secondi): oltre, la sorgente si ferma con quanto ha trovato
+SOURCE_TIMEOUT = 120
+
+# Cartelle che non contengono mai collegamenti a programmi utili
+PRUNED_DIRS = frozenset({
+    '$recycle.bin', 'windowsapps', 'common files', 'microsoft.net', 'reference assemblies',
+    'windows defender', 'windows defender advanced threat protection', 'windows mail',
+    'windows media player', 'windows nt', 'windows photo viewer', 'windows portable devices',
+    'windows security', 'windowspowershell', 'installshield installation information',
+    'package cache', 'msbuild', '_commonredist', 'redist', 'vcredist', 'directx', 'dotnet',
+    'node_modules', '__pycache__', '.git', 'locales', 'locale', 'translations',
+    'logs', 'temp', 'tmp', 'cache',
+})
+
+
+class ScanCancelled(Exception):
+    """Scansione annullata o sorgente oltre il tempo massimo"""
+
+
+class ScanFingerprints:
+    """Impronte dell'ultima scansione, salvate nella cache dir.
+    dirs:  cartella + estensioni cercate (dir_key) -> [mtime_ns, sottocartelle, file con quelle estensioni]
+    files: file -> [mtime_ns, size, programma o None]
+    keys:  chiave Uninstall -> [ultima scrittura, programma o None]
+    profiles: cartella d'installazione -> [mtime_ns, profilo degli exe (vedi exe_ranking)]
+    VERSION va incrementato quando cambia il modo in cui un file diventa un programma"""
+    VERSION = 9
+
+    def __init__(self, dirs=None, files=None, keys=None, profiles=None):
+        self.dirs = dirs if dirs is not None else {}
+        self.files = files if files is not None else {}
+        self.keys = keys if keys is not None else {}
+        self.profiles = profiles if profiles is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != cls.VERSION:
+                return cls()
+            return cls(data['dirs'], data['files'], data['keys'], data['profiles'])
+        except (OSError, ValueError, KeyError, AttributeError):
+            return cls()
+
+    def copy(self):
+        return ScanFingerprints(dict(self.dirs), dict(self.files), dict(self.keys), dict(self.profiles))
+
+    def merge(self, other):
+        """Unisce le impronte raccolte da un'altra sorgente"""
+        self.dirs.update(other.dirs)
+        self.files.update(other.files)
+        self.keys.update(other.keys)
+        self.profiles.update(other.profiles)
+
+    def save(self, path):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'dirs': self.dirs, 'files': self.files,
+                           'keys': self.keys, 'profiles': self.profiles}, f)
+        except OSError as e:
+            print(f"⚠️ Error saving scanner fingerprints: {e}")
+
+
+def _check(stop):
+    if stop is not None and stop():
+        raise ScanCancelled()
+
+
+def dir_key(path, suffixes):
+    """Chiave di una cartella nelle impronte: l'elenco salvato vale solo per le stesse estensioni
+    (estensioni cambiate in rom_folders.json, due voci sulla stessa cartella)"""
+    return path + '|' + ','.join(sorted(suffixes))
+
+
+def _scan_dir(path, suffixes, on_file, prune, old, stop=None):
+    """Elenca una cartella usando le impronte precedenti dove possibile.
+    Se l'mtime della cartella non è cambiato riusa l'elenco salvato; un file viene
+    ri-analizzato con on_file solo se il suo mtime/size è cambiato (le modifiche
+    sul posto non cambiano l'mtime della cartella, quindi lo stat si fa sempre).
+    `stop()` viene controllato prima di ogni file da analizzare: se è vero la cartella resta
+    a metà e mtime è None (i file già analizzati valgono comunque come punto di ripresa).
+    Restituisce (dir_key, mtime, sottocartelle, {file: [mtime, size, programma]})"""
+    _check(stop)
+    try:
+        dir_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    key = dir_key(path, suffixes)
+    cached = old.dirs.get(key)
+    unchanged = cached is not None and cached[0] == dir_mtime
+    if unchanged:
+        subdirs, listing = cached[1], [(f, None) for f in cached[2]]
+    else:
+        subdirs, listing = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in prune:
+                                subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(suffixes):
+                            listing.append((entry.path, entry))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        subdirs.sort()
+        listing.sort(key=lambda item: item[0])
+
+    files = {}
+    for file_path, entry in listing:
+        previous = old.files.get(file_path)
+        try:
+            st = entry.stat() if entry is not None else os.stat(file_path)
+        except OSError:
+            continue
+        if previous is not None and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+            files[file_path] = previous
+        else:
+            if stop is not None and stop():
+                return key, None, [], files
+            files[file_path] = [st.st_mtime_ns, st.st_size, on_file(file_path)]
+    return key, dir_mtime, subdirs, files
+
+
+def _record_dir(new, result):
+    """Salva nelle nuove impronte il risultato di _scan_dir e restituisce le sottocartelle.
+    Di una cartella lasciata a metà si salvano solo i file (ScanCancelled)"""
+    key, dir_mtime, subdirs, files = result
+    new.files.update(files)
+    if dir_mtime is None:
+        raise ScanCancelled()
+    new.dirs[key] = [dir_mtime, subdirs, list(files)]
+    return subdirs
+
+
+def walk_tree(root, suffixes, on_file, old, new, prune=PRUNED_DIRS, stop=None):
+    """Percorre un albero nel thread corrente. Restituisce i programmi trovati in ordine.
+    Le cartelle completate restano in `new` anche se la scansione viene fermata"""
+    programs = []
+    pending = [root]
+    while pending:
+        result = _scan_dir(pending.pop(), suffixes, on_file, prune, old, stop)
+        if result is None:
+            continue
+        pending.extend(reversed(_record_dir(new, result)))
+        programs.extend(entry[2] for entry in result[3].values() if entry[2])
+    return programs
+
+
+def scan_folder(path, suffixes, on_file, old, new, stop=None):
+    """Come walk_tree ma senza scendere nelle sottocartelle"""
+    result = _scan_dir(path, suffixes, on_file, frozenset(), old, stop)
+    if result is None:
+        return []
+    _record_dir(new, result)
+    return [entry[2] for entry in result[3].values() if entry[2]]
+
+
+def parallel_walk(roots, suffixes, on_file, pool, old, new, prune=PRUNED_DIRS, stop=None):
+    """Percorre più alberi in parallelo: ogni cartella è un task del pool.
+    on_file gira nei thread del pool; le impronte vengono unite qui, in un solo thread.
+    Generatore: restituisce i programmi man mano che le cartelle vengono completate.
+    Se `stop()` diventa vero le cartelle non iniziate vengono annullate, i file già
+    analizzati restano in `new` e si solleva ScanCancelled"""
+    pending = {pool.submit(_scan_dir, root, suffixes, on_file, prune, old, stop)
+               for root in roots if os.path.isdir(root)}
+    stopped = False
+    try:
+        while pending and not stopped:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Prima si registrano tutte le cartelle completate, poi si restituiscono i programmi:
+            # se chi consuma il generatore si ferma, le impronte sono già salvate
+            found = []
+            for future in done:
+                try:
+                    result = future.result()
+                    if result is None:
+                        continue
+                    subdirs = _record_dir(new, result)
+                except ScanCancelled:
+                    stopped = True
+                    continue
+                if not stopped:
+                    for subdir in subdirs:
+                        pending.add(pool.submit(_scan_dir, subdir, suffixes, on_file, prune, old, stop))
+                found.extend(entry[2] for entry in result[3].values() if entry[2])
+            yield from found
+    finally:
+        # Fermato (o generatore chiuso): le cartelle non iniziate non servono più,
+        # di quelle in corso si salvano i file già analizzati
+        for future in pending:
+            future.cancel()
+        for future in pending:
+            if future.cancelled():
+                continue
+            try:
+                result = future.result()
+            except ScanCancelled:
+                continue
+            if result is not None:
+                new.files.update(result[3])
+    if stopped:
+        raise ScanCancelled()
+
+
+def uri_command(uri):
+    """Comando shell che apre un URI (steam://, heroic://, ...) con il programma registrato"""
+    if IS_WINDOWS:
+        return f'start "" "{uri}"'
+    return f'xdg-open "{uri}"'
+
+
+def make_program(name, path, icon='', target=None, alternates=None):
+    """`target` è il file da cui dipende il programma (manifest, ROM, .desktop) quando `path`
+    è un comando e non un eseguibile: la cache del dialog lo controlla per sapere se è ancora valido.
+    `alternates` sono altri exe candidati (dal più probabile), proposti nel dialog di scansione"""
+    program = {'name': name, 'key': normalize_name(name), 'path': path, 'icon': icon or ''}
+    if target:
+        program['target'] = target
+    if alternates:
+        program['alternates'] = list(alternates)
+    return program
+
+
+class DesktopReader:
+    """Legge i file .desktop: tabella del PATH, locale, desktop correnti e indice dei temi
+    di icone caricati una volta (al primo uso) e condivisi tra i thread"""
+
+    def __init__(self):
+        self.executables = ExecutableLookup()
+        self.locales = current_locales()
+        self.desktops = current_desktops()
+        self._icons = None
+        self._icon_lock = threading.Lock()
+
+    def _icon_index(self):
+        with self._icon_lock:
+            if self._icons is None:
+                self._icons = IconThemeIndex.load(get_paths().icon_index_file)
+            return self._icons
+
+    def find_icon(self, icon_name):
+        """Percorso dell'icona di Icon= (assoluto, senza estensione o nome del tema), None se non c'è"""
+        if not icon_name:
+            return None
+        if os.path.isabs(icon_name):
+            if os.path.exists(icon_name):
+                return icon_name
+            return next((icon_name + ext for ext in ('.png', '.svg', '.xpm') if os.path.exists(icon_name + ext)),
+                        None)
+        return self._icon_index().lookup(icon_name)
+
+    def parse(self, filepath):
+        """Programma da un file .desktop, None se non è un'applicazione da mostrare"""
+        try:
+            app = read_application(filepath, self.executables, self.locales, self.desktops)
+        except (OSError, DesktopEntryError) as e:
+            print(f"Error reading {filepath}: {e}")
+            return None
+        if app is None:
+            return None
+        icon_path = self.find_icon(app['icon']) if app['icon'] else None
+        return make_program(app['name'], app['command'], icon_path or app['executable'], filepath)
+
+
+class SourceContext:
+    """Cosa riceve una sorgente: lo scanner (per i suoi helper), il pool di thread
+    condiviso e le impronte della scansione precedente. Le nuove impronte della
+    sorgente vanno in `new` e vengono unite dallo scanner a fine sorgente, anche se
+    la sorgente viene fermata: sono il punto da cui riparte la scansione successiva.
+    Le sorgenti passano `should_stop` ai walker e chiamano `check()` nei loro cicli"""
+
+    def __init__(self, scanner, pool, old, cancel=None, timeout=None):
+        self.scanner = scanner
+        self.pool = pool
+        self.old = old
+        self.new = ScanFingerprints()
+        self.timings = {}  # fase -> secondi (sommati tra i thread)
+        self._timings_lock = threading.Lock()
+        self.cancel = cancel if cancel is not None else threading.Event()
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.timed_out = False
+
+    def should_stop(self):
+        """Vero se la scansione è stata annullata o la sorgente ha superato il tempo massimo"""
+        if self.cancel.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.timed_out = True
+            return True
+        return False
+
+    def check(self):
+        _check(self.should_stop)
+
+    @contextmanager
+    def phase(self, name):
+        """Misura una fase della sorgente: with ctx.phase('enumerate'): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._timings_lock:
+                self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+
+class ScanSource:
+    """Sorgente di programmi. A parità di nome vince la sorgente con priority più bassa"""
+    name = ''
+    priority = 50
+    platforms = ('Windows', 'Linux')
+    timeout = SOURCE_TIMEOUT
+
+    def available(self):
+        return platform.system() in self.platforms
+
+    def scan(self, ctx):
+        """Generatore di programmi. Gira in un thread dedicato alla sorgente"""
+        raise NotImplementedError
+
+    def refresh(self, program):
+        """Rilegge un programma trovato da questa sorgente il cui file è cambiato.
+        None se non è più valido. Chiamata dai thread di CacheValidator"""
+        return program
+
+
+SOURCES = {}
+
+
+def register_source(source):
+    """Registra una sorgente (istanza di ScanSource) con il suo nome"""
+    SOURCES[source.name] = source
+    return source
+
+
+def refresh_program(program):
+    """Programma del cache riletto dalla sorgente che l'ha trovato (None se non è più valido).
+    Le voci dei cache precedenti a 'source' si rileggono solo se sono file .desktop"""
+    name = program.get('source')
+    if name is None and program.get('target', '').endswith('.desktop'):
+        name = 'desktop'
+    source = SOURCES.get(name)
+    if source is None:
+        return program
+    fresh = source.refresh(program)
+    if fresh is not None:
+        fresh['source'] = name
+    return fresh
+
+
+def get_sources(names=None):
+    """Sorgenti disponibili su questo sistema (tutte o solo quelle in `names`), per priorità"""
+    if names is None:
+        selected = SOURCES.values()
+    else:
+        unknown = [n for n in names if n not in SOURCES]
+        if unknown:
+            raise ValueError(f"unknown scan source(s): {', '.join(unknown)}")
+        selected = [SOURCES[n] for n in names]
+    return sorted((s for s in selected if s.available()), key=lambda s: (s.priority, s.name))
+
+
+class RegistrySource(ScanSource):
+    """Voci Uninstall del registro di Windows. Le tre chiavi vengono lette in parallelo;
+    il backend è sostituibile (win_registry.FakeRegistry) per provarla anche su Linux"""
+    name = 'registry'
+    priority = 10
+    platforms = ('Windows',)
+
+    def __init__(self, backend=None, name=None):
+        self.backend = backend
+        if name:
+            self.name = name
+
+    def available(self):
+        return self.backend is not None or super().available()
+
+    def _find_exe(self, ctx, fingerprints, directory, app_name):
+        """Exe utilizzabili di una cartella, dal migliore (exe_ranking). Il profilo della cartella
+        si rilegge solo se la cartella è cambiata; la classifica per il nome dell'app costa poco"""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        cached = fingerprints.profiles.get(directory) or ctx.old.profiles.get(directory)
+        if cached is not None and cached[0] == mtime:
+            profile = cached[1]
+        else:
+            # Fase inclusa in 'resolve', misurata a parte perché è la più costosa
+            with ctx.phase('profile exes'):
+                try:
+                    profile = exe_ranking.directory_profile(directory)
+                except OSError:
+                    return []
+        fingerprints.profiles[directory] = [mtime, profile]
+        return exe_ranking.usable_executables(exe_ranking.rank_profile(directory, profile, app_name))
+
+    def _read_hive(self, ctx, backend, hive, path):
+        """Legge una chiave Uninstall. Gira in un thread del pool.
+        Restituisce (programmi, impronte)"""
+        fingerprints = ScanFingerprints()
+        programs = []
+        with ctx.phase('enumerate'):
+            key = backend.open(hive, path)
+            if key is None:
+                return programs, fingerprints
+            subkey_names = backend.subkeys(key)
+        try:
+            for subkey_name in subkey_names:
+                ctx.check()
+                state_key = f"{hive}\\{path}\\{subkey_name}"
+                with ctx.phase('read values'):
+                    subkey = backend.open_subkey(key, subkey_name)
+                    if subkey is None:
+                        continue
+                    try:
+                        # Ultima scrittura della chiave: se non è cambiata riusa il risultato
+                        stamp = backend.last_write(subkey)
+                        cached = ctx.old.keys.get(state_key)
+                        values = None if cached is not None and cached[0] == stamp else backend.values(subkey)
+                    finally:
+                        backend.close(subkey)
+
+                if values is None:
+                    program = cached[1]
+                    if program and not os.path.exists(program['path']):
+                        program = None
+                else:
+                    with ctx.phase('resolve'):
+                        found = win_registry.program_from_values(
+                            values, lambda d, n: self._find_exe(ctx, fingerprints, d, n))
+                    program = make_program(found['name'], found['path'], found['icon'],
+                                           alternates=found['alternates']) if found else None
+                fingerprints.keys[state_key] = [stamp, program]
+                if program:
+                    programs.append(program)
+        except ScanCancelled:
+            # Le chiavi già lette restano nelle impronte; scan() poi solleva di nuovo
+            pass
+        finally:
+            backend.close(key)
+        return programs, fingerprints
+
+    def refresh(self, program):
+        """L'exe è cambiato (aggiornamento): si riclassificano gli exe della sua cartella"""
+        directory = os.path.dirname(program['path'])
+        try:
+            ranked = exe_ranking.rank_profile(directory, exe_ranking.directory_profile(directory), program['name'])
+        except OSError:
+            return None
+        candidates = exe_ranking.usable_executables(ranked)
+        if program['path'] in candidates:
+            # L'exe scelto (anche a mano nel dialog) resta quello del programma
+            candidates.remove(program['path'])
+            candidates.insert(0, program['path'])
+        if not candidates:
+            return None
+        icon = program['icon']
+        if icon == program['path'] or not os.path.exists(icon):
+            icon = candidates[0]
+        return make_program(program['name'], candidates[0], icon, alternates=candidates[1:])
+
+    def scan(self, ctx):
+        backend = self.backend or win_registry.default_backend()
+        hives = win_registry.UNINSTALL_KEYS
+        # Risultati nell'ordine delle chiavi: a parità di nome vince sempre la stessa voce
+        for programs, fingerprints in ctx.pool.map(lambda h: self._read_hive(ctx, backend, *h), hives):
+            ctx.new.merge(fingerprints)
+            yield from programs
+        ctx.check()
+        # I profili delle cartelle di chiavi non rilette restano validi finché la cartella esiste
+        # (vengono comunque ricontrollati con l'mtime quando servono)
+        for directory, entry in ctx.old.profiles.items():
+            if directory not in ctx.new.profiles and os.path.isdir(directory):
+                ctx.new.profiles[directory] = entry
+
+
+class ShortcutSource(ScanSource):
+    """Collegamenti .lnk nel menu Start, sul desktop e in Program Files"""
+    name = 'shortcuts'
+    priority = 20
+    platforms = ('Windows',)
+
+    def directories(self):
+        return [p for p in [
+            os.path.join(os.environ.get('PROGRAMDATA', ''), 'Microsoft', 'Windows', 'Start Menu', 'Programs'),
+            os.path.join(os.environ.get('APPDATA', ''), 'Microsoft', 'Windows', 'Start Menu', 'Programs'),
+            os.path.join(os.environ.get("USERPROFILE", ""), "Desktop"),
+            os.path.join(os.environ.get("PUBLIC", "C:\\Users\\Public"), "Desktop"),
+            os.environ.get("ProgramFiles"),
+            os.environ.get("ProgramFiles(x86)")
+        ] if p]
+
+    def _program(self, resolver, shortcut_path):
+        """Programma da un .lnk (o None). Gira nei thread del pool"""
+        info = resolver.resolve(shortcut_path)
+        if info is None:
+            return None
+        target = info['target']
+        if not target.lower().endswith('.exe') or not os.path.exists(target):
+            return None
+        icon = info['icon']
+        if not (icon.lower().endswith(('.exe', '.ico')) and os.path.exists(icon)):
+            icon = target
+        program = make_program(Path(shortcut_path).stem, target, icon)
+        program['shortcut'] = shortcut_path
+        return program
+
+    def refresh(self, program):
+        """L'exe è cambiato: si rilegge il collegamento (può puntare altrove), se si sa quale"""
+        shortcut = program.get('shortcut')
+        if shortcut and os.path.exists(shortcut):
+            return self._program(ShortcutResolver(), shortcut)
+        return program if os.path.exists(program['path']) else None
+
+    def scan(self, ctx):
+        resolver = ShortcutResolver()
+        for program in parallel_walk(self.directories(), ('.lnk',), lambda p: self._program(resolver, p),
+                                     ctx.pool, ctx.old, ctx.new, stop=ctx.should_stop):
+            # Un collegamento salvato può puntare a un exe ormai disinstallato
+            if os.path.exists(program['path']):
+                yield program
+        stats = resolver.stats
+        print(f"🔗 Shortcuts: {stats['parsed']} parsed, {stats['com']} via COM, {stats['failed']} unresolved")
+
+
+class SteamSource(ScanSource):
+    """Giochi installati in tutte le librerie di Steam (appmanifest_*.acf).
+    Avviati con steam://rungameid/<id>: l'app ID serve anche per le copertine.
+    Ha la priorità più alta: gli stessi giochi compaiono anche nel registro e nei collegamenti"""
+    name = 'steam'
+    priority = 0
+
+    def refresh(self, program):
+        """Il manifest è cambiato: gioco disinstallato, rinominato o aggiornato"""
+        game = steam_library.read_app_manifest(program['target'])
+        if game is None:
+            return None
+        icon = program['icon'] if program['icon'] and os.path.exists(program['icon']) else ''
+        fresh = make_program(game['name'], uri_command(f"steam://rungameid/{game['appid']}"), icon, game['manifest'])
+        fresh['steam_appid'] = game['appid']
+        return fresh
+
+    def scan(self, ctx):
+        libraries = [(root, folder) for root in steam_library.find_steam_roots()
+                     for folder in steam_library.library_folders(root)]
+
+        def read_library(library):
+            fingerprints = ScanFingerprints()
+            try:
+                games = scan_folder(library[1], ('.acf',), steam_library.read_app_manifest, ctx.old, fingerprints,
+                                    stop=ctx.should_stop)
+            except ScanCancelled:
+                games = []
+            return library[0], games, fingerprints
+
+        for root, games, fingerprints in ctx.pool.map(read_library, libraries):
+            ctx.new.merge(fingerprints)
+            for game in games:
+                program = make_program(game['name'], uri_command(f"steam://rungameid/{game['appid']}"),
+                                       steam_library.library_image(root, game['appid']), game['manifest'])
+                program['steam_appid'] = game['appid']
+                yield program
+        ctx.check()
+
+
+class DesktopEntrySource(ScanSource):
+    """File .desktop in una lista di cartelle (lette in parallelo, unite nell'ordine delle cartelle)"""
+    platforms = ('Linux',)
+
+    _refresh_reader = None
+    _refresh_lock = threading.Lock()
+
+    def __init__(self, name, directories, priority):
+        self.name = name
+        self.directories = directories
+        self.priority = priority
+
+    def refresh(self, program):
+        # Un solo DesktopReader per tutte le rilette (il PATH si legge una volta)
+        with DesktopEntrySource._refresh_lock:
+            if DesktopEntrySource._refresh_reader is None:
+                DesktopEntrySource._refresh_reader = DesktopReader()
+        return DesktopEntrySource._refresh_reader.parse(program['target'])
+
+    def scan(self, ctx):
+        def collect(desktop_dir):
+            fingerprints = ScanFingerprints()
+            try:
+                found = walk_tree(desktop_dir, ('.desktop',), ctx.scanner.desktop_reader.parse,
+                                  ctx.old, fingerprints, prune=frozenset(), stop=ctx.should_stop)
+            except ScanCancelled:
+                # Le cartelle completate restano nelle impronte
+                found = []
+            return found, fingerprints
+
+        existing_dirs = [d for d in map(os.path.expanduser, self.directories) if os.path.isdir(d)]
+        for found, fingerprints in ctx.pool.map(collect, existing_dirs):
+            ctx.new.merge(fingerprints)
+            yield from found
+        ctx.check()
+
+
+class LutrisSource(ScanSource):
+    """Giochi installati in Lutris (database pgames.db)"""
+    name = 'lutris'
+    priority = 40
+    platforms = ('Linux',)
+
+    DATA_DIRS = ["~/.local/share/lutris", "~/.var/app/net.lutris.Lutris/data/lutris"]
+
+    def _icon(self, data_dir, slug):
+        candidates = [
+            os.path.join(data_dir, 'coverart', f'{slug}.jpg'),
+            os.path.join(data_dir, 'banners', f'{slug}.jpg'),
+            os.path.expanduser(f'~/.local/share/icons/hicolor/128x128/apps/lutris_{slug}.png'),
+        ]
+        return next((c for c in candidates if os.path.exists(c)), '')
+
+    def scan(self, ctx):
+        for data_dir in map(os.path.expanduser, self.DATA_DIRS):
+            db_path = os.path.join(data_dir, 'pgames.db')
+            if not os.path.exists(db_path):
+                continue
+            try:
+                # Sola lettura: Lutris potrebbe essere aperto
+                db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+                try:
+                    rows = db.execute("SELECT id, name, slug FROM games WHERE installed = 1").fetchall()
+                finally:
+                    db.close()
+            except sqlite3.Error as e:
+                print(f"⚠️ Error reading Lutris database {db_path}: {e}")
+                continue
+            for game_id, name, slug in rows:
+                if name:
+                    yield make_program(name, f"lutris lutris:rungameid/{game_id}", self._icon(data_dir, slug))
+
+
+class HeroicSource(ScanSource):
+    """Giochi Epic (Legendary) e GOG installati con Heroic Games Launcher"""
+    name = 'heroic'
+    priority = 40
+
+    def config_dirs(self):
+        if IS_WINDOWS:
+            return [os.path.join(os.environ.get('APPDATA', ''), 'heroic')]
+        return [os.path.expanduser("~/.config/heroic"),
+                os.path.expanduser("~/.var/app/com.heroicgameslauncher.hgl/config/heroic")]
+
+    def _read_json(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def scan(self, ctx):
+        for config_dir in self.config_dirs():
+            legendary = self._read_json(os.path.join(config_dir, 'legendaryConfig', 'legendary', 'installed.json'))
+            if isinstance(legendary, dict):
+                for app_name, game in legendary.items():
+                    if not isinstance(game, dict) or not game.get('title'):
+                        continue
+                    exe = os.path.join(game.get('install_path', ''), game.get('executable', ''))
+                    yield make_program(game['title'], uri_command(f"heroic://launch/legendary/{app_name}"),
+                                       exe if exe.lower().endswith('.exe') and os.path.exists(exe) else '')
+
+            installed = self._read_json(os.path.join(config_dir, 'gog_store', 'installed.json'))
+            library = self._read_json(os.path.join(config_dir, 'gog_store', 'library.json'))
+            if isinstance(installed, dict):
+                titles = {}
+                if isinstance(library, dict):
+                    titles = {g.get('app_name'): g.get('title') for g in library.get('games', []) if isinstance(g, dict)}
+                for game in installed.get('installed', []):
+                    app_name = game.get('appName') if isinstance(game, dict) else None
+                    if app_name and titles.get(app_name):
+                        yield make_program(titles[app_name], uri_command(f"heroic://launch/gog/{app_name}"))
+
+
+class RomFolderSource(ScanSource):
+    """ROM in cartelle configurate in rom_folders.json (nella data dir), ad esempio:
+    [{"folder": "~/ROMs/snes", "extensions": [".sfc", ".smc"],
+      "command": "retroarch -L ~/cores/snes9x_libretro.so \"{rom}\""}]"""
+    name = 'roms'
+    priority = 50
+
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+    # "Super Mario World (USA) [!]" -> "Super Mario World"
+    TAGS = re.compile(r'\s*[\(\[][^\)\]]*[\)\]]')
+
+    def load_folders(self):
+        config_file = get_paths().rom_folders_file
+        if not config_file.exists():
+            return []
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                folders = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Error reading {config_file}: {e}")
+            return []
+        valid = []
+        for entry in folders if isinstance(folders, list) else []:
+            if isinstance(entry, dict) and entry.get('folder') and entry.get('extensions') and entry.get('command'):
+                valid.append(entry)
+            else:
+                print(f"⚠️ Skipping invalid ROM folder entry: {entry!r}")
+        return valid
+
+    def _rom_name(self, rom_path):
+        """Nome del gioco dal nome file (salvato nelle impronte: il comando può cambiare)"""
+        name = self.TAGS.sub('', Path(rom_path).stem).strip()
+        return {'name': name, 'rom': rom_path} if name else None
+
+    def _icon(self, rom_path):
+        base = os.path.splitext(rom_path)[0]
+        return next((base + ext for ext in self.IMAGE_EXTENSIONS if os.path.exists(base + ext)), '')
+
+    def refresh(self, program):
+        """La ROM è cambiata: nome e immagine si ricavano di nuovo dal file, il comando resta"""
+        rom = self._rom_name(program['target'])
+        if rom is None:
+            return None
+        return make_program(rom['name'], program['path'], self._icon(rom['rom']), rom['rom'])
+
+    def scan(self, ctx):
+        for entry in self.load_folders():
+            suffixes = tuple(e.lower() for e in entry['extensions'])
+            folder = os.path.expanduser(entry['folder'])
+            for rom in parallel_walk([folder], suffixes, self._rom_name, ctx.pool, ctx.old, ctx.new,
+                                     prune=frozenset(), stop=ctx.should_stop):
+                command = entry['command'].replace('{rom}', rom['rom'])
+                yield make_program(rom['name'], command, self._icon(rom['rom']), rom['rom'])
+
+
+register_source(SteamSource())
+register_source(RegistrySource())
+register_source(ShortcutSource())
+register_source(DesktopEntrySource('desktop', [
+    "/usr/share/applications",
+    "/usr/local/share/applications",
+    "~/.local/share/applications",
+], priority=10))
+register_source(DesktopEntrySource('snap', ["/var/lib/snapd/desktop/applications"], priority=20))
+register_source(DesktopEntrySource('flatpak', [
+    "/var/lib/flatpak/exports/share/applications",
+    "~/.local/share/flatpak/exports/share/applications",
+], priority=30))
+register_source(LutrisSource())
+register_source(HeroicSource())
+register_source(RomFolderSource())
@@ -0,0 +1,163 @@
+"""
+Scanner Cache Module
+Versioned cache of the scan dialog list. Each entry stores a fingerprint
+(mtime/size) of the file it depends on; after the cached list is shown,
+CacheValidator re-checks the fingerprints in the background, drops programs
+whose file is gone and refreshes the ones whose file changed.
+"""
+
+import os
+import json
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QThread, pyqtSignal
+from modules.app_record import normalize_name
+
+# Versione del formato del cache
+#   1 = lista nuda di programmi (formato storico, senza impronte)
+#   2 = {"version", "programs"} con 'fingerprint' per ogni programma
+CACHE_VERSION = 2
+
+VALIDATION_WORKERS = 8
+
+
+def entry_target(program):
+    """File da cui dipende il programma: 'target' se c'è, altrimenti il percorso se è assoluto
+    (anche senza estensione: /usr/bin/foo, AppImage). None per i comandi (steam://, lutris ...)"""
+    target = program.get('target')
+    if target:
+        return target
+    path = program.get('path', '')
+    if not os.path.isabs(path):
+        return None
+    if ' ' in path and not os.path.exists(path):
+        # Comando con argomenti ("/opt/app/app --no-sandbox"): conta l'eseguibile
+        try:
+            first = shlex.split(path)[0]
+        except (ValueError, IndexError):
+            return path
+        if os.path.isabs(first):
+            return first
+    return path
+
+
+def fingerprint(program):
+    """[mtime_ns, size] del file del programma; None se il programma non ha un file
+    (comandi come steam:// o lutris:), False se il file non esiste più"""
+    target = entry_target(program)
+    if target is None:
+        return None
+    try:
+        st = os.stat(target)
+    except OSError:
+        return False
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_cache(cache_file):
+    """Programmi salvati (con 'key' ricalcolata), [] se il cache manca o non è leggibile.
+    Le voci del formato storico non hanno impronta: le completa la prima validazione.
+    Una chiave compare una volta sola (vale la prima voce): nomi che si normalizzano
+    allo stesso modo, es. da un cache scritto a mano, romperebbero il modello"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Error loading cache: {e}")
+        return []
+
+    if isinstance(data, list):
+        programs = data
+    elif isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+        programs = data.get('programs', [])
+    else:
+        print("⚠️ Ignoring scanner cache with unknown format")
+        return []
+
+    valid = {}
+    duplicates = 0
+    for program in programs:
+        if isinstance(program, dict) and isinstance(program.get('name'), str) and isinstance(program.get('path'), str):
+            # Chiave normalizzata calcolata una sola volta al caricamento
+            program['key'] = normalize_name(program['name'])
+            if program['key'] in valid:
+                duplicates += 1
+                continue
+            valid[program['key']] = program
+    if duplicates:
+        print(f"⚠️ Skipped {duplicates} duplicate programs in scanner cache")
+    return list(valid.values())
+
+
+def save_cache(cache_file, programs):
+    """Salva i programmi (senza 'key', che si ricalcola) in JSON compatto"""
+    entries = []
+    for program in programs:
+        entry = dict(program)
+        entry.pop('key', None)
+        entries.append(entry)
+    try:
+        tmp = cache_file.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'programs': entries}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, cache_file)
+        return True
+    except OSError as e:
+        print(f"⚠️ Error saving cache: {e}")
+        return False
+
+
+class CacheValidator(QThread):
+    """Controlla le impronte dei programmi mostrati dal cache.
+    validated(chiavi da togliere, programmi da aggiornare). `refresh(programma)` rilegge un
+    programma il cui file è cambiato (None se non è più valido)"""
+    validated = pyqtSignal(list, list)
+
+    def __init__(self, programs, refresh=None, parent=None):
+        super().__init__(parent)
+        self.programs = programs
+        self.refresh = refresh
+
+    def stop(self):
+        if self.isRunning():
+            self.requestInterruption()
+            self.wait()
+
+    def _check(self, program):
+        """(chiave da togliere o None, programma aggiornato o None)"""
+        if self.isInterruptionRequested():
+            return None, None
+        current = fingerprint(program)
+        if current is False:
+            return program['key'], None
+        stored = program.get('fingerprint')
+        if current == stored:
+            return None, None
+        fresh = dict(program)
+        # Senza impronta salvata (cache storico) si registra solo quella attuale
+        if 'fingerprint' in program and self.refresh is not None:
+            fresh = self.refresh(fresh)
+            if fresh is None:
+                return program['key'], None
+        fresh['fingerprint'] = current
+        return None, fresh
+
+    def run(self):
+        removed, changed = [], []
+        with ThreadPoolExecutor(max_workers=VALIDATION_WORKERS, thread_name_prefix="cache-check") as pool:
+            for program, (gone, fresh) in zip(self.programs, pool.map(self._check, self.programs)):
+                if gone is not None:
+                    removed.append(gone)
+                if fresh is not None:
+                    if fresh['key'] != program['key']:
+                        # Il nome è cambiato: la vecchia voce sparisce, la nuova si aggiunge
+                        removed.append(program['key'])
+                    changed.append(fresh)
+        if self.isInterruptionRequested():
+            return
+        if removed or changed:
+            print(f"🔎 Cache check: {len(removed)} removed, {len(changed)} refreshed")
+        self.validated.emit(removed, changed)
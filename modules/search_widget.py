@@ -1,5 +1,6 @@
 import os
 import platform
+from modules.app_record import normalize_name
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QListWidget, QListWidgetItem, QGraphicsDropShadowEffect, QPushButton
@@ -36,6 +37,7 @@ class QuickSearchWidget(QWidget):
         super().__init__(parent)
         self.scaling = scaling
         self.apps = []  # Lista delle app da cercare
+        self.sorted_apps = []  # (indice, AppRecord) già ordinati per chiave normalizzata
         self.filtered_indices = []  # Indici delle app filtrate
         self.current_selection = 0
         self.is_typing_mode = True  # True = digita, False = naviga risultati
@@ -246,6 +248,8 @@ class QuickSearchWidget(QWidget):
     def set_apps(self, apps):
         """Imposta la lista di app da cercare"""
         self.apps = apps
+        # Ordina una volta sola: ad ogni tasto basta filtrare mantenendo l'ordine
+        self.sorted_apps = sorted(enumerate(apps), key=lambda item: item[1].key)
         self.update_results()
     
     def show_search(self):
@@ -322,29 +326,20 @@ class QuickSearchWidget(QWidget):
     
     def update_results(self):
         """Aggiorna la lista dei risultati in base alla ricerca"""
-        search_text = self.search_input.text().lower().strip()
+        search_text = normalize_name(self.search_input.text())
         
         self.results_list.clear()
         self.filtered_indices = []
 
-        temp_results = []  # (app_name, index, app_data)
-
+        # sorted_apps è già in ordine alfabetico (per chiave normalizzata)
         if not search_text:
-            # Mostra tutte le app
-            for i, app in enumerate(self.apps):
-                temp_results.append((app["name"], i, app))
+            temp_results = self.sorted_apps
         else:
-            # Filtra
-            for i, app in enumerate(self.apps):
-                app_name = app['name']
-                if search_text in app_name.lower():
-                    temp_results.append((app_name, i, app))
-
-        # Ordina alfabeticamente
-        temp_results.sort(key=lambda x: x[0].lower())
+            temp_results = [(i, app) for i, app in self.sorted_apps if search_text in app.key]
 
-        # Aggiungi alla QListWidget dopo l'ordinamento con icone
-        for name, original_index, app_data in temp_results:
+        # Aggiungi alla QListWidget con icone
+        for original_index, app_data in temp_results:
+            name = app_data.name
             item = QListWidgetItem(name)
             item.setData(Qt.ItemDataRole.UserRole, original_index)
             
@@ -352,8 +347,8 @@ class QuickSearchWidget(QWidget):
             icon_loaded = False
             
             # Usa il campo 'path' per estrarre l'icona dall'exe
-            if 'path' in app_data and app_data['path']:
-                exe_path = app_data['path']
+            if app_data.path:
+                exe_path = app_data.path
                 
                 # Pulisci il path da argomenti e virgolette
                 if exe_path.startswith('"'):
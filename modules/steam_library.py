@@ -0,0 +1,198 @@
+"""
+Steam Library Module
+Finds Steam installations and their library folders and reads the installed
+games from the appmanifest_*.acf files (Valve KeyValues / VDF text format)
+"""
+
+import os
+import re
+import platform
+
+IS_WINDOWS = platform.system() == "Windows"
+
+# Un token VDF: spazi, commento, stringa tra virgolette, graffa o parola senza virgolette
+_TOKEN = re.compile(r'\s+|//[^\n]*|"((?:[^"\\]|\\.)*)"|([{}])|([^\s{}"]+)')
+_ESCAPES = {'n': '\n', 't': '\t', '\\': '\\', '"': '"'}
+_ESCAPE = re.compile(r'\\(.)')
+
+# Ridistribuibili e runtime che Steam installa come "app" ma non sono giochi
+TOOL_APP_IDS = frozenset({
+    '228980',   # Steamworks Common Redistributables
+    '1070560',  # Steam Linux Runtime
+    '1391110',  # Steam Linux Runtime - Soldier
+    '1628350',  # Steam Linux Runtime - Sniper
+    '1493710',  # Proton Experimental
+    '2180100',  # Proton Hotfix
+})
+TOOL_NAME_PREFIXES = ('proton ', 'steam linux runtime', 'steamworks ')
+
+# Bit "installato completamente" di StateFlags nell'appmanifest
+STATE_FULLY_INSTALLED = 4
+
+_RUNGAMEID = re.compile(r'steam://rungameid/(\d+)')
+
+
+class VdfError(ValueError):
+    """Testo VDF non valido"""
+
+
+def _tokens(text):
+    """Genera (stringa, è_graffa) saltando spazi e commenti"""
+    for match in _TOKEN.finditer(text):
+        quoted, brace, bare = match.groups()
+        if brace:
+            yield brace, True
+        elif quoted is not None:
+            yield (_ESCAPE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), quoted)
+                   if '\\' in quoted else quoted), False
+        elif bare is not None:
+            yield bare, False
+
+
+def parse_vdf(text, wanted=None):
+    """Interpreta un testo VDF in dizionari annidati. Le chiavi sono in minuscolo
+    (Steam non è coerente: "LibraryFolders" / "libraryfolders").
+    Con `wanted` (insieme di chiavi in minuscolo) la lettura si ferma appena tutte le
+    chiavi richieste sono state trovate al secondo livello: per un appmanifest evita di
+    interpretare depot, configurazione utente ecc."""
+    root = {}
+    stack = [root]
+    key = None
+    missing = set(wanted) if wanted else None
+    for token, is_brace in _tokens(text):
+        if is_brace:
+            if token == '{':
+                if key is None:
+                    raise VdfError("'{' without a key")
+                child = {}
+                stack[-1][key] = child
+                stack.append(child)
+                key = None
+            else:
+                if len(stack) == 1:
+                    raise VdfError("unbalanced '}'")
+                stack.pop()
+        elif key is None:
+            key = token.lower()
+        else:
+            stack[-1][key] = token
+            if missing is not None and len(stack) == 2:
+                missing.discard(key)
+                if not missing:
+                    return root
+            key = None
+    if len(stack) != 1 and missing is None:
+        raise VdfError("unexpected end of file")
+    return root
+
+
+def read_vdf(path, wanted=None):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return parse_vdf(f.read(), wanted)
+
+
+def steam_app_id(path):
+    """App ID di Steam se il comando dell'app contiene steam://rungameid/<id>, altrimenti None"""
+    match = _RUNGAMEID.search(path or '')
+    return match.group(1) if match else None
+
+
+def _registry_steam_paths():
+    # Importato qui: chi usa solo steam_app_id (il launcher) non carica winreg
+    import winreg
+    paths = []
+    for hive, key_path, value in [
+        (winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam", "SteamPath"),
+        (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam", "InstallPath"),
+        (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Valve\Steam", "InstallPath"),
+    ]:
+        try:
+            with winreg.OpenKey(hive, key_path) as key:
+                paths.append(winreg.QueryValueEx(key, value)[0])
+        except OSError:
+            continue
+    return paths
+
+
+def find_steam_roots():
+    """Cartelle di installazione di Steam presenti (senza duplicati)"""
+    if IS_WINDOWS:
+        candidates = _registry_steam_paths() + [
+            os.path.join(os.environ.get('ProgramFiles(x86)', r'C:\Program Files (x86)'), 'Steam'),
+        ]
+    else:
+        candidates = [os.path.expanduser(p) for p in (
+            "~/.steam/steam",
+            "~/.steam/root",
+            "~/.local/share/Steam",
+            "~/.var/app/com.valvesoftware.Steam/.local/share/Steam",
+            "~/snap/steam/common/.local/share/Steam",
+        )]
+    return _unique_dirs((os.path.join(c, 'steamapps') for c in candidates), strip_steamapps=True)
+
+
+def _unique_dirs(steamapps_dirs, strip_steamapps=False):
+    seen = set()
+    found = []
+    for path in steamapps_dirs:
+        if not os.path.isdir(path):
+            continue
+        real = os.path.normcase(os.path.realpath(path))
+        if real in seen:
+            continue
+        seen.add(real)
+        found.append(os.path.dirname(path) if strip_steamapps else path)
+    return found
+
+
+def library_folders(steam_root):
+    """Cartelle steamapps di tutte le librerie di un'installazione di Steam (inclusa quella principale)"""
+    folders = [os.path.join(steam_root, 'steamapps')]
+    for vdf_path in (os.path.join(steam_root, 'steamapps', 'libraryfolders.vdf'),
+                     os.path.join(steam_root, 'config', 'libraryfolders.vdf')):
+        if not os.path.exists(vdf_path):
+            continue
+        try:
+            data = read_vdf(vdf_path).get('libraryfolders', {})
+        except (OSError, VdfError) as e:
+            print(f"⚠️ Error reading {vdf_path}: {e}")
+            continue
+        for entry in data.values():
+            # Formato nuovo: {"path": "..."}; formato vecchio: percorso diretto
+            path = entry.get('path') if isinstance(entry, dict) else entry
+            if isinstance(path, str) and path:
+                folders.append(os.path.join(path, 'steamapps'))
+        break
+    return _unique_dirs(folders)
+
+
+def read_app_manifest(path):
+    """Legge un appmanifest_*.acf. Restituisce {'appid', 'name', 'installdir', 'manifest'} per i giochi
+    installati, None per tool, installazioni incomplete o file non validi"""
+    try:
+        state = read_vdf(path, {'appid', 'name', 'stateflags', 'installdir'}).get('appstate', {})
+    except (OSError, VdfError) as e:
+        print(f"⚠️ Error reading {path}: {e}")
+        return None
+    appid, name = state.get('appid'), state.get('name')
+    if not appid or not name:
+        return None
+    if appid in TOOL_APP_IDS or name.lower().startswith(TOOL_NAME_PREFIXES):
+        return None
+    try:
+        if not int(state.get('stateflags', '0')) & STATE_FULLY_INSTALLED:
+            return None
+    except ValueError:
+        return None
+    return {'appid': appid, 'name': name, 'installdir': state.get('installdir', ''), 'manifest': str(path)}
+
+
+def library_image(steam_root, appid):
+    """Immagine 460x215 della cache di Steam per l'app, se presente"""
+    cache = os.path.join(steam_root, 'appcache', 'librarycache')
+    for candidate in (os.path.join(cache, f'{appid}_header.jpg'),
+                      os.path.join(cache, appid, 'header.jpg'),
+                      os.path.join(cache, f'{appid}_icon.jpg')):
+        if os.path.exists(candidate):
+            return candidate
+    return ''
@@ -0,0 +1,147 @@
+"""
+Windows Registry Module
+Reads the Uninstall keys through a small backend interface: WinregBackend uses
+the real registry, FakeRegistry serves the same data from a dictionary so the
+registry source can be exercised on Linux.
+"""
+
+import os
+import platform
+
+IS_WINDOWS = platform.system() == "Windows"
+
+if IS_WINDOWS:
+    import winreg
+
+UNINSTALL_KEYS = [
+    ("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKLM", r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+]
+
+
+class WinregBackend:
+    """Registro reale. Ogni chiave viene letta con una QueryInfoKey e una EnumValue per
+    valore, invece di una QueryValueEx per ogni valore cercato"""
+    HIVES = {'HKLM': 'HKEY_LOCAL_MACHINE', 'HKCU': 'HKEY_CURRENT_USER'}
+
+    def open(self, hive, path):
+        """Chiave aperta (da chiudere con close) o None se non esiste"""
+        try:
+            return winreg.OpenKey(getattr(winreg, self.HIVES[hive]), path)
+        except OSError:
+            return None
+
+    def subkeys(self, key):
+        """Nomi di tutte le sottochiavi"""
+        names = []
+        for i in range(winreg.QueryInfoKey(key)[0]):
+            try:
+                names.append(winreg.EnumKey(key, i))
+            except OSError:
+                break
+        return names
+
+    def open_subkey(self, key, name):
+        try:
+            return winreg.OpenKey(key, name)
+        except OSError:
+            return None
+
+    def last_write(self, key):
+        """Timestamp dell'ultima modifica (intervalli di 100 ns)"""
+        return winreg.QueryInfoKey(key)[2]
+
+    def values(self, key):
+        """Tutti i valori della chiave in un colpo: nome -> dato"""
+        values = {}
+        for i in range(winreg.QueryInfoKey(key)[1]):
+            try:
+                name, data, _ = winreg.EnumValue(key, i)
+            except OSError:
+                break
+            values[name] = data
+        return values
+
+    def close(self, key):
+        winreg.CloseKey(key)
+
+
+class FakeRegistry:
+    """Registro in memoria con la stessa interfaccia di WinregBackend:
+    {(hive, path): {nome_sottochiave: {'last_write': int, 'values': {...}}}}"""
+
+    def __init__(self, keys):
+        self.keys = keys
+
+    def open(self, hive, path):
+        subkeys = self.keys.get((hive, path))
+        return None if subkeys is None else ('key', subkeys)
+
+    def subkeys(self, key):
+        return list(key[1])
+
+    def open_subkey(self, key, name):
+        entry = key[1].get(name)
+        return None if entry is None else ('subkey', entry)
+
+    def last_write(self, key):
+        return key[1].get('last_write', 0)
+
+    def values(self, key):
+        return dict(key[1].get('values', {}))
+
+    def close(self, key):
+        pass
+
+
+def default_backend():
+    return WinregBackend() if IS_WINDOWS else None
+
+
+def _text(values, name):
+    value = values.get(name)
+    return value.strip() if isinstance(value, str) else ''
+
+
+def _icon_location(value):
+    """Percorso di un DisplayIcon ("C:\\app.exe",0 oppure C:\\app.exe,0) senza indice né virgolette"""
+    if value.startswith('"'):
+        return value[1:].split('"', 1)[0]
+    return value.split(',')[0].strip()
+
+
+def program_from_values(values, find_exe):
+    """Programma da una voce Uninstall (valori già letti), None se non porta a un exe.
+    find_exe(cartella, nome) restituisce gli exe utilizzabili di una cartella, dal migliore:
+    il primo diventa 'path', gli altri 'alternates'"""
+    name = _text(values, "DisplayName")
+    if not name:
+        return None
+
+    icon_path = _icon_location(_text(values, "DisplayIcon"))
+
+    candidates = []
+    install_location = _text(values, "InstallLocation").strip('"')
+    if install_location:
+        candidates = find_exe(install_location, name)
+
+    if not candidates:
+        uninstall = _text(values, "UninstallString")
+        if "unins" in uninstall.lower():
+            for part in uninstall.split('"'):
+                if part.lower().endswith('.exe'):
+                    candidates = find_exe(os.path.dirname(part), name)
+                    if candidates:
+                        break
+
+    candidates = [path for path in candidates if os.path.exists(path)]
+    if not candidates:
+        return None
+    exe_path = candidates[0]
+    return {
+        'name': name,
+        'path': exe_path,
+        'icon': icon_path if icon_path and os.path.exists(icon_path) else exe_path,
+        'alternates': candidates[1:],
+    }
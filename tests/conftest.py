@@ -0,0 +1,9 @@
+import os
+import sys
+
+# I test importano i moduli come fa il launcher: `from modules import ...` dalla cartella del progetto
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
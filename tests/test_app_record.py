@@ -0,0 +1,55 @@
+"""Schema di launcher_apps.json: AppRecord, migrazioni, validazione e salvataggio"""
+
+import json
+
+import pytest
+
+from modules.app_record import CONFIG_VERSION, AppRecord, ConfigError, load_config_file, save_config_file
+
+
+def test_records_hash_like_they_compare():
+    a = AppRecord('Pokémon X', 'C:\\Games\\x.exe', 'a.png')
+    b = AppRecord('Pokémon X', 'C:\\Games\\x.exe', 'a.png')
+    assert a == b and hash(a) == hash(b)
+    assert len({a, b, a.copy()}) == 1
+
+    b.icon = 'b.png'
+    assert a != b
+    assert len({a, b}) == 2
+
+
+def test_invalid_entries_survive_a_save(tmp_path):
+    config_file = tmp_path / 'launcher_apps.json'
+    broken = {'name': 'No path', 'icon': 'x.png', 'extra': 1}
+    config_file.write_text(json.dumps({
+        'version': 2,
+        'apps': [{'name': 'Good', 'path': 'C:\\good.exe'}, broken, 'not an app'],
+    }), encoding='utf-8')
+
+    config = load_config_file(config_file)
+    assert [app.name for app in config['apps']] == ['Good']
+    save_config_file(config_file, config['apps'], '', '', invalid_apps=config['invalid_apps'])
+
+    saved = json.loads(config_file.read_text(encoding='utf-8'))
+    assert saved['apps'][1:] == [broken, 'not an app']
+    assert load_config_file(config_file)['invalid_apps'] == [broken, 'not an app']
+
+
+def test_newer_config_is_never_overwritten(tmp_path):
+    config_file = tmp_path / 'launcher_apps.json'
+    original = json.dumps({'version': CONFIG_VERSION + 1, 'apps': [], 'future_field': True})
+    config_file.write_text(original, encoding='utf-8')
+
+    config = load_config_file(config_file)
+    with pytest.raises(ConfigError):
+        save_config_file(config_file, config['apps'], '', '')
+    assert config_file.read_text(encoding='utf-8') == original
+
+
+def test_save_replaces_the_file_atomically(tmp_path):
+    config_file = tmp_path / 'launcher_apps.json'
+    save_config_file(config_file, [AppRecord('A', 'a.exe')], '', '')
+    save_config_file(config_file, [AppRecord('B', 'b.exe')], '', '')
+
+    assert [p.name for p in tmp_path.iterdir()] == ['launcher_apps.json']
+    assert [app.name for app in load_config_file(config_file)['apps']] == ['B']
@@ -0,0 +1,74 @@
+"""scan_sources.refresh_program: un programma del cache il cui file è cambiato
+viene riletto dalla sorgente che l'ha trovato"""
+
+from modules.scan_sources import make_program, refresh_program
+
+
+def _manifest(path, name, flags=4):
+    path.write_text('"AppState"\n{\n\t"appid"\t\t"440"\n\t"name"\t\t"%s"\n'
+                    '\t"StateFlags"\t\t"%d"\n\t"installdir"\t\t"Game"\n}\n' % (name, flags), encoding='utf-8')
+
+
+def test_steam_manifest_is_read_again(tmp_path):
+    manifest = tmp_path / 'appmanifest_440.acf'
+    _manifest(manifest, 'Old Name')
+    program = make_program('Old Name', 'xdg-open "steam://rungameid/440"', '', str(manifest))
+    program['source'] = 'steam'
+
+    _manifest(manifest, 'New Name')
+    fresh = refresh_program(program)
+    assert fresh['name'] == 'New Name'
+    assert fresh['key'] == 'new name'
+    assert fresh['steam_appid'] == '440'
+    assert fresh['source'] == 'steam'
+
+    _manifest(manifest, 'New Name', flags=0)
+    assert refresh_program(program) is None
+
+
+def test_rom_keeps_command_and_finds_new_image(tmp_path):
+    rom = tmp_path / 'Super Game (USA) [!].sfc'
+    rom.write_bytes(b'rom')
+    program = make_program('Super Game', f'retroarch "{rom}"', '', str(rom))
+    program['source'] = 'roms'
+
+    (tmp_path / 'Super Game (USA) [!].png').write_bytes(b'png')
+    fresh = refresh_program(program)
+    assert fresh['name'] == 'Super Game'
+    assert fresh['path'] == program['path']
+    assert fresh['icon'] == str(tmp_path / 'Super Game (USA) [!].png')
+
+
+def test_registry_exe_is_ranked_again(tmp_path):
+    game = tmp_path / 'Game'
+    game.mkdir()
+    for name in ('Game.exe', 'GameLauncher.exe', 'unins000.exe'):
+        (game / name).write_bytes(b'\0' * 1024)
+    chosen = str(game / 'GameLauncher.exe')
+    program = make_program('Game', chosen, chosen)
+    program['source'] = 'registry'
+
+    fresh = refresh_program(program)
+    # L'exe scelto resta, le altre proposte si aggiornano
+    assert fresh['path'] == chosen
+    assert fresh['icon'] == chosen
+    assert fresh['alternates'] == [str(game / 'Game.exe')]
+
+
+def test_desktop_entry_is_parsed_again(tmp_path):
+    desktop = tmp_path / 'tool.desktop'
+    desktop.write_text('[Desktop Entry]\nType=Application\nName=Tool\nExec=/bin/sh\n', encoding='utf-8')
+    program = make_program('Tool', '/bin/sh', '/bin/sh', str(desktop))
+    program['source'] = 'flatpak'
+
+    desktop.write_text('[Desktop Entry]\nType=Application\nName=Tool Pro\nExec=/bin/sh\n', encoding='utf-8')
+    assert refresh_program(program)['name'] == 'Tool Pro'
+
+    desktop.write_text('[Desktop Entry]\nType=Application\nName=Tool Pro\nExec=/bin/sh\nNoDisplay=true\n',
+                       encoding='utf-8')
+    assert refresh_program(program) is None
+
+
+def test_entries_without_a_source():
+    program = make_program('Lutris Game', 'lutris lutris:rungameid/3')
+    assert refresh_program(program) == program
@@ -0,0 +1,35 @@
+"""Indice dei temi di icone: va rifatto quando cambia il tema scelto dall'utente"""
+
+import os
+
+from modules.icon_theme import IconThemeIndex
+
+
+def _theme(base, name, icon, inherits='hicolor'):
+    theme_dir = base / name
+    (theme_dir / '48x48' / 'apps').mkdir(parents=True)
+    (theme_dir / 'index.theme').write_text(
+        f"[Icon Theme]\nName={name}\nInherits={inherits}\nDirectories=48x48/apps\n\n"
+        "[48x48/apps]\nSize=48\nType=Fixed\n", encoding='utf-8')
+    (theme_dir / '48x48' / 'apps' / f'{icon}.png').write_bytes(b'')
+
+
+def test_changing_the_gtk_theme_invalidates_the_index(tmp_path, monkeypatch):
+    icons = tmp_path / 'icons'
+    _theme(icons, 'hicolor', 'app')
+    _theme(icons, 'Papirus', 'app')
+    config = tmp_path / 'config'
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(config))
+    monkeypatch.delenv('TVLAUNCHER_ICON_THEME', raising=False)
+
+    index = IconThemeIndex.build([str(icons)])
+    assert index.lookup('app') == os.path.join(str(icons), 'hicolor', '48x48', 'apps', 'app.png')
+    assert index.is_current()
+
+    (config / 'gtk-3.0').mkdir(parents=True)
+    (config / 'gtk-3.0' / 'settings.ini').write_text("[Settings]\ngtk-icon-theme-name=Papirus\n", encoding='utf-8')
+    assert not index.is_current()
+
+    index = IconThemeIndex.build([str(icons)])
+    assert index.lookup('app') == os.path.join(str(icons), 'Papirus', '48x48', 'apps', 'app.png')
+    assert index.is_current()
@@ -0,0 +1,15 @@
+"""Import differiti: il segnaposto non carica nulla finché non serve"""
+
+import sys
+
+from modules.lazy_import import is_loaded, lazy
+
+
+def test_is_loaded_never_imports(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'wave', raising=False)
+    module = lazy('wave')
+    assert not is_loaded('wave') and not module.loaded
+    assert 'wave' not in sys.modules
+
+    module.open  # primo accesso: ora il modulo è importato
+    assert is_loaded('wave') and module.loaded
@@ -0,0 +1,48 @@
+"""Import di un bundle: cartelle assets/<app> uniche e ritrovabili dal launcher"""
+
+from modules.app_record import AppRecord, load_config_file, save_config_file
+from modules.library_bundle import export_library, import_library
+from modules.paths import LauncherPaths, asset_folder
+
+
+def _library(tmp_path, name, apps):
+    paths = LauncherPaths(tmp_path / name, tmp_path / name, tmp_path / name / 'cache', 'custom')
+    paths.assets_dir.mkdir(parents=True)
+    records = []
+    for app_name, cover in apps:
+        icon = ''
+        if cover is not None:
+            icon = paths.assets_dir / app_name / 'banner.png'
+            icon.parent.mkdir()
+            icon.write_bytes(cover)
+        records.append(AppRecord(app_name, f'C:\\Games\\{app_name}.exe', str(icon)))
+    save_config_file(paths.config_file, records, '', '', paths)
+    return paths
+
+
+def test_import_skips_orphaned_and_colliding_folders(tmp_path):
+    source = _library(tmp_path, 'source', [('Foo', b'foo'), ('Foo!', b'foo-bang')])
+    bundle = tmp_path / 'library.zip'
+    export_library(source, bundle)
+
+    target = _library(tmp_path, 'target', [])
+    orphan = target.assets_dir / 'Foo' / 'banner.png'
+    orphan.parent.mkdir()
+    orphan.write_bytes(b'orphan')
+
+    assert import_library(target, bundle) == 2
+    assert orphan.read_bytes() == b'orphan'
+
+    apps = load_config_file(target.config_file, target)['apps']
+    folders = [asset_folder(target.assets_dir, app.name, app.icon) for app in apps]
+    assert folders == ['Foo (2)', 'Foo (3)']
+    covers = {app.name: (target.assets_dir / folder / 'banner.png').read_bytes()
+              for app, folder in zip(apps, folders)}
+    assert covers == {'Foo': b'foo', 'Foo!': b'foo-bang'}
+
+
+def test_asset_folder_falls_back_to_sanitized_name(tmp_path):
+    assets = tmp_path / 'assets'
+    assert asset_folder(assets, 'My Game!') == 'My_Game'
+    assert asset_folder(assets, 'My Game!', str(tmp_path / 'elsewhere' / 'cover.png')) == 'My_Game'
+    assert asset_folder(assets, 'My Game!', str(assets / 'My Game (2)' / 'banner.png')) == 'My Game (2)'
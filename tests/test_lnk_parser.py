@@ -0,0 +1,60 @@
+"""parse_lnk e ShortcutResolver su piccoli .lnk binari (tests/fixtures/*.lnk)"""
+
+import os
+
+import pytest
+
+from conftest import FIXTURES
+from modules.lnk_parser import LnkError, ShortcutResolver, parse_lnk, read_lnk
+
+
+def _data(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def test_local_path():
+    info = parse_lnk(_data('local.lnk'))
+    assert info == {
+        'target': 'C:\\Games\\Fixture\\fixture.exe',
+        'arguments': '--fullscreen',
+        'working_dir': 'C:\\Games\\Fixture',
+        'relative_path': '',
+        'icon': 'C:\\Games\\Fixture\\fixture.ico',
+        'icon_index': 2,
+        'advertised': False,
+    }
+
+
+def test_network_path_after_id_list():
+    info = parse_lnk(_data('network.lnk'))
+    assert info['target'] == '\\\\NAS\\Games\\Fixture\\fixture.exe'
+    assert info['relative_path'] == '..\\..\\NAS\\Games\\Fixture\\fixture.exe'
+
+
+def test_unicode_path():
+    info = parse_lnk(_data('unicode.lnk'))
+    assert info['target'] == 'C:\\Jeux\\Café ☕\\ゲーム.exe'
+    assert info['working_dir'] == 'C:\\Jeux\\Café ☕'
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'\0' * 0x4C,
+    _data('local.lnk')[:0x4C + 10],
+])
+def test_invalid_or_truncated(data):
+    with pytest.raises(LnkError):
+        parse_lnk(data)
+
+
+def test_resolver_without_com(tmp_path):
+    shortcut = tmp_path / 'Fixture.lnk'
+    shortcut.write_bytes(_data('local.lnk'))
+    broken = tmp_path / 'Broken.lnk'
+    broken.write_bytes(b'not a shortcut')
+
+    resolver = ShortcutResolver(use_com=False)
+    assert resolver.resolve(str(shortcut)) == read_lnk(str(shortcut))
+    assert resolver.resolve(str(broken)) is None
+    assert resolver.stats == {'parsed': 1, 'com': 0, 'failed': 1}
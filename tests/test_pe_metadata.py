@@ -0,0 +1,81 @@
+"""Lettore PE e PeMetadataCache su due piccoli exe di prova (tests/fixtures/*.exe):
+fixture_gui.exe ha version-info e un'icona PNG 256px tra due bitmap,
+fixture_console.exe solo icone bitmap 16 e 32px"""
+
+import os
+import shutil
+import struct
+
+import pytest
+
+from conftest import FIXTURES
+from modules.pe_cache import PeMetadataCache, cover_search_names
+from modules.pe_metadata import PeError, read_pe_info
+
+GUI_EXE = os.path.join(FIXTURES, 'fixture_gui.exe')
+CONSOLE_EXE = os.path.join(FIXTURES, 'fixture_console.exe')
+
+
+def test_version_info_and_headers():
+    info = read_pe_info(GUI_EXE)
+    assert info['subsystem'] == 'gui'
+    assert info['machine'] == 0x14C
+    assert info['version'] == {
+        'CompanyName': 'Fixture Studio',
+        'FileDescription': 'Fixture Game Launcher',
+        'ProductName': 'Fixture Game™',
+        'ProductVersion': '1.2.3',
+        'OriginalFilename': 'fixture.exe',
+    }
+    assert 'icon' not in info
+
+
+def test_largest_icon_is_the_png():
+    data, ext = read_pe_info(GUI_EXE, icon=True)['icon']
+    assert ext == '.png'
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    assert struct.unpack('>II', data[16:24]) == (256, 256)
+
+
+def test_largest_bitmap_icon_becomes_single_image_ico():
+    info = read_pe_info(CONSOLE_EXE, icon=True)
+    assert info['subsystem'] == 'console'
+    assert info['version'] == {}
+    data, ext = info['icon']
+    assert ext == '.ico'
+    reserved, kind, count = struct.unpack_from('<HHH', data)
+    width, height, _, _, _, bits, size, offset = struct.unpack_from('<BBBBHHII', data, 6)
+    assert (reserved, kind, count) == (0, 1, 1)
+    assert (width, height, bits) == (32, 32, 32)
+    assert offset == 22 and size == len(data) - 22
+    # La bitmap resta quella della risorsa: BITMAPINFOHEADER 32x(32*2)
+    assert struct.unpack_from('<Iii', data, 22) == (40, 32, 64)
+
+
+@pytest.mark.parametrize('content', [b'', b'MZ' + b'\0' * 62, b'not an exe at all' * 8])
+def test_not_a_pe(tmp_path, content):
+    path = tmp_path / 'broken.exe'
+    path.write_bytes(content)
+    with pytest.raises(PeError):
+        read_pe_info(str(path), icon=True)
+
+
+def test_metadata_cache_saves_icon_and_reloads(tmp_path):
+    exe = tmp_path / 'Fixture Game' / 'fixture.exe'
+    exe.parent.mkdir()
+    shutil.copyfile(GUI_EXE, exe)
+    index = tmp_path / 'cache' / 'pe_metadata.json'
+    icons = tmp_path / 'cache' / 'icons'
+
+    cache = PeMetadataCache(index, icons)
+    metadata = cache.metadata([str(exe)])[str(exe)]
+    assert metadata['version']['ProductName'] == 'Fixture Game™'
+    icon_file = cache.icon_path(metadata)
+    assert icon_file.endswith('.png') and os.path.exists(icon_file)
+    cache.save()
+
+    reloaded = PeMetadataCache(index, icons)
+    assert reloaded.metadata([str(exe)]) == {str(exe): metadata}
+
+    assert cover_search_names('fixture game', metadata) == ['Fixture Game', 'Fixture Game Launcher']
+    assert cover_search_names('Other App', metadata) == ['Other App']
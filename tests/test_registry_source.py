@@ -0,0 +1,133 @@
+"""RegistrySource letta da win_registry.FakeRegistry: gira anche su Linux"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules import win_registry
+from modules.scan_sources import RegistrySource, ScanFingerprints, SourceContext
+
+HIVE, UNINSTALL = win_registry.UNINSTALL_KEYS[0]
+
+
+class CountingRegistry(win_registry.FakeRegistry):
+    """FakeRegistry che conta le letture dei valori"""
+
+    def __init__(self, keys):
+        super().__init__(keys)
+        self.value_reads = 0
+
+    def values(self, key):
+        self.value_reads += 1
+        return super().values(key)
+
+
+def _exe(folder, name, size=1024):
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / name
+    path.write_bytes(b'\0' * size)
+    return str(path)
+
+
+def _registry(entries, stamp=1):
+    return CountingRegistry({(HIVE, UNINSTALL): {
+        key: {'last_write': stamp, 'values': values} for key, values in entries.items()
+    }})
+
+
+def _scan(source, old=None):
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        ctx = SourceContext(None, pool, old or ScanFingerprints())
+        programs = list(source.scan(ctx))
+    return programs, ctx.new
+
+
+def test_picks_best_exe_and_keeps_alternates(tmp_path):
+    game = tmp_path / 'Fixture Game'
+    best = _exe(game, 'FixtureGame.exe')
+    launcher = _exe(game, 'FixtureGameLauncher.exe')
+    _exe(game, 'unins000.exe')
+    _exe(game, 'CrashReporter.exe')
+    registry = _registry({'Fixture': {'DisplayName': 'Fixture Game', 'InstallLocation': str(game)}})
+
+    programs, _ = _scan(RegistrySource(registry))
+
+    assert len(programs) == 1
+    program = programs[0]
+    assert program['name'] == 'Fixture Game'
+    assert program['key'] == 'fixture game'
+    assert program['path'] == best
+    assert program['icon'] == best
+    assert program['alternates'] == [launcher]
+
+
+def test_display_icon_and_uninstaller_fallback(tmp_path):
+    game = tmp_path / 'Tool'
+    exe = _exe(game, 'Tool.exe')
+    uninstaller = _exe(game, 'unins000.exe')
+    icon = tmp_path / 'tool.ico'
+    icon.write_bytes(b'\0\0\1\0')
+    registry = _registry({'Tool': {
+        'DisplayName': 'Tool',
+        'DisplayIcon': f'"{icon}",0',
+        'UninstallString': f'"{uninstaller}" /SILENT',
+    }})
+
+    programs, _ = _scan(RegistrySource(registry))
+
+    assert [(p['path'], p['icon']) for p in programs] == [(exe, str(icon))]
+    assert 'alternates' not in programs[0]
+
+
+def test_entries_without_usable_exe_are_skipped(tmp_path):
+    empty = tmp_path / 'Empty'
+    _exe(empty, 'unins000.exe')
+    registry = _registry({
+        'NoName': {'InstallLocation': str(empty)},
+        'OnlyUninstaller': {'DisplayName': 'Only Uninstaller', 'InstallLocation': str(empty)},
+        'Missing': {'DisplayName': 'Missing', 'InstallLocation': str(tmp_path / 'gone')},
+    })
+
+    programs, fingerprints = _scan(RegistrySource(registry))
+
+    assert programs == []
+    # Ricordate comunque, per non rileggerle finché la chiave non cambia
+    assert len(fingerprints.keys) == 3
+
+
+def test_unchanged_keys_are_not_read_again(tmp_path):
+    exe = _exe(tmp_path / 'Game', 'Game.exe')
+    entries = {'Game': {'DisplayName': 'Game', 'InstallLocation': str(tmp_path / 'Game')}}
+
+    first = _registry(entries)
+    programs, fingerprints = _scan(RegistrySource(first))
+    assert first.value_reads == 1
+
+    again = _registry(entries)
+    cached, _ = _scan(RegistrySource(again), old=fingerprints)
+    assert again.value_reads == 0
+    assert cached == programs
+
+    changed = _registry(entries, stamp=2)
+    _scan(RegistrySource(changed), old=fingerprints)
+    assert changed.value_reads == 1
+
+    # Un exe sparito non viene restituito dalla voce in cache
+    os.remove(exe)
+    gone, _ = _scan(RegistrySource(_registry(entries)), old=fingerprints)
+    assert gone == []
+
+
+def test_missing_uninstall_keys():
+    programs, fingerprints = _scan(RegistrySource(win_registry.FakeRegistry({})))
+    assert programs == []
+    assert fingerprints.keys == {}
+
+
+@pytest.mark.parametrize('values', [
+    {'DisplayName': 42},
+    {'DisplayName': '   '},
+])
+def test_invalid_display_names(values):
+    assert win_registry.program_from_values(values, lambda directory, name: []) is None
@@ -0,0 +1,46 @@
+"""Walker incrementale di scan_sources: elenchi delle cartelle riusati dalle impronte"""
+
+from modules.scan_sources import ScanFingerprints, scan_folder, walk_tree
+
+
+def _names(programs):
+    return sorted(program['name'] for program in programs)
+
+
+def _on_file(path):
+    return {'name': path.rsplit('/', 1)[-1]}
+
+
+def test_listing_is_reused_only_for_the_same_extensions(tmp_path):
+    for name in ('a.sfc', 'b.smc', 'c.txt'):
+        (tmp_path / name).write_bytes(b'x')
+
+    first = ScanFingerprints()
+    assert _names(scan_folder(str(tmp_path), ('.sfc',), _on_file, ScanFingerprints(), first)) == ['a.sfc']
+
+    # Estensioni cambiate, cartella invariata: l'elenco salvato per '.sfc' non basta
+    second = ScanFingerprints()
+    found = scan_folder(str(tmp_path), ('.sfc', '.smc'), _on_file, first, second)
+    assert _names(found) == ['a.sfc', 'b.smc']
+
+    # Due voci sulla stessa cartella non si sovrascrivono le impronte
+    merged = ScanFingerprints()
+    merged.merge(first)
+    merged.merge(second)
+    assert len(merged.dirs) == 2
+    calls = []
+    again = scan_folder(str(tmp_path), ('.sfc',), lambda p: calls.append(p), merged, ScanFingerprints())
+    assert _names(again) == ['a.sfc'] and calls == []
+
+
+def test_unchanged_tree_is_not_parsed_again(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'x.desktop').write_text('x')
+    old = ScanFingerprints()
+    assert _names(walk_tree(str(tmp_path), ('.desktop',), _on_file, ScanFingerprints(), old)) == ['x.desktop']
+
+    calls = []
+    new = ScanFingerprints()
+    found = walk_tree(str(tmp_path), ('.desktop',), lambda p: calls.append(p), old, new)
+    assert _names(found) == ['x.desktop'] and calls == []
+    assert new.dirs == old.dirs